@@ -0,0 +1,287 @@
+"""
+Batch extraction for many conferences and years.
+
+Takes either a directory or a manifest of program PDFs:
+
+  directory   one subdirectory per conference (programs/spsa2026/*.pdf);
+              the day is the weekday named in each file name
+  manifest    .json: [{"pdf": ..., "conference": ..., "day": ..., "date": ...}, ...]
+              .csv:  the same columns with a header row
+              pdf paths are relative to the manifest; date (YYYY-MM-DD) is
+              optional and only needed for ISO datetimes
+
+Each file is extracted in its own child process, at most --workers at a
+time; the rest wait in the scheduler's queue. A file that raises, crashes
+its process or runs past --timeout is recorded as failed and the batch
+goes on: its process is killed outright, which a shared pool can't do
+without losing the other workers. Files share the extraction cache, so
+re-running a batch only redoes the PDFs that changed.
+
+Each conference gets out/<conference>/schedule_all.json (days in manifest
+order, or weekday order for a directory) and, unless --no-artifacts, the
+web artifacts in out/<conference>/data/. out/batch_summary.json records
+every file's status, time, pages and sessions, and the run's throughput.
+The exit status is 1 if any file failed.
+
+    python3 batch_extract.py programs/ [-o batch_out] [-j 4] [--timeout 300]
+    python3 batch_extract.py manifest.json
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import re
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+from build_artifacts import build_artifacts
+from extraction_cache import DEFAULT_CACHE_DIR
+from schedule_io import atomic_write, write_json_array
+
+SUMMARY_FORMAT = 1
+DEFAULT_OUTPUT_DIR = "batch_out"
+DEFAULT_TIMEOUT = 600
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+WEEKDAY_RE = re.compile("|".join(WEEKDAYS), re.IGNORECASE)
+
+
+def entries_from_directory(root):
+    """One entry per PDF under root, conference = its directory's name."""
+    entries = []
+    for directory, _, files in sorted(os.walk(root)):
+        conference = os.path.basename(os.path.normpath(directory))
+        pdfs = []
+        for name in files:
+            if not name.lower().endswith(".pdf"):
+                continue
+            match = WEEKDAY_RE.search(name)
+            day = match.group(0).capitalize() if match else None
+            pdfs.append({"pdf": os.path.join(directory, name), "conference": conference, "day": day, "date": None})
+        pdfs.sort(key=lambda e: (WEEKDAYS.index(e["day"]) if e["day"] else len(WEEKDAYS), e["pdf"]))
+        entries.extend(pdfs)
+    return entries
+
+
+def entries_from_manifest(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f)) if path.endswith(".csv") else json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    entries = []
+    for row in rows:
+        day = (row.get("day") or "").strip().capitalize() or None
+        entries.append({"pdf": os.path.join(base, row["pdf"]), "conference": row["conference"].strip(),
+                        "day": day, "date": (row.get("date") or "").strip() or None})
+    return entries
+
+
+def slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "conference"
+
+
+def _extract_file(conn, entry, cache_dir, calibrate_layout, prepass):
+    """Child process: extract one PDF and send ("ok", sessions, pages) or ("error", message, None)."""
+    try:
+        import pdfplumber
+
+        import extract_sessions
+        from extraction_cache import PARSER_VERSION, ExtractionCache
+
+        if not entry["day"]:
+            raise ValueError("no day: name a weekday in the file name or give one in the manifest")
+        if not os.path.exists(entry["pdf"]):
+            raise FileNotFoundError(entry["pdf"])
+        with pdfplumber.open(entry["pdf"]) as pdf:
+            pages = len(pdf.pages)
+        cache = ExtractionCache(cache_dir, PARSER_VERSION) if cache_dir else None
+        # Undated days get no ISO datetimes rather than SPSA 2026's dates
+        dates = {entry["day"]: entry["date"]}
+        sessions = extract_sessions.extract_sessions_from_pdf(
+            entry["pdf"], entry["day"], cache=cache, dates=dates,
+            calibrate_layout=calibrate_layout, prepass=prepass)
+        if not sessions:
+            raise ValueError("no sessions found")
+        conn.send(("ok", sessions, pages))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}", None))
+    finally:
+        conn.close()
+
+
+def run_jobs(entries, workers=1, timeout=DEFAULT_TIMEOUT, cache_dir=DEFAULT_CACHE_DIR,
+             calibrate_layout=True, prepass=False, on_result=None):
+    """Extract every entry, at most `workers` at a time; return one result dict per entry.
+
+    on_result(index, result, sessions) is called as each file finishes, in
+    completion order; sessions is None unless the file succeeded.
+    """
+    context = multiprocessing.get_context()
+    queue = deque(range(len(entries)))
+    running = {}  # connection -> (index, process, start time)
+    results = [None] * len(entries)
+
+    def finish(index, result, sessions=None):
+        results[index] = result
+        if on_result:
+            on_result(index, result, sessions)
+
+    try:
+        while queue or running:
+            while queue and len(running) < workers:
+                index = queue.popleft()
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(target=_extract_file, daemon=True,
+                                          args=(sender, entries[index], cache_dir, calibrate_layout, prepass))
+                process.start()
+                sender.close()
+                running[receiver] = (index, process, time.perf_counter())
+
+            now = time.perf_counter()
+            next_deadline = min(start + timeout for _, _, start in running.values())
+            for conn in wait(list(running), timeout=max(0.0, next_deadline - now)):
+                index, process, start = running.pop(conn)
+                try:
+                    status, payload, pages = conn.recv()
+                except EOFError:
+                    process.join()
+                    status, payload, pages = "error", f"worker exited with code {process.exitcode}", None
+                conn.close()
+                process.join()
+                seconds = round(time.perf_counter() - start, 3)
+                if status == "ok":
+                    finish(index, {"status": "ok", "seconds": seconds, "pages": pages,
+                                   "sessions": len(payload)}, payload)
+                else:
+                    finish(index, {"status": "failed", "seconds": seconds, "error": payload})
+
+            now = time.perf_counter()
+            for conn, (index, process, start) in list(running.items()):
+                if now - start >= timeout:
+                    process.kill()
+                    process.join()
+                    conn.close()
+                    del running[conn]
+                    finish(index, {"status": "timeout", "seconds": round(now - start, 3),
+                                   "error": f"killed after {timeout:g}s"})
+    finally:
+        for conn, (_, process, _) in running.items():
+            process.kill()
+            conn.close()
+    return results
+
+
+def write_conference(conference, days, output_dir, artifacts=True):
+    """Write one conference's sessions (days: [(day, sessions)] in order); return its summary entry."""
+    directory = os.path.join(output_dir, slug(conference))
+    os.makedirs(directory, exist_ok=True)
+    sessions = [session for _, day_sessions in days for session in day_sessions]
+    path = os.path.join(directory, "schedule_all.json")
+    with atomic_write(path) as f:
+        write_json_array(sessions, f)
+    if artifacts:
+        build_artifacts(sessions, os.path.join(directory, "data"))
+    return {"output": path, "days": [day for day, _ in days], "sessions": len(sessions)}
+
+
+def run_batch(entries, output_dir=DEFAULT_OUTPUT_DIR, workers=1, timeout=DEFAULT_TIMEOUT,
+              cache_dir=DEFAULT_CACHE_DIR, calibrate_layout=True, prepass=False, artifacts=True):
+    """Extract every entry, write per-conference outputs and the run summary; return the summary."""
+    os.makedirs(output_dir, exist_ok=True)
+    remaining = {}
+    for entry in entries:
+        remaining[entry["conference"]] = remaining.get(entry["conference"], 0) + 1
+    collected = {conference: {} for conference in remaining}
+    conferences = {}
+
+    def on_result(index, result, sessions):
+        entry = entries[index]
+        conference = entry["conference"]
+        label = f"{entry['pdf']} ({conference}, {entry['day'] or '?'})"
+        if sessions is None:
+            print(f"FAILED {label}: {result['error']}")
+        else:
+            print(f"ok     {label}: {result['sessions']} sessions, {result['pages']} pages, {result['seconds']:.1f}s")
+            collected[conference][index] = (entry["day"], sessions)
+        # Write each conference as soon as its last file is in, then drop its sessions
+        remaining[conference] -= 1
+        if remaining[conference] == 0:
+            done = collected.pop(conference)
+            days = [done[i] for i in sorted(done)]
+            if days:
+                conferences[conference] = write_conference(conference, days, output_dir, artifacts)
+
+    start = time.perf_counter()
+    results = run_jobs(entries, workers, timeout, cache_dir, calibrate_layout, prepass, on_result)
+    elapsed = time.perf_counter() - start
+
+    ok = [r for r in results if r["status"] == "ok"]
+    pages = sum(r["pages"] for r in ok)
+    sessions = sum(r["sessions"] for r in ok)
+    summary = {
+        "format": SUMMARY_FORMAT,
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "files": len(entries),
+        "ok": len(ok),
+        "failed": sum(r["status"] == "failed" for r in results),
+        "timed_out": sum(r["status"] == "timeout" for r in results),
+        "pages": pages,
+        "sessions": sessions,
+        "files_per_sec": round(len(entries) / elapsed, 3) if elapsed else None,
+        "pages_per_sec": round(pages / elapsed, 2) if elapsed else None,
+        "sessions_per_sec": round(sessions / elapsed, 1) if elapsed else None,
+        "conferences": conferences,
+        "jobs": [{**entry, **result} for entry, result in zip(entries, results)],
+    }
+    with atomic_write(os.path.join(output_dir, "batch_summary.json")) as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def print_summary(summary):
+    print(f"\n{summary['files']} files in {summary['seconds']:.1f}s with {summary['workers']} worker(s): "
+          f"{summary['ok']} ok, {summary['failed']} failed, {summary['timed_out']} timed out")
+    print(f"{summary['pages']} pages, {summary['sessions']} sessions: {summary['files_per_sec']} files/s, "
+          f"{summary['pages_per_sec']} pages/s, {summary['sessions_per_sec']} sessions/s")
+    for conference, entry in summary["conferences"].items():
+        print(f"  {conference:<24} {entry['sessions']:>6} sessions  {', '.join(entry['days'])}  -> {entry['output']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract program PDFs for many conferences in one run.")
+    parser.add_argument("source", help="directory of conference subdirectories, or a .json/.csv manifest")
+    parser.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR,
+                        help=f"where to write per-conference outputs and the summary (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="files extracted at once (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"seconds before a file's extraction is killed (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--no-calibrate", action="store_true")
+    parser.add_argument("--engine", choices=("layout", "hybrid"), default="layout",
+                        help="as for extract_sessions.py (default: layout)")
+    parser.add_argument("--no-artifacts", action="store_true", help="only write schedule_all.json per conference")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.source):
+        entries = entries_from_directory(args.source)
+    else:
+        entries = entries_from_manifest(args.source)
+    if not entries:
+        parser.error(f"no PDFs found in {args.source}")
+
+    summary = run_batch(entries, args.output_dir, max(1, args.workers), args.timeout,
+                        None if args.no_cache else args.cache_dir, not args.no_calibrate,
+                        args.engine == "hybrid", not args.no_artifacts)
+    print_summary(summary)
+    print(f"Summary written to {os.path.join(args.output_dir, 'batch_summary.json')}")
+    if summary["ok"] < summary["files"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Micro-benchmark for line classification.
+
+Runs every line of the bundled PDFs through the per-line tests the two
+parsers used to make inline (literal re.match/re.search calls, keyword lists
+rebuilt per line) and through the shared engine in line_classifier.py, checks
+that both agree, and reports lines/sec for each.
+
+    python3 benchmark_classifier.py [--repeat N]
+"""
+
+import argparse
+import re
+import time
+
+import PyPDF2
+
+import extract_sessions
+import line_classifier as lc
+from extraction_cache import ExtractionCache
+
+PDF_FILES = ["spsa_thursday.pdf", "spsa_friday.pdf", "spsa_saturday.pdf"]
+
+
+def legacy_classify_text(line):
+    """ScheduleParser.parse_session's per-line tests before line_classifier."""
+    if re.match(r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)', line, re.IGNORECASE):
+        return lc.DAY, None
+    if re.match(r'\d{1,2}:\d{2}[ap]m', line, re.IGNORECASE):
+        return lc.TIME, None
+    if any(keyword in line for keyword in ['Floor', 'Building', 'Room', 'Bridge', 'Riverside', 'Churchill', 'Canal', 'Cambridge']):
+        return lc.LOCATION, None
+    category_keywords = ['Undergraduate Research', 'Comparative Politics', 'Public Opinion',
+                         'Conference Within A Conference', 'Political Methodology', 'International Conflict',
+                         'Human Rights', 'Race and Ethnicity', 'Women, Gender, and Politics',
+                         'Environmental Politics', 'American Political Development', 'Presidential',
+                         'Local and Urban Politics', 'Political Theory', 'Teaching Political Science',
+                         'Meetings', 'Political Psychology']
+    for keyword in category_keywords:
+        if keyword in line:
+            return lc.CATEGORY, None
+    if line.lower() == 'chair' or line.lower() == 'chair:':
+        return lc.ROLE, 'chair'
+    if line.lower() == 'participants' or line.lower() == 'participants:':
+        return lc.ROLE, 'participants'
+    if line.lower().startswith('discussant'):
+        return lc.ROLE, 'discussants'
+    return lc.TEXT, None
+
+
+def legacy_is_metadata_line(line):
+    metadata_patterns = [
+        r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)',
+        r'\d{1,2}:\d{2}[ap]m',
+        r'Floor',
+        r'Building',
+        r'Room'
+    ]
+    return any(re.search(pattern, line, re.IGNORECASE) for pattern in metadata_patterns)
+
+
+def legacy_looks_like_person(line):
+    if ',' not in line:
+        return False
+    institution_keywords = ['University', 'College', 'Institute', 'School', 'Center', 'State',
+                            'Student', 'Professor', 'Dr.', 'MIT', 'UCLA', 'USC']
+    return any(keyword in line for keyword in institution_keywords)
+
+
+def legacy_classify_record(line, text):
+    """extract_sessions' inline per-line tests before line_classifier."""
+    x0 = line['x0']
+    match = re.match(r'^(\d{4})(?:\s+(.*))?$', text)
+    if x0 < extract_sessions.SESSION_ID_X_MAX and match and not (line['bold'] or line['italic']):
+        return lc.SESSION_ID
+    if x0 < extract_sessions.HEADER_COLUMN_X_MAX:
+        if line['bold'] and line['italic']:
+            return lc.DAY
+        if line['italic']:
+            if re.search(r'(\d{1,2}:\d{2}[ap]m)-(\d{1,2}:\d{2}[ap]m)', text):
+                return lc.TIME
+            return lc.LOCATION
+        return lc.OTHER
+    if line['bold']:
+        return lc.ROLE if lc.ROLE_HEADERS.get(text.lower().rstrip(':')) else lc.HEADING
+    if abs(x0 - extract_sessions.PAPER_TITLE_X) < 10:
+        return lc.PAPER
+    if abs(x0 - extract_sessions.AUTHOR_X) < 10 and ("," in text or "University" in text or "College" in text):
+        return lc.AUTHOR
+    return lc.TEXT
+
+
+def text_lines():
+    lines = []
+    for pdf_file in PDF_FILES:
+        with open(pdf_file, 'rb') as f:
+            for page in PyPDF2.PdfReader(f).pages:
+                lines.extend(line.strip() for line in page.extract_text().split('\n') if line.strip())
+    return lines
+
+
+def layout_lines():
+    cache = ExtractionCache(version=extract_sessions.PARSER_VERSION)
+    lines = []
+    for pdf_file in PDF_FILES:
+        lines.extend(extract_sessions.extract_lines_from_pdf(pdf_file, cache=cache))
+    return [(line, line['text'].strip()) for line in lines]
+
+
+def rate(fn, items, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best
+
+
+def report(name, before, after):
+    print(f"{name:<28} {before:>12,.0f} {after:>12,.0f} {after / before:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per case; the best is kept")
+    args = parser.parse_args()
+
+    texts = text_lines()
+    records = layout_lines()
+
+    for line in texts:
+        assert legacy_classify_text(line) == lc.classify_text(line), line
+        assert legacy_is_metadata_line(line) == lc.is_metadata_line(line), line
+        assert legacy_looks_like_person(line) == lc.looks_like_person(line), line
+    for line, text in records:
+        assert legacy_classify_record(line, text) == extract_sessions.CLASSIFIER.classify(line, text)[0], text
+
+    print(f"{len(texts)} text lines, {len(records)} layout lines\n")
+    print(f"{'lines/sec':<28} {'before':>12} {'after':>12} {'speedup':>9}")
+    report("ScheduleParser classify", rate(legacy_classify_text, texts, args.repeat),
+           rate(lc.classify_text, texts, args.repeat))
+    report("is_metadata_line", rate(legacy_is_metadata_line, texts, args.repeat),
+           rate(lc.is_metadata_line, texts, args.repeat))
+    report("looks_like_person", rate(legacy_looks_like_person, texts, args.repeat),
+           rate(lc.looks_like_person, texts, args.repeat))
+    classify = extract_sessions.CLASSIFIER.classify
+    report("extract_sessions classify", rate(lambda r: legacy_classify_record(*r), records, args.repeat),
+           rate(lambda r: classify(*r), records, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
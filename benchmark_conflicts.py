@@ -0,0 +1,86 @@
+"""
+Conflict detection at scale: sweep line vs. comparing every pair.
+
+Generates synthetic multi-track schedules (three days of 75-minute slots,
+about eight sessions per room per day, four participants per session drawn
+from a pool of people, and a share of sessions nudged off their slot so
+some rooms and people collide), then times conflicts.find_conflicts() and,
+up to --naive-max sessions, the pairwise find_conflicts_naive(), checking
+that both find the same conflicts. The last column divides the sweep time
+by n log2 n; it stays roughly flat if the sweep scales as n log n.
+
+    python3 benchmark_conflicts.py [--sizes 1000,2000,5000,10000,20000,50000] [--naive-max 5000]
+"""
+
+import argparse
+import math
+import random
+import time
+
+from conflicts import find_conflicts, find_conflicts_naive
+
+DAYS = ["Thursday", "Friday", "Saturday"]
+SLOT_STARTS = [8 * 60 + i * 90 for i in range(7)]  # 8:00am to 5:00pm
+SESSION_MINUTES = 75
+SESSIONS_PER_ROOM = len(DAYS) * len(SLOT_STARTS)
+PARTICIPANTS_PER_SESSION = 4
+PEOPLE_PER_SESSION = 2.5  # pool size relative to the session count
+NUDGED_SHARE = 0.05
+
+
+def synthetic_schedule(n, seed=0):
+    rng = random.Random(seed)
+    rooms = max(1, -(-n // SESSIONS_PER_ROOM))
+    people = [(f"Person {i}", f"University {i % 400}") for i in range(int(n * PEOPLE_PER_SESSION))]
+    slots = [(day, start, room) for day in DAYS for start in SLOT_STARTS for room in range(rooms)]
+    sessions = []
+    for ordinal, (day, start, room) in enumerate(slots[:n]):
+        if rng.random() < NUDGED_SHARE:
+            start += rng.choice((-45, -30, 30, 45))
+        end = start + SESSION_MINUTES
+        sessions.append({
+            "day": day,
+            "id": str(1000 + ordinal),
+            "start_minutes": start,
+            "end_minutes": end,
+            "location": f"Room {room}",
+            "title": f"Session {ordinal}",
+            "participants": [{"title": "", "name": name, "affiliation": affiliation}
+                             for name, affiliation in rng.sample(people, PARTICIPANTS_PER_SESSION)],
+        })
+    # Sessions arrive in program order, not time order
+    rng.shuffle(sessions)
+    return sessions
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark conflict detection on synthetic schedules.")
+    parser.add_argument("--sizes", default="1000,2000,5000,10000,20000,50000",
+                        help="comma-separated session counts")
+    parser.add_argument("--naive-max", type=int, default=5000,
+                        help="largest schedule to also check pairwise (default: 5000)")
+    args = parser.parse_args()
+
+    print(f"{'sessions':>9} {'conflicts':>10} {'sweep ms':>10} {'pairwise ms':>12} {'agree':>6} "
+          f"{'sweep ns / (n log n)':>21}")
+    for n in (int(size) for size in args.sizes.split(",")):
+        sessions = synthetic_schedule(n)
+        conflicts, sweep_seconds = timed(find_conflicts, sessions)
+        pairwise, agree = "-", "-"
+        if n <= args.naive_max:
+            naive, naive_seconds = timed(find_conflicts_naive, sessions)
+            pairwise = f"{naive_seconds * 1000:.0f}"
+            agree = "yes" if {(c["kind"], *c["sessions"]) for c in conflicts} == naive else "NO"
+        per_nlogn = sweep_seconds * 1e9 / (n * math.log2(n))
+        print(f"{n:>9,} {len(conflicts):>10,} {sweep_seconds * 1000:>10.0f} {pairwise:>12} {agree:>6} "
+              f"{per_nlogn:>21.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""
+Extraction benchmark and regression check.
+
+Runs both parsers over the bundled PDFs, each in a fresh process so peak
+RSS belongs to that parser alone, and records:
+
+  - wall time per stage and in total, and pages/sec
+  - peak RSS
+  - field completeness: the share of sessions (and participants) with each
+    field filled in, plus the session count per day
+
+extract_sessions is timed as extract_sessions_from_pdf() does its work
+uncached, split into "layout" (pdfplumber lines), "calibrate" (the layout
+profile), "parse" (the session state machine plus normalized times) and
+"quality" (extraction_quality scores, plus the strict layout of low
+scorers' pages in refine_document()). ScheduleParser is timed as one
+"parse" stage, since it reads and parses page by page. hybrid is
+extract_sessions with the PyPDF2 text pre-pass (--engine hybrid), which adds
+a "prepass" stage and lays out only the pages it finds sessions on; its
+speedup over extract_sessions is reported, and the run fails if its
+sessions differ from extract_sessions' in any way.
+
+Every page of the bundled PDFs holds sessions, so there the pre-pass is
+pure overhead. --pad-pages N benchmarks copies with a cover page and N
+participant-index pages added to each PDF, as in a full program book
+(those results aren't compared with the baseline).
+
+Results are compared with a JSON baseline; the run exits with status 1 if
+an engine got slower than --max-slowdown times its baseline, used more than
+--max-rss-growth times the memory, or lost more than --max-quality-drop of
+any completeness share or any sessions.
+
+    python3 benchmark_extraction.py [--repeat N] [--baseline benchmark_baseline.json]
+    python3 benchmark_extraction.py --save-baseline [--engine hybrid]
+    python3 benchmark_extraction.py --engine extract_sessions --engine hybrid --pad-pages 60
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+PDF_FILES = [("spsa_thursday.pdf", "Thursday"), ("spsa_friday.pdf", "Friday"),
+             ("spsa_saturday.pdf", "Saturday")]
+BASELINE_FORMAT = 1
+DEFAULT_BASELINE = "benchmark_baseline.json"
+
+# Fields each engine is expected to fill in, per session and per participant
+EXTRACT_SESSION_FIELDS = ("start_time", "location", "section", "title", "participants")
+EXTRACT_PARTICIPANT_FIELDS = ("name", "affiliation", "title")
+SCHEDULE_PARSER_SESSION_FIELDS = ("title", "day_time", "location", "category", "participants")
+SCHEDULE_PARSER_PARTICIPANT_FIELDS = ("name", "affiliation", "paper")
+
+
+def completeness(sessions, session_fields, participant_fields):
+    participants = [p for s in sessions for p in s.get("participants", [])]
+    shares = {}
+    for field in session_fields:
+        shares[field] = sum(bool(s.get(field)) for s in sessions) / len(sessions) if sessions else 0.0
+    for field in participant_fields:
+        shares[f"participant.{field}"] = (
+            sum(bool(p.get(field)) for p in participants) / len(participants) if participants else 0.0)
+    return {key: round(value, 4) for key, value in shares.items()}
+
+
+def peak_rss_kb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes on Linux
+    return usage // 1024 if sys.platform == "darwin" else usage
+
+
+def output_digest(sessions):
+    return hashlib.sha256(json.dumps(sessions, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def run_extract_sessions(pdf_files=PDF_FILES, prepass=False):
+    """Worker: time extract_sessions over every PDF, uncached."""
+    import pdfplumber
+
+    import extract_sessions
+    from layout_profile import calibrate
+    from schedule_time import add_time_fields
+    from tracing import TRACER
+
+    stages = {"prepass": 0.0} if prepass else {}
+    stages.update({"layout": 0.0, "calibrate": 0.0, "parse": 0.0, "quality": 0.0})
+    sessions_by_day = {}
+    pages = 0
+    sessions = []
+    if prepass:
+        # The pre-pass runs inside extract_lines_from_pdf(); its span separates it from layout
+        TRACER.enable()
+    for pdf_path, day in pdf_files:
+        with pdfplumber.open(pdf_path) as pdf:
+            pages += len(pdf.pages)
+        start = time.perf_counter()
+        # As extract_lines_from_pdf(), keeping the job for refine_document()
+        job = extract_sessions.queue_pdf(pdf_path, prepass=prepass)
+        lines = list(extract_sessions.iter_pdf_lines(job))
+        stages["layout"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        layout = calibrate(lines) or extract_sessions.DEFAULT_LAYOUT
+        stages["calibrate"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        parsed = extract_sessions.parse_session_lines(lines, day, layout)
+        stages["parse"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        parsed = extract_sessions.refine_document(job, day, layout, parsed)
+        stages["quality"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        day_sessions = [add_time_fields(s.to_dict()) for s in parsed]
+        stages["parse"] += time.perf_counter() - start
+        sessions_by_day[day] = len(day_sessions)
+        sessions.extend(day_sessions)
+
+    if prepass:
+        stages["prepass"] = TRACER.summary()["spans"].get("prepass", {}).get("total_ms", 0.0) / 1000
+        stages["layout"] -= stages["prepass"]
+    return {"pages": pages, "stages": stages, "sessions": sessions_by_day,
+            "completeness": completeness(sessions, EXTRACT_SESSION_FIELDS, EXTRACT_PARTICIPANT_FIELDS),
+            "peak_rss_kb": peak_rss_kb(), "output": output_digest(sessions)}
+
+
+def run_hybrid(pdf_files=PDF_FILES):
+    """Worker: extract_sessions with the text pre-pass."""
+    return run_extract_sessions(pdf_files, prepass=True)
+
+
+def run_schedule_parser(pdf_files=PDF_FILES):
+    """Worker: time parse_schedule.ScheduleParser over every PDF."""
+    import PyPDF2
+
+    from parse_schedule import ScheduleParser
+
+    stages = {"parse": 0.0}
+    sessions_by_day = {}
+    pages = 0
+    sessions = []
+    for pdf_path, day in pdf_files:
+        with open(pdf_path, "rb") as f:
+            pages += len(PyPDF2.PdfReader(f).pages)
+        start = time.perf_counter()
+        day_sessions = ScheduleParser(pdf_path, day).parse()
+        stages["parse"] += time.perf_counter() - start
+        sessions_by_day[day] = len(day_sessions)
+        sessions.extend(day_sessions)
+
+    return {"pages": pages, "stages": stages, "sessions": sessions_by_day,
+            "completeness": completeness(sessions, SCHEDULE_PARSER_SESSION_FIELDS,
+                                         SCHEDULE_PARSER_PARTICIPANT_FIELDS),
+            "peak_rss_kb": peak_rss_kb()}
+
+
+ENGINES = {"extract_sessions": run_extract_sessions, "hybrid": run_hybrid, "parse_schedule": run_schedule_parser}
+
+
+def _text_page(writer, lines, size=9, leading=11):
+    """A PyPDF2 page showing lines of Helvetica text."""
+    from PyPDF2 import PageObject
+    from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+    page = PageObject.create_blank_page(width=612, height=792)
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    page[NameObject("/Resources")] = DictionaryObject({
+        NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})})
+    escaped = (line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines)
+    content = DecodedStreamObject()
+    content.set_data("\n".join([f"BT /F1 {size} Tf {leading} TL 72 740 Td"]
+                               + [f"({line}) Tj T*" for line in escaped] + ["ET"]).encode("latin-1"))
+    page[NameObject("/Contents")] = writer._add_object(content)
+    return page
+
+
+def padded_copies(pdf_files, index_pages, directory):
+    """Copies of the PDFs with a cover page in front and index_pages of participant index behind."""
+    from PyPDF2 import PdfReader, PdfWriter
+
+    padded = []
+    for pdf_path, day in pdf_files:
+        writer = PdfWriter()
+        writer.add_page(_text_page(writer, ["SPSA 2026 Annual Meeting", "New Orleans", f"{day} Program"],
+                                   size=24, leading=30))
+        for page in PdfReader(pdf_path).pages:
+            writer.add_page(page)
+        for n in range(index_pages):
+            entries = [f"Surname{n:03d}{i:02d}, Given N. ..... {2100 + (7 * i) % 900}, {3100 + (11 * i) % 900}"
+                       for i in range(60)]
+            writer.add_page(_text_page(writer, ["Index of Participants"] + entries))
+        path = os.path.join(directory, os.path.basename(pdf_path))
+        with open(path, "wb") as f:
+            writer.write(f)
+        padded.append((path, day))
+    return padded
+
+
+def measure(name, repeat, pdf_files=PDF_FILES):
+    """Best-of-repeat timings for one engine, each run in a fresh process."""
+    best = None
+    context = multiprocessing.get_context("spawn")
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(ENGINES[name], pdf_files).result()
+        result["seconds"] = sum(result["stages"].values())
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    best["stages"] = {stage: round(seconds, 3) for stage, seconds in best["stages"].items()}
+    best["seconds"] = round(best["seconds"], 3)
+    best["pages_per_sec"] = round(best["pages"] / best["seconds"], 2)
+    return best
+
+
+def compare(name, result, baseline, args):
+    """Regression messages for one engine against its baseline entry."""
+    problems = []
+    if result["seconds"] > baseline["seconds"] * args.max_slowdown:
+        problems.append(f"{name}: {result['seconds']:.2f}s vs baseline {baseline['seconds']:.2f}s "
+                        f"(limit {args.max_slowdown:.2f}x)")
+    if result["peak_rss_kb"] > baseline["peak_rss_kb"] * args.max_rss_growth:
+        problems.append(f"{name}: peak RSS {result['peak_rss_kb']:,} KB vs baseline "
+                        f"{baseline['peak_rss_kb']:,} KB (limit {args.max_rss_growth:.2f}x)")
+    for field, share in baseline["completeness"].items():
+        current = result["completeness"].get(field, 0.0)
+        if current < share - args.max_quality_drop:
+            problems.append(f"{name}: {field} filled in {current:.1%} vs baseline {share:.1%}")
+    for day, count in baseline["sessions"].items():
+        if result["sessions"].get(day, 0) < count:
+            problems.append(f"{name}: {result['sessions'].get(day, 0)} {day} sessions vs baseline {count}")
+    return problems
+
+
+def print_result(name, result, baseline=None):
+    def versus(key, fmt):
+        return f" (baseline {fmt.format(baseline[key])})" if baseline else ""
+
+    print(f"{name}")
+    stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in result["stages"].items())
+    print(f"  time      {result['seconds']:.2f}s{versus('seconds', '{:.2f}s')}  [{stages}]")
+    print(f"  pages/sec {result['pages_per_sec']:.2f}{versus('pages_per_sec', '{:.2f}')}")
+    rss_before = f" (baseline {baseline['peak_rss_kb'] / 1024:.0f} MB)" if baseline else ""
+    print(f"  peak RSS  {result['peak_rss_kb'] / 1024:.0f} MB{rss_before}")
+    print(f"  sessions  {sum(result['sessions'].values())} "
+          + " ".join(f"{day}={count}" for day, count in result["sessions"].items()))
+    for field, share in result["completeness"].items():
+        before = ""
+        if baseline and field in baseline["completeness"]:
+            before = f" (baseline {baseline['completeness'][field]:.1%})"
+        print(f"  {field:<24} {share:6.1%}{before}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark both parsers and check for regressions.")
+    parser.add_argument("--engine", choices=sorted(ENGINES), action="append",
+                        help="only run this engine (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per engine; the fastest is kept")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write this run's results as the new baseline instead of comparing")
+    parser.add_argument("--max-slowdown", type=float, default=1.25,
+                        help="fail if an engine takes more than this times its baseline time (default: 1.25)")
+    parser.add_argument("--max-rss-growth", type=float, default=1.5,
+                        help="fail if peak RSS exceeds this times the baseline (default: 1.5)")
+    parser.add_argument("--max-quality-drop", type=float, default=0.01,
+                        help="fail if any completeness share drops by more than this (default: 0.01)")
+    parser.add_argument("--pad-pages", type=int, default=0, metavar="N",
+                        help="benchmark copies of the PDFs with a cover and N index pages each "
+                             "(not compared with or saved as the baseline)")
+    args = parser.parse_args()
+    if args.pad_pages and args.save_baseline:
+        parser.error("--save-baseline records the bundled PDFs; drop --pad-pages")
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.pad_pages:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_files = PDF_FILES
+        if args.pad_pages:
+            pdf_files = padded_copies(PDF_FILES, args.pad_pages, directory)
+            print(f"Padded each PDF with a cover and {args.pad_pages} index pages\n")
+
+        results = {}
+        problems = []
+        for name in args.engine or list(ENGINES):
+            results[name] = measure(name, args.repeat, pdf_files)
+            engine_baseline = baseline["engines"].get(name) if baseline and not args.save_baseline else None
+            print_result(name, results[name], engine_baseline)
+            if engine_baseline:
+                problems.extend(compare(name, results[name], engine_baseline, args))
+
+    if "hybrid" in results and "extract_sessions" in results:
+        full, hybrid = results["extract_sessions"], results["hybrid"]
+        identical = hybrid["output"] == full["output"]
+        print(f"\nhybrid vs extract_sessions: {full['seconds'] / hybrid['seconds']:.2f}x, "
+              f"output {'identical' if identical else 'DIFFERENT'}")
+        if not identical:
+            problems.append("hybrid: sessions differ from extract_sessions")
+
+    if args.pad_pages:
+        if problems:
+            print("\nPROBLEMS:")
+            for problem in problems:
+                print(f"  {problem}")
+            raise SystemExit(1)
+        return
+
+    if args.save_baseline:
+        # With --engine, only the engines that ran are replaced
+        engines = dict(baseline["engines"]) if baseline and args.engine else {}
+        engines.update(results)
+        report = {"format": BASELINE_FORMAT, "python": platform.python_version(),
+                  "machine": platform.machine(), "cpus": os.cpu_count(), "engines": engines}
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nSaved baseline to {args.baseline}")
+    elif baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+    elif problems:
+        print("\nREGRESSIONS:")
+        for problem in problems:
+            print(f"  {problem}")
+        raise SystemExit(1)
+    else:
+        print("\nNo regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Related sessions at scale: batched sparse products vs. every pair on its own.
+
+Generates synthetic programs whose titles are drawn from the real
+schedule's words (each session leans on one real session's vocabulary, so
+there are topics to find), then times related_sessions.related_batched()
+and, up to --pairwise-max sessions, related_pairwise(), checking that both
+pick the same top k.
+
+    python3 benchmark_related.py [schedule_all.json] [--sizes 385,1000,2000,5000,10000] [--pairwise-max 2000]
+"""
+
+import argparse
+import random
+import time
+
+from build_artifacts import load_sessions
+from related_sessions import (
+    DEFAULT_K,
+    DEFAULT_MEMORY_MB,
+    related_batched,
+    related_pairwise,
+    session_terms,
+)
+
+TOPIC_SHARE = 0.7  # share of a session's words taken from its topic session
+PAPERS = (3, 5)
+PAPER_WORDS = (6, 12)
+
+
+def synthetic_program(source, n, seed=0):
+    rng = random.Random(seed)
+    topics = [terms for terms in (session_terms(session) for session in source) if terms]
+    everything = [term for terms in topics for term in terms]
+
+    def words(topic, count):
+        return " ".join(rng.choice(topic) if rng.random() < TOPIC_SHARE else rng.choice(everything)
+                        for _ in range(count))
+
+    sessions = []
+    for ordinal in range(n):
+        topic = rng.choice(topics)
+        sessions.append({
+            "day": "Thursday",
+            "id": str(1000 + ordinal),
+            "title": words(topic, 6),
+            "participants": [{"title": words(topic, rng.randint(*PAPER_WORDS)), "name": f"Person {ordinal}.{i}",
+                              "affiliation": None} for i in range(rng.randint(*PAPERS))],
+        })
+    return sessions
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def agree(batched, pairwise, tolerance=0.002):
+    """Same top k, allowing float32 rounding to swap near-ties."""
+    for ordinals, scores, expected, expected_scores in zip(*batched, *pairwise):
+        if ordinals != expected and any(abs(a - b) > tolerance for a, b in zip(scores, expected_scores)):
+            return False
+        if len(ordinals) != len(expected):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the related-sessions index on synthetic programs.")
+    parser.add_argument("source", nargs="?", default="schedule_all.json", help="where to take words from")
+    parser.add_argument("--sizes", default="385,1000,2000,5000,10000", help="comma-separated session counts")
+    parser.add_argument("--pairwise-max", type=int, default=2000,
+                        help="largest program to also compute pair by pair (default: 2000)")
+    parser.add_argument("-k", type=int, default=DEFAULT_K)
+    parser.add_argument("--memory-mb", type=float, default=DEFAULT_MEMORY_MB,
+                        help=f"memory budget for the batched products (default: {DEFAULT_MEMORY_MB})")
+    args = parser.parse_args()
+
+    source = load_sessions(args.source)
+    print(f"{'sessions':>9} {'batched ms':>11} {'pairwise ms':>12} {'speedup':>8} {'agree':>6}")
+    for n in (int(size) for size in args.sizes.split(",")):
+        sessions = synthetic_program(source, n)
+        batched, batched_seconds = timed(related_batched, sessions, args.k, args.memory_mb)
+        pairwise_ms, speedup, same = "-", "-", "-"
+        if n <= args.pairwise_max:
+            pairwise, pairwise_seconds = timed(related_pairwise, sessions, args.k)
+            pairwise_ms = f"{pairwise_seconds * 1000:.0f}"
+            speedup = f"{pairwise_seconds / batched_seconds:.1f}x"
+            same = "yes" if agree(batched, pairwise) else "NO"
+        print(f"{n:>9,} {batched_seconds * 1000:>11.0f} {pairwise_ms:>12} {speedup:>8} {same:>6}")
+
+
+if __name__ == "__main__":
+    main()
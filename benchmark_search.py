@@ -0,0 +1,102 @@
+"""
+Query latency: prebuilt inverted index vs. the front end's linear scan.
+
+Replays each query one keystroke at a time, as the search box sees it, and
+times both the linear scan filterSessions() used to do over every session
+(lowercase and substring-test title, section and each participant's name,
+affiliation and paper title) and a lookup in search_index.py's index.
+--scale N repeats the schedule N times to approximate a larger meeting.
+
+    python3 benchmark_search.py [schedule_all.json] [--scale N]
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from search_index import build_search_index, search
+
+QUERIES = [
+    "comparative politics",
+    "university of florida",
+    "dobbs",
+    "immigration attitudes",
+    "election",
+    "political theory",
+    "china",
+    "vanderbilt",
+]
+
+
+def linear_scan(sessions, query):
+    """Python port of the substring search index.html ran on every keystroke."""
+    q = query.lower()
+    matches = []
+    for ordinal, session in enumerate(sessions):
+        if q in session["title"].lower() or q in session["section"].lower():
+            matches.append(ordinal)
+            continue
+        for participant in session["participants"]:
+            if (q in participant["name"].lower() or q in participant["affiliation"].lower()
+                    or q in participant["title"].lower()):
+                matches.append(ordinal)
+                break
+    return matches
+
+
+def keystrokes(queries):
+    return [query[:n] for query in queries for n in range(1, len(query) + 1)]
+
+
+def time_each(fn, inputs, repeat):
+    """Best-of-repeat latency for each input, in microseconds."""
+    latencies = []
+    for value in inputs:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(value)
+            best = min(best, time.perf_counter() - start)
+        latencies.append(best * 1e6)
+    return latencies
+
+
+def summarize(name, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:<16} mean {statistics.mean(latencies):>10.1f} us   p95 {p95:>10.1f} us   "
+          f"max {latencies[-1]:>10.1f} us")
+    return statistics.mean(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search index vs. linear scan.")
+    parser.add_argument("source", nargs="?", default="schedule_all.json")
+    parser.add_argument("--scale", type=int, default=1, help="repeat the schedule this many times")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per keystroke; the best is kept")
+    args = parser.parse_args()
+
+    with open(args.source, encoding="utf-8") as f:
+        sessions = json.load(f) * args.scale
+
+    start = time.perf_counter()
+    index = build_search_index(sessions)
+    build_seconds = time.perf_counter() - start
+    participants = sum(len(s["participants"]) for s in sessions)
+    print(f"{len(sessions)} sessions, {participants} participant records, {len(index['terms'])} terms; "
+          f"index built in {build_seconds * 1000:.0f} ms\n")
+
+    inputs = keystrokes(QUERIES)
+    print(f"{len(inputs)} keystrokes over {len(QUERIES)} queries")
+    scan = summarize("linear scan", time_each(lambda q: linear_scan(sessions, q), inputs, args.repeat))
+    lookup = summarize("index lookup", time_each(lambda q: search(index, q), inputs, args.repeat))
+    print(f"\nspeedup {scan / lookup:.1f}x (mean)")
+
+    agree = sum(set(linear_scan(sessions, q)) == (search(index, q) or set()) for q in QUERIES)
+    print(f"{agree}/{len(QUERIES)} full queries return the same sessions "
+          "(the index matches word prefixes, the scan raw substrings)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Load test for schedule_server.py on localhost.
+
+Starts the server in a child process (or targets --url), then keeps
+--connections keep-alive clients busy for --duration seconds with a mix of
+typical requests: day listings, search-as-you-type queries, time windows,
+session and person lookups. Every client accepts gzip, and --revalidate of
+the requests send back the ETag from an earlier response the way a browser
+revalidates, expecting a 304. Reports requests/sec, latency percentiles,
+status counts and the server's cache counters. Unless --url is given it
+runs twice, with the response cache on and off.
+
+Client and server share the machine, so on few cores the numbers are a
+floor for what the server alone can do.
+
+    python3 benchmark_server.py [schedule_all.json] [--connections 20] [--duration 5] [--url http://host:port]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import quote, urlsplit
+
+from build_artifacts import load_sessions
+
+
+def request_mix(sessions):
+    """Paths weighted roughly like a phone browsing the program."""
+    days = list(dict.fromkeys(s["day"] for s in sessions))
+    words = [w for s in sessions[:60] for w in s["title"].split() if len(w) > 4 and w.isalpha()]
+    names = [p["name"].split()[-1] for s in sessions[:60] for p in s["participants"] if p["name"]]
+    ids = sorted({s["id"] for s in sessions})
+    rng = random.Random(0)
+    paths = []
+    paths += [f"/sessions?day={day}" for day in days] * 4
+    paths += [f"/sessions?day={day}&after={clock}" for day in days for clock in ("9:30am", "1:00pm", "15:00")]
+    for word in rng.sample(words, min(30, len(words))):
+        # Search-as-you-type: every prefix of three letters or more
+        paths += [f"/sessions?q={quote(word[:n].lower())}" for n in range(3, len(word) + 1)]
+    paths += [f"/sessions/{session_id}" for session_id in rng.sample(ids, min(40, len(ids)))]
+    paths += [f"/people/{quote(name)}" for name in rng.sample(names, min(40, len(names)))]
+    return paths
+
+
+async def fetch(reader, writer, host, path, etag=None):
+    lines = [f"GET {path} HTTP/1.1", f"Host: {host}", "Accept-Encoding: gzip"]
+    if etag:
+        lines.append(f"If-None-Match: {etag}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers.get("etag")
+
+
+async def client(host, port, paths, deadline, revalidate, seed, latencies, statuses):
+    rng = random.Random(seed)
+    etags = {}
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            path = rng.choice(paths)
+            etag = etags.get(path) if rng.random() < revalidate else None
+            start = time.perf_counter()
+            status, new_etag = await fetch(reader, writer, host, path, etag)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if new_etag:
+                etags[path] = new_etag
+    finally:
+        writer.close()
+
+
+async def get_json(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        lines = [f"GET {path} HTTP/1.1", f"Host: {host}", "Connection: close"]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        response = await reader.read()
+    finally:
+        writer.close()
+    return json.loads(response.partition(b"\r\n\r\n")[2])
+
+
+async def load(host, port, paths, connections, duration, revalidate):
+    latencies, statuses = [], {}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(client(host, port, paths, deadline, revalidate, seed, latencies, statuses)
+                           for seed in range(connections)))
+    elapsed = time.perf_counter() - start
+    return latencies, statuses, elapsed, await get_json(host, port, "/stats")
+
+
+def report(label, latencies, statuses, elapsed, stats):
+    ms = sorted(latency * 1000 for latency in latencies)
+    p = lambda q: ms[min(len(ms) - 1, int(q * len(ms)))]
+    cache = stats["cache"]
+    print(f"{label}")
+    print(f"  {len(ms):,} requests in {elapsed:.1f}s: {len(ms) / elapsed:,.0f} req/s")
+    print(f"  latency ms: mean {statistics.fmean(ms):.2f}  p50 {p(0.5):.2f}  p90 {p(0.9):.2f}  p99 {p(0.99):.2f}")
+    print("  status: " + ", ".join(f"{status} x{count:,}" for status, count in sorted(statuses.items())))
+    looked_up = cache["hits"] + cache["misses"]
+    if looked_up:
+        print(f"  cache: {cache['hits']:,} hits / {looked_up:,} lookups ({cache['hits'] / looked_up:.0%}), "
+              f"{cache['entries']} entries, {cache['bytes'] / (1 << 20):.1f} MB")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(source, port, cache_size):
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "schedule_server.py"),
+         source, "--host", "127.0.0.1", "--port", str(port), "--cache-size", str(cache_size)],
+        stdout=subprocess.PIPE, text=True)
+    server.stdout.readline()  # "Serving ..." once the indexes are built and the port is open
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the schedule API on localhost.")
+    parser.add_argument("source", nargs="?", default="schedule_all.json")
+    parser.add_argument("--connections", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run (default: 5)")
+    parser.add_argument("--revalidate", type=float, default=0.3,
+                        help="share of requests that send a known ETag back (default: 0.3)")
+    parser.add_argument("--url", help="test a running server instead of starting one")
+    args = parser.parse_args()
+
+    paths = request_mix(load_sessions(args.source))
+    print(f"{len(paths)} distinct request paths, {args.connections} connections, {args.duration:g}s per run")
+
+    if args.url:
+        url = urlsplit(args.url)
+        report(args.url, *asyncio.run(load(url.hostname, url.port or 80, paths, args.connections,
+                                           args.duration, args.revalidate)))
+        return
+
+    for label, cache_size in (("response cache on", 512), ("response cache off", 0)):
+        port = free_port()
+        server = start_server(args.source, port, cache_size)
+        try:
+            report(label, *asyncio.run(load("127.0.0.1", port, paths, args.connections,
+                                            args.duration, args.revalidate)))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Compact build output for the web front end.
+
+Turns the extracted sessions into what index.html actually downloads:
+
+  data/manifest.json          days in order, with shard names, counts and sizes
+  data/schedule_{day}.json    one minified shard per day
+  data/search_index.json      token -> session ordinals (see search_index.py)
+  data/time_slots.json        day -> start time -> session ordinals (see schedule_time.py)
+  data/people.json            people and institutions -> session ordinals (see people_index.py)
+  data/related.json           each session's most similar sessions (see related_sessions.py; needs NumPy)
+  data/pages/{day}-{n}.html   pre-rendered session cards in fixed-size chunks (see render_pages.py)
+  data/calendars/             an .ics file per person and per room (see calendars.py)
+  data/patches/{version}.json delta from each recent version to this one (see schedule_diff.py)
+  data/changelog.json         what changed between recent versions
+  *.gz, *.br                  precompressed siblings for static servers
+
+Each shard carries its own string table. Locations, sections, paper titles
+and affiliations repeat across sessions and co-authors, so those fields
+hold an index into `strings` instead of the text:
+
+  {"format": 1, "day": "Thursday", "strings": [...], "sessions": [...]}
+
+Each participant also carries "person", its index into people.json.
+
+Everything is written deterministically (days in source order, gzip
+mtime 0), so unchanged input gives byte-identical artifacts.
+
+    python3 build_artifacts.py [schedule_all.json] [-o data] [--history-dir .schedule_history]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+from calendars import write_calendars
+from people_index import build_people_index
+from related_sessions import build_related_index
+from render_pages import CHUNK_SIZE, render_days
+from schedule_diff import DEFAULT_HISTORY_DIR, DEFAULT_KEEP, ScheduleHistory
+from schedule_io import atomic_write
+from schedule_time import build_slot_index
+from search_index import build_search_index
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ARTIFACT_FORMAT = 1
+DEFAULT_OUTPUT_DIR = "data"
+
+INTERNED_SESSION_FIELDS = ("location", "section")
+INTERNED_PARTICIPANT_FIELDS = ("title", "affiliation")
+
+
+def dumps_compact(obj):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+class StringTable:
+    """Assigns each distinct string an index in first-seen order."""
+
+    def __init__(self):
+        self.strings = []
+        self.index = {}
+
+    def intern(self, value):
+        i = self.index.get(value)
+        if i is None:
+            i = self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return i
+
+
+def compact_day(day, sessions, person_numbers=None):
+    """Build one day's shard: repeated strings replaced by string-table indexes.
+
+    person_numbers, if given, holds each session's participants' indexes
+    into people.json.
+    """
+    table = StringTable()
+    compact = []
+    for i, session in enumerate(sessions):
+        row = {key: value for key, value in session.items() if key != "day"}
+        for field in INTERNED_SESSION_FIELDS:
+            row[field] = table.intern(row[field])
+        row["participants"] = [
+            {key: table.intern(value) if key in INTERNED_PARTICIPANT_FIELDS else value
+             for key, value in participant.items()}
+            for participant in session["participants"]
+        ]
+        if person_numbers is not None:
+            for participant, person in zip(row["participants"], person_numbers[i]):
+                participant["person"] = person
+        compact.append(row)
+    return {"format": ARTIFACT_FORMAT, "day": day, "strings": table.strings, "sessions": compact}
+
+
+def group_by_day(sessions):
+    days = {}
+    for session in sessions:
+        days.setdefault(session["day"], []).append(session)
+    return days
+
+
+def write_artifact(path, data):
+    """Write data plus .gz (and .br when brotli is installed); return the sizes.
+
+    Each file is swapped in whole (schedule_io.atomic_write), so a page
+    loading during a rebuild never reads a truncated one.
+    """
+    with atomic_write(path, "wb") as f:
+        f.write(data)
+    sizes = {"bytes": len(data)}
+
+    with atomic_write(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    sizes["gzip_bytes"] = os.path.getsize(path + ".gz")
+
+    if brotli is not None:
+        with atomic_write(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+        sizes["brotli_bytes"] = os.path.getsize(path + ".br")
+    elif os.path.exists(path + ".br"):
+        # Don't leave a stale sibling that no longer matches
+        os.remove(path + ".br")
+    return sizes
+
+
+def remove_stale(directory, keep):
+    """Remove files in directory, .gz/.br siblings included, whose base name isn't in keep."""
+    for name in os.listdir(directory):
+        base = name[:-len(".gz")] if name.endswith(".gz") else name[:-len(".br")] if name.endswith(".br") else name
+        if base not in keep:
+            os.remove(os.path.join(directory, name))
+
+
+def write_pages(sessions, person_numbers, related, output_dir, chunk_size=CHUNK_SIZE):
+    """Write the pre-rendered card chunks; return the manifest entry."""
+    page_dir = os.path.join(output_dir, "pages")
+    os.makedirs(page_dir, exist_ok=True)
+    pages = {"chunk_size": chunk_size, "days": []}
+    written = set()
+    for day, chunks, _ in render_days(sessions, person_numbers, related, chunk_size):
+        count = sum(session["day"] == day for session in sessions)
+        entry = {"day": day, "chunks": []}
+        for n, chunk in enumerate(chunks):
+            file_name = f"{day.lower()}-{n}.html"
+            chunk_entry = {"file": f"pages/{file_name}", "sessions": min(chunk_size, count - n * chunk_size)}
+            chunk_entry.update(write_artifact(os.path.join(page_dir, file_name), chunk.encode("utf-8")))
+            entry["chunks"].append(chunk_entry)
+            written.add(file_name)
+        pages["days"].append(entry)
+    # A day that shrank leaves chunks past its new end
+    remove_stale(page_dir, written)
+    return pages
+
+
+def write_patches(sessions, version, output_dir, history_dir, keep=DEFAULT_KEEP):
+    """Record version in the history; write patches to it and the change log.
+
+    Returns the manifest entries: "patches" maps each older version to its
+    patch file, so a client holding that version knows what to fetch.
+    """
+    history = ScheduleHistory(history_dir, keep)
+    history.record(version, sessions)
+    patch_dir = os.path.join(output_dir, "patches")
+    os.makedirs(patch_dir, exist_ok=True)
+    patches = {}
+    for old_version, delta in history.patches(sessions, version):
+        file_name = f"patches/{old_version}.json"
+        entry = {"file": file_name}
+        entry.update(write_artifact(os.path.join(output_dir, file_name), dumps_compact(delta).encode("utf-8")))
+        patches[old_version] = entry
+    # Versions that dropped out of the history no longer get a patch
+    remove_stale(patch_dir, {os.path.basename(entry["file"]) for entry in patches.values()})
+
+    changelog = {"file": "changelog.json"}
+    changelog.update(write_artifact(os.path.join(output_dir, "changelog.json"),
+                                    dumps_compact(history.changelog()).encode("utf-8")))
+    return {"patches": patches, "changelog": changelog}
+
+
+def build_artifacts(sessions, output_dir=DEFAULT_OUTPUT_DIR, history_dir=None):
+    """Write the per-day shards and the manifest; return the manifest.
+
+    With history_dir, also record this version there and write patches from
+    the versions before it (write_patches).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    version = hashlib.sha256()
+    days = []
+    offset = 0
+    grouped = group_by_day(sessions)
+    # Index in shard order so ordinals line up with the offsets below
+    ordered = [session for day_sessions in grouped.values() for session in day_sessions]
+    people, person_numbers = build_people_index(ordered)
+    for day, day_sessions in grouped.items():
+        day_people = person_numbers[offset:offset + len(day_sessions)]
+        data = dumps_compact(compact_day(day, day_sessions, day_people)).encode("utf-8")
+        version.update(data)
+        file_name = f"schedule_{day.lower()}.json"
+        # offset: ordinal of the day's first session, as used by the search index
+        entry = {"day": day, "file": file_name, "sessions": len(day_sessions), "offset": offset}
+        entry.update(write_artifact(os.path.join(output_dir, file_name), data))
+        days.append(entry)
+        offset += len(day_sessions)
+
+    data = dumps_compact(build_search_index(ordered)).encode("utf-8")
+    search = {"file": "search_index.json"}
+    search.update(write_artifact(os.path.join(output_dir, "search_index.json"), data))
+
+    data = dumps_compact(build_slot_index(ordered)).encode("utf-8")
+    slots = {"file": "time_slots.json"}
+    slots.update(write_artifact(os.path.join(output_dir, "time_slots.json"), data))
+
+    data = dumps_compact(people).encode("utf-8")
+    version.update(data)
+    people_entry = {"file": "people.json"}
+    people_entry.update(write_artifact(os.path.join(output_dir, "people.json"), data))
+
+    manifest = {"format": ARTIFACT_FORMAT, "version": version.hexdigest()[:16], "days": days,
+                "search_index": search, "time_slots": slots, "people": people_entry}
+
+    related = build_related_index(ordered)
+    related_path = os.path.join(output_dir, "related.json")
+    if related is not None:
+        manifest["related"] = {"file": "related.json"}
+        manifest["related"].update(write_artifact(related_path, dumps_compact(related).encode("utf-8")))
+    else:
+        # Without NumPy there's no index; don't leave an old one behind
+        for path in (related_path, related_path + ".gz", related_path + ".br"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    manifest["pages"] = write_pages(ordered, person_numbers, related and related["related"], output_dir)
+    calendars = write_calendars(ordered, os.path.join(output_dir, "calendars"))
+    manifest["calendars"] = {"index": "calendars/index.json", "people": calendars["people"],
+                             "rooms": calendars["rooms"], "bytes": calendars["bytes"]}
+    if history_dir:
+        # The history keeps sessions in shard order, which is what clients hold
+        manifest.update(write_patches(ordered, manifest["version"], output_dir, history_dir))
+    write_artifact(os.path.join(output_dir, "manifest.json"), dumps_compact(manifest).encode("utf-8"))
+    return manifest
+
+
+def load_sessions(path):
+    """Read sessions from a JSON array or, for .jsonl, one session per line."""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def print_report(manifest, source_path=None):
+    columns = ["bytes", "gzip_bytes"] + (["brotli_bytes"] if brotli is not None else [])
+    print(f"{'artifact':<28}" + "".join(f"{c:>14}" for c in columns))
+    totals = dict.fromkeys(columns, 0)
+    for entry in manifest["days"]:
+        print(f"{entry['file']:<28}" + "".join(f"{entry[c]:>14,}" for c in columns))
+        for c in columns:
+            totals[c] += entry[c]
+    print(f"{'all days':<28}" + "".join(f"{totals[c]:>14,}" for c in columns))
+    for key in ("search_index", "time_slots", "people", "related"):
+        entry = manifest.get(key)
+        if entry:
+            print(f"{entry['file']:<28}" + "".join(f"{entry[c]:>14,}" for c in columns))
+    for entry in manifest["pages"]["days"]:
+        label = f"pages/{entry['day'].lower()}-*.html ({len(entry['chunks'])})"
+        print(f"{label:<28}" + "".join(f"{sum(chunk[c] for chunk in entry['chunks']):>14,}" for c in columns))
+    if "patches" in manifest:
+        for entry in manifest["patches"].values():
+            print(f"{entry['file']:<28}" + "".join(f"{entry[c]:>14,}" for c in columns))
+        print(f"({len(manifest['patches'])} patch(es) to version {manifest['version']}; "
+              f"change log in {manifest['changelog']['file']})")
+    if "calendars" in manifest:
+        entry = manifest["calendars"]
+        print(f"{'calendars/*.ics':<28}{entry['bytes']:>14,}  "
+              f"({entry['people']} people, {entry['rooms']} rooms)")
+    if source_path:
+        print(f"{os.path.basename(source_path):<28}{os.path.getsize(source_path):>14,}")
+    if brotli is None:
+        print("(brotli not installed; skipped .br files)")
+    if "related" not in manifest:
+        print("(NumPy not installed; skipped related.json)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build compact, per-day schedule artifacts.")
+    parser.add_argument("source", nargs="?", default="schedule_all.json")
+    parser.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--history-dir", default=DEFAULT_HISTORY_DIR,
+                        help=f"earlier versions, for patches (default: {DEFAULT_HISTORY_DIR})")
+    parser.add_argument("--no-history", action="store_true", help="don't record this version or write patches")
+    args = parser.parse_args()
+
+    manifest = build_artifacts(load_sessions(args.source), args.output_dir,
+                               None if args.no_history else args.history_dir)
+    print_report(manifest, args.source)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Calendar files: one per person and one per room.
+
+Filtering the schedule once per person is quadratic in the participant
+records. Instead people are grouped in a single pass with
+people_index.build_people_index() (the same normalized person the page
+links to, with the same stable id), and rooms by normalized location. Each
+session's VEVENT is rendered once; a calendar is then just its sessions'
+events joined, so the whole run is linear in the records.
+
+  calendars/people/{person id}.ics
+  calendars/rooms/{room}.ics
+  calendars/index.json         {"people": [{"id", "name", "file", "sessions"}], "rooms": [...]}
+
+Files are written in batches of --batch-size calendars, in a process pool
+with -j > 1, at most two batches per worker in flight, so memory holds a
+batch's output rather than every calendar at once. Output is byte-identical
+between runs: UIDs come from the session anchors (render_pages.py), events
+and calendars are in a fixed order, and DTSTAMP is $SOURCE_DATE_EPOCH or,
+unset, the first session's start. Sessions without ISO times (no date for
+their day) are left out. Calendars for people and rooms no longer in the
+schedule are removed.
+
+    python3 calendars.py [schedule_all.json] [-o data/calendars] [-j 4]
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+
+from people_index import build_people_index, normalize_key
+from render_pages import session_anchors
+from schedule_io import atomic_write
+
+CALENDAR_INDEX_FORMAT = 1
+DEFAULT_OUTPUT_DIR = os.path.join("data", "calendars")
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_CALENDAR_NAME = "SPSA 2026"
+PRODID = "-//SPSA 2026 schedule//calendars.py//EN"
+UID_DOMAIN = "spsa-schedule"
+
+
+def ics_escape(text):
+    """TEXT value escaping (RFC 5545 3.3.11)."""
+    return (text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def fold(line):
+    """Fold a content line at 75 octets, never inside a UTF-8 sequence."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    start, limit = 0, 75
+    while start < len(data):
+        end = min(len(data), start + limit)
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode("utf-8"))
+        start, limit = end, 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def ics_time(iso):
+    return datetime.fromisoformat(iso).astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def dtstamp(sessions):
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    starts = [ics_time(s["start_iso"]) for s in sessions if s.get("start_iso")]
+    return min(starts) if starts else "19700101T000000Z"
+
+
+def render_event(session, anchor, stamp):
+    """The session's VEVENT, folded, or "" if it has no ISO times."""
+    if not session.get("start_iso") or not session.get("end_iso"):
+        return ""
+    description = [session["section"]] if session.get("section") else []
+    for participant in session.get("participants", []):
+        person = participant["name"] + (f" ({participant['affiliation']})" if participant.get("affiliation") else "")
+        description.append(f"{person}: {participant['title']}" if participant.get("title") else person)
+    summary = f"{session['id']}: {session['title']}" if session.get("title") else f"Session {session['id']}"
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{anchor}@{UID_DOMAIN}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART:{ics_time(session['start_iso'])}",
+        f"DTEND:{ics_time(session['end_iso'])}",
+        f"SUMMARY:{ics_escape(summary)}",
+    ]
+    if session.get("location"):
+        lines.append(f"LOCATION:{ics_escape(session['location'])}")
+    if description:
+        lines.append(f"DESCRIPTION:{ics_escape(chr(10).join(description))}")
+    lines.append("END:VEVENT")
+    return "".join(fold(line) for line in lines)
+
+
+def render_calendar(name, events):
+    header = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN", "METHOD:PUBLISH",
+              f"X-WR-CALNAME:{ics_escape(name)}"]
+    return "".join(fold(line) for line in header) + "".join(events) + "END:VCALENDAR\r\n"
+
+
+def room_file_names(keys):
+    """File-name slug per room key; sorted keys, so clashes resolve the same way every run."""
+    names = {}
+    used = set()
+    for key in sorted(keys):
+        base = re.sub(r"[^a-z0-9]+", "-", key).strip("-") or "room"
+        name, n = base, 2
+        while name in used:
+            name, n = f"{base}-{n}", n + 1
+        used.add(name)
+        names[key] = name
+    return names
+
+
+def group_calendars(sessions, calendar_name=DEFAULT_CALENDAR_NAME):
+    """One pass over the sessions; return (jobs, index).
+
+    A job is (path relative to the output directory, calendar title, session
+    ordinals); index is what calendars/index.json lists.
+    """
+    people, _ = build_people_index(sessions)
+    rooms = {}
+    for ordinal, session in enumerate(sessions):
+        key = normalize_key(session.get("location"))
+        if key:
+            room = rooms.setdefault(key, {"name": session["location"], "sessions": []})
+            room["sessions"].append(ordinal)
+
+    jobs = []
+    index = {"format": CALENDAR_INDEX_FORMAT, "people": [], "rooms": []}
+    for person in people["people"]:
+        institution = people["institutions"][person["institution"]]["name"] if person["institution"] is not None else None
+        path = f"people/{person['id']}.ics"
+        title = f"{calendar_name}: {person['name']}" + (f" ({institution})" if institution else "")
+        jobs.append((path, title, person["sessions"]))
+        index["people"].append({"id": person["id"], "name": person["name"], "institution": institution,
+                                "file": path, "sessions": len(person["sessions"])})
+    names = room_file_names(rooms)
+    for key in sorted(rooms):
+        path = f"rooms/{names[key]}.ics"
+        jobs.append((path, f"{calendar_name}: {rooms[key]['name']}", rooms[key]["sessions"]))
+        index["rooms"].append({"name": rooms[key]["name"], "file": path, "sessions": len(rooms[key]["sessions"])})
+    return jobs, index
+
+
+# Set once per process by _init_worker(): every session's rendered VEVENT
+_events = None
+
+
+def _init_worker(sessions):
+    global _events
+    stamp = dtstamp(sessions)
+    _events = [render_event(session, anchor, stamp) for session, anchor in zip(sessions, session_anchors(sessions))]
+
+
+def _write_batch(output_dir, batch):
+    """Write one batch of calendars; return the bytes written."""
+    written = 0
+    for path, title, ordinals in batch:
+        data = render_calendar(title, [_events[i] for i in ordinals]).encode("utf-8")
+        with atomic_write(os.path.join(output_dir, path), "wb") as f:
+            f.write(data)
+        written += len(data)
+    return written
+
+
+def write_calendars(sessions, output_dir=DEFAULT_OUTPUT_DIR, workers=1, batch_size=DEFAULT_BATCH_SIZE,
+                    calendar_name=DEFAULT_CALENDAR_NAME):
+    """Write every person's and room's calendar and the index; return a summary."""
+    start = time.perf_counter()
+    jobs, index = group_calendars(sessions, calendar_name)
+    for directory in ("people", "rooms"):
+        os.makedirs(os.path.join(output_dir, directory), exist_ok=True)
+    batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+
+    written = 0
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(sessions,)) as executor:
+            pending = set()
+            for batch in batches:
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    written += sum(future.result() for future in done)
+                pending.add(executor.submit(_write_batch, output_dir, batch))
+            written += sum(future.result() for future in wait(pending)[0])
+    else:
+        _init_worker(sessions)
+        for batch in batches:
+            written += _write_batch(output_dir, batch)
+
+    # Calendars of people and rooms that are gone
+    current = {path for path, _, _ in jobs}
+    for directory in ("people", "rooms"):
+        for name in os.listdir(os.path.join(output_dir, directory)):
+            if f"{directory}/{name}" not in current:
+                os.remove(os.path.join(output_dir, directory, name))
+    with atomic_write(os.path.join(output_dir, "index.json")) as f:
+        json.dump(index, f, separators=(",", ":"), ensure_ascii=False)
+
+    return {"people": len(index["people"]), "rooms": len(index["rooms"]), "files": len(jobs),
+            "bytes": written, "seconds": time.perf_counter() - start}
+
+
+def main(argv=None):
+    from build_artifacts import group_by_day, load_sessions
+
+    parser = argparse.ArgumentParser(description="Write a calendar (.ics) per person and per room.")
+    parser.add_argument("source", nargs="?", default="schedule_all.json")
+    parser.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="write batches in a process pool of this size (default: 1, serial)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"calendars per batch (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--name", default=DEFAULT_CALENDAR_NAME, help="calendar title prefix")
+    args = parser.parse_args(argv)
+
+    # Shard order, so anchors match the page's
+    sessions = [s for day_sessions in group_by_day(load_sessions(args.source)).values() for s in day_sessions]
+    summary = write_calendars(sessions, args.output_dir, max(1, args.workers), max(1, args.batch_size), args.name)
+    print(f"{summary['people']} people and {summary['rooms']} rooms: {summary['files']} calendars, "
+          f"{summary['bytes']:,} bytes in {summary['seconds']:.2f}s -> {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
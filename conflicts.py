@@ -0,0 +1,169 @@
+"""
+Double-booking checks for rooms and people.
+
+Sessions are grouped by (day, room) and by (day, person), and each group
+is swept in start-time order with a min-heap of the end times still
+running: a new session overlaps exactly the sessions left in the heap
+once everything that ended by its start is popped. That is O(n log n + k)
+for n sessions and k conflicts, against O(n^2) for comparing every pair
+(find_conflicts_naive(), kept for checking and benchmark_conflicts.py).
+
+People are matched with people_index.py (normalized name at normalized
+institution); rooms by their location text, folded the same way. Sessions
+without a time are skipped, and a range that ends before it starts runs
+past midnight.
+
+    python3 conflicts.py [schedule_all.json] [--json conflicts.json] [--limit N]
+"""
+
+import argparse
+import heapq
+import json
+
+from people_index import build_people_index, normalize_key
+from schedule_time import format_clock
+
+REPORT_FORMAT = 1
+MINUTES_PER_DAY = 24 * 60
+
+
+def session_interval(session):
+    start, end = session.get("start_minutes"), session.get("end_minutes")
+    if start is None or end is None:
+        return None
+    if end < start:
+        end += MINUTES_PER_DAY
+    return start, end
+
+
+def resource_groups(sessions, person_numbers):
+    """{(kind, day, resource key): [(start, end, ordinal), ...]} for rooms and people.
+
+    person_numbers is the second value of build_people_index(sessions).
+    """
+    groups = {}
+    for ordinal, session in enumerate(sessions):
+        interval = session_interval(session)
+        if interval is None:
+            continue
+        start, end = interval
+        day = session["day"]
+        room = normalize_key(session.get("location"))
+        if room:
+            groups.setdefault(("room", day, room), []).append((start, end, ordinal))
+        # A co-author listed twice in one session isn't booked twice
+        for person in set(person_numbers[ordinal]):
+            groups.setdefault(("person", day, person), []).append((start, end, ordinal))
+    return groups
+
+
+def sweep(intervals):
+    """Yield (ordinal_a, ordinal_b, overlap_start, overlap_end) for overlapping intervals.
+
+    intervals are (start, end, ordinal); touching ends (9:15 end, 9:15 start)
+    don't overlap.
+    """
+    active = []  # (end, ordinal) of sessions still running
+    for start, end, ordinal in sorted(intervals):
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for other_end, other in active:
+            yield other, ordinal, start, min(end, other_end)
+        heapq.heappush(active, (end, ordinal))
+
+
+def find_conflicts(sessions):
+    """Every room and person double-booking, as report entries."""
+    index, person_numbers = build_people_index(sessions)
+    conflicts = []
+    for (kind, day, key), intervals in resource_groups(sessions, person_numbers).items():
+        if len(intervals) < 2:
+            continue
+        if kind == "room":
+            resource = sessions[intervals[0][2]]["location"]
+        else:
+            resource = index["people"][key]["name"]
+        for a, b, start, end in sweep(intervals):
+            conflicts.append({
+                "kind": kind,
+                "day": day,
+                "resource": resource,
+                "sessions": sorted((a, b)),
+                "overlap": f"{format_clock(start % MINUTES_PER_DAY)}-{format_clock(end % MINUTES_PER_DAY)}",
+            })
+    conflicts.sort(key=lambda c: (c["kind"], c["day"], c["resource"], c["sessions"]))
+    return conflicts
+
+
+def find_conflicts_naive(sessions):
+    """Compare every pair of sessions: the O(n^2) check the sweep replaces.
+
+    Returns {(kind, ordinal_a, ordinal_b)} for checking find_conflicts().
+    """
+    _, person_numbers = build_people_index(sessions)
+    entries = []
+    for ordinal, session in enumerate(sessions):
+        interval = session_interval(session)
+        if interval is not None:
+            entries.append((ordinal, session["day"], interval, normalize_key(session.get("location")),
+                            set(person_numbers[ordinal])))
+    found = set()
+    for i, (a, day_a, (start_a, end_a), room_a, people_a) in enumerate(entries):
+        for b, day_b, (start_b, end_b), room_b, people_b in entries[i + 1:]:
+            if day_a != day_b or not (start_a < end_b and start_b < end_a):
+                continue
+            if room_a and room_a == room_b:
+                found.add(("room", a, b))
+            if people_a & people_b:
+                found.add(("person", a, b))
+    return found
+
+
+def build_report(sessions):
+    conflicts = find_conflicts(sessions)
+    return {
+        "format": REPORT_FORMAT,
+        "sessions": len(sessions),
+        "room_conflicts": sum(c["kind"] == "room" for c in conflicts),
+        "person_conflicts": sum(c["kind"] == "person" for c in conflicts),
+        "conflicts": conflicts,
+    }
+
+
+def print_report(report, sessions, limit=None):
+    print(f"{report['sessions']} sessions: {report['room_conflicts']} room conflicts, "
+          f"{report['person_conflicts']} person conflicts")
+    for kind in ("room", "person"):
+        entries = [c for c in report["conflicts"] if c["kind"] == kind]
+        if not entries:
+            continue
+        print(f"\n{kind.capitalize()} conflicts:")
+        for c in entries[:limit]:
+            a, b = (sessions[ordinal] for ordinal in c["sessions"])
+            print(f"  {c['day']:<9} {c['overlap']:<16} {c['resource']}")
+            print(f"      {a['id']} {a['start_time']}-{a['end_time']}  {a['title']}")
+            print(f"      {b['id']} {b['start_time']}-{b['end_time']}  {b['title']}")
+        if limit is not None and len(entries) > limit:
+            print(f"  ... and {len(entries) - limit} more")
+
+
+def main():
+    from build_artifacts import load_sessions
+
+    parser = argparse.ArgumentParser(description="Report double-booked rooms and people.")
+    parser.add_argument("source", nargs="?", default="schedule_all.json")
+    parser.add_argument("--json", metavar="FILE", help="also write the report as JSON")
+    parser.add_argument("--limit", type=int, default=20, help="conflicts to print per kind (default: 20)")
+    args = parser.parse_args()
+
+    sessions = load_sessions(args.source)
+    report = build_report(sessions)
+    print_report(report, sessions, args.limit)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
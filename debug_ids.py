@@ -1,16 +1,48 @@
-import pdfplumber
+"""
+Find where a session id appears in the program PDFs.
+
+Lists every laid-out line containing the id, with its page, position and
+font, so a session the parser missed or split can be traced to the line
+records it came from. Reads the layout dump in .extract_cache/
+(layout_dump.py) rather than opening the PDFs.
+
+    python3 debug_ids.py 2100 [spsa_thursday.pdf ...]
+"""
+
+import argparse
+import os
 import re
 
-def debug_session_ids(pdf_path):
-    with pdfplumber.open(pdf_path) as pdf:
-        page = pdf.pages[1] # Check page 2 (index 1) as page 1 is often cover
-        print(f"--- Debugging Page 2 of {pdf_path} ---")
-        
-        print("\n--- Checking Lines ---")
-        lines = page.extract_text_lines()
-        for line in lines:
-            if "2100" in line['text']:
-                print(f"Line with 2100: '{line['text']}' | x0: {line['x0']}")
+from layout_dump import document_pages
+
+DAY_PDFS = ["spsa_thursday.pdf", "spsa_friday.pdf", "spsa_saturday.pdf"]
+
+
+def debug_session_ids(session_id, pdf_paths=DAY_PDFS):
+    pattern = re.compile(rf"\b{re.escape(session_id)}\b")
+    found = 0
+    for pdf_path in pdf_paths:
+        if not os.path.exists(pdf_path):
+            continue
+        for n, lines in document_pages(pdf_path):
+            for line in lines:
+                if pattern.search(line["text"]):
+                    found += 1
+                    style = ("B" if line["bold"] else "") + ("I" if line["italic"] else "")
+                    print(f"{pdf_path} p{n:<3} x0={line['x0']:7.2f} top={line['top']:7.2f} "
+                          f"{line['fontname']} {style:<2} '{line['text']}'")
+    if not found:
+        print(f"{session_id} not found")
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the laid-out lines that contain a session id.")
+    parser.add_argument("session_id")
+    parser.add_argument("pdfs", nargs="*", default=DAY_PDFS)
+    args = parser.parse_args(argv)
+    debug_session_ids(args.session_id, args.pdfs)
+
 
 if __name__ == "__main__":
-    debug_session_ids("spsa_thursday.pdf")
+    main()
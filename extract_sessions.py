@@ -1,250 +1,864 @@
-import pdfplumber
-import json
-import re
+import argparse
+import io
 import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-def extract_sessions_from_pdf(pdf_path, day_name):
-    sessions = []
-    current_session = None
-    
-    # Layout constants based on inspection
-    SESSION_ID_X_MAX = 100 
-    PARTICIPANT_HEADER_X = 139.58
-    PAPER_TITLE_X = 139.58
-    AUTHOR_X = 161.18
-    
-    # Font styles (approximate based on inspection)
-    # Bold: Section Title, Session Title, "Participants", "Chair", "Discussants"
-    # Italic: Time, Location
-    # Regular: Session ID, Paper Title, Author Name
-    
+import pdfplumber
+from pdfplumber.utils import cluster_objects
+
+from build_artifacts import (
+    DEFAULT_OUTPUT_DIR,
+    build_artifacts,
+    load_sessions,
+    print_report,
+)
+from extraction_cache import (
+    DEFAULT_CACHE_DIR,
+    PARSER_VERSION,
+    ExtractionCache,
+    file_digest,
+    page_fingerprint,
+)
+from extraction_quality import THRESHOLD as QUALITY_THRESHOLD
+from extraction_quality import QualityScorer, score_sessions
+from layout_profile import calibrate
+from line_classifier import (
+    AUTHOR,
+    DAY,
+    HEADING,
+    LOCATION,
+    OTHER,
+    PAPER,
+    ROLE,
+    SESSION_ID,
+    TIME,
+    LineClassifier,
+)
+from schedule_db import build_db
+from schedule_diff import DEFAULT_HISTORY_DIR
+from schedule_io import WRITERS, atomic_write
+from schedule_model import Interner, ParticipantDraft, Session
+from schedule_time import add_time_fields, parse_dates
+from tracing import TRACER, print_summary, write_trace
+
+# Layout constants measured by hand on the SPSA 2026 PDFs. The parser
+# calibrates these per document (layout_profile.py) and only falls back to
+# them when calibration fails or is turned off; SESSION_ID_X_MAX and
+# COLUMN_GAP are also used by page layout, before any calibration.
+SESSION_ID_X_MAX = 100
+PARTICIPANT_HEADER_X = 139.58
+PAPER_TITLE_X = 139.58
+AUTHOR_X = 161.18
+
+# Anything starting left of this is in the header column (id, day, time, location)
+HEADER_COLUMN_X_MAX = 130
+
+# Words on the same baseline further apart than this belong to different columns
+COLUMN_GAP = 15
+
+# Blocks in the right column (role lists, session notes) are separated by a
+# larger vertical gap than the 11pt line pitch inside a block
+BLOCK_GAP = 15
+
+# The strict layout (extract_page_lines_strict) cuts pages this far left of
+# the calibrated paper title column: header column text ends by x~127 and
+# the right column starts at x~139.6, with only spaces between
+STRICT_COLUMN_MARGIN = 5
+
+# Word clustering tolerance of the strict layout (pdfplumber's default is 3)
+STRICT_X_TOLERANCE = 1.5
+
+# --engine choices; "hybrid" runs page_prepass.py before layout
+ENGINES = ("layout", "hybrid")
+
+# Seconds between checks of the input PDFs in --watch mode
+WATCH_POLL_INTERVAL = 0.5
+
+DAY_FILES = [
+    ("spsa_thursday.pdf", "Thursday"),
+    ("spsa_friday.pdf", "Friday"),
+    ("spsa_saturday.pdf", "Saturday"),
+]
+
+CLASSIFIER = LineClassifier(SESSION_ID_X_MAX, HEADER_COLUMN_X_MAX, PAPER_TITLE_X, AUTHOR_X)
+
+DEFAULT_LAYOUT = {
+    "session_id_x_max": SESSION_ID_X_MAX,
+    "header_column_x_max": HEADER_COLUMN_X_MAX,
+    "paper_title_x": PAPER_TITLE_X,
+    "author_x": AUTHOR_X,
+    "tolerance": CLASSIFIER.tolerance,
+    "block_gap": BLOCK_GAP,
+}
+
+
+def layout_classifier(layout):
+    return LineClassifier.from_layout(layout)
+
+
+def _base_font(word):
+    # Drop the subset tag ("AAAAAC+"); one face can be embedded as several subsets
+    return word['fontname'].split('+')[-1]
+
+
+def _line_record(words, page_number):
+    fontname = _base_font(words[0])
+    text = words[0]['text']
+    for prev, word in zip(words, words[1:]):
+        # Words split only by a subset change abut; don't add a space there
+        text += ("" if word['x0'] - prev['x1'] < 1 else " ") + word['text']
+    return {
+        "text": text,
+        "x0": words[0]['x0'],
+        "top": words[0]['top'],
+        "page": page_number,
+        "fontname": fontname,
+        "size": words[0]['size'],
+        "bold": "Bold" in fontname,
+        "italic": "Italic" in fontname or "Oblique" in fontname,
+    }
+
+
+def extract_page_lines(page):
+    """Lay out one page and return its text lines as plain, picklable records.
+
+    Chars are clustered into words once; words on the same baseline are then
+    split into runs of one font and column, so each record carries a single
+    style (the id and the bold session title beside it become two records).
+    Records are ordered top to bottom, left to right.
+    """
+    return _page_lines(page.extract_words(extra_attrs=["fontname", "size"]), page.page_number)
+
+
+def extract_page_lines_strict(page, column_x):
+    """Slower layout for pages whose sessions scored low (extraction_quality.py).
+
+    The page is cropped at column_x into the header column and the rest at
+    the character level (only chars wholly inside a region are kept), and
+    each region is clustered into words on its own with a tighter x
+    tolerance. A header line then can't join the text beside it however
+    small the gap, and words glued across a font change come apart.
+    """
+    x0, top, x1, bottom = page.bbox
+    words = []
+    for region in ((x0, top, column_x, bottom), (column_x, top, x1, bottom)):
+        words.extend(page.within_bbox(region).extract_words(x_tolerance=STRICT_X_TOLERANCE,
+                                                            extra_attrs=["fontname", "size"]))
+    return _page_lines(words, page.page_number, column_x)
+
+
+def _page_lines(words, page_number, column_x=None):
+    """Line records from a page's words; with column_x, no record spans that x."""
+    lines = []
+    for row in cluster_objects(words, "top", 1):
+        row.sort(key=lambda w: w['x0'])
+        run = [row[0]]
+        for word in row[1:]:
+            if (_base_font(word) != _base_font(run[-1]) or word['x0'] - run[-1]['x1'] > COLUMN_GAP
+                    or (column_x is not None and run[-1]['x0'] < column_x <= word['x0'])):
+                lines.append(_line_record(run, page_number))
+                run = []
+            run.append(word)
+        lines.append(_line_record(run, page_number))
+
+    # Skip the running header (the time block id printed at the top
+    # right of continuation pages) so it can't bleed into the previous
+    # page's last participant once pages are merged
+    if lines and lines[0]['x0'] >= SESSION_ID_X_MAX and re.match(r'^\d{4}$', lines[0]['text']):
+        lines.pop(0)
+    return lines
+
+
+def _extract_pages(pdf_path, page_numbers, column_x=None):
+    """Worker: open the PDF once and lay out the given pages (0-based).
+
+    With column_x the strict layout is used. Returns (page number, line
+    records, seconds spent) for each page.
+    """
+    results = []
     with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            # Extract words for precise coordinate checking
-            words = page.extract_words(extra_attrs=["fontname", "size"])
-            
-            # Extract lines for general text flow
-            lines = page.extract_text_lines()
-            
-            # We need to iterate through lines to find structure
-            i = 0
-            while i < len(lines):
-                line = lines[i]
-                text = line['text']
-                x0 = line['x0']
-                
-                # 1. Detect Session ID (e.g., "2100")
-                # It's usually a 4-digit number on the left column
-                # NOTE: extract_text_lines might merge ID with the next text if close
-                match = re.match(r'^(\d{4})\s+(.*)', text.strip())
-                is_standalone_id = re.match(r'^\d{4}$', text.strip())
-                
-                if x0 < SESSION_ID_X_MAX and (match or is_standalone_id):
-                    session_id = match.group(1) if match else text.strip()
-                    remainder_text = match.group(2) if match else ""
-                    
-                    # Save previous session if exists
-                    if current_session:
-                        sessions.append(current_session)
-                    
-                    current_session = {
-                        "day": day_name,
-                        "id": session_id,
-                        "start_time": "",
-                        "end_time": "",
-                        "location": "",
-                        "section": "", 
-                        "title": "", 
-                        "participants": []
-                    }
-                    
-                    # If there was text after the ID, it's likely the Section Title
-                    if remainder_text:
-                        current_session["section"] = remainder_text
-                    
-                    # The next few lines contain the metadata
-                    # We need to look ahead to fill in the details
-                    # This part is tricky because the order varies slightly, but usually:
-                    # Line 1 (after ID): Section Title (Bold)
-                    # Line 2: Time
-                    # Line 3: Location
-                    # Line 4: Session Title (Bold)
-                    
-                    # Let's try to capture the block of text associated with this session header
-                    # The session header info is usually in the column to the right of the ID
-                    # We can look for lines that are roughly top-aligned with the ID or slightly below
-                    
-                    # A simpler approach: consume lines until "Participants", "Chair", or next ID
-                    # But we need to distinguish between Section, Time, Location, Title
-                    
-                    # Let's advance `i` to process the header lines
-                    i += 1
-                    header_lines = []
-                    while i < len(lines):
-                        next_line = lines[i]
-                        if next_line['x0'] < SESSION_ID_X_MAX and re.match(r'^\d{4}$', next_line['text'].strip()):
-                            # Found next session, stop
-                            i -= 1 # Backtrack
-                            break
-                        if "Participants" in next_line['text']:
-                            # Found participants section
-                            i -= 1 # Backtrack so the main loop catches it
-                            break
-                        
-                        # Check for Time pattern (e.g., 8:00am-9:15am)
-                        time_match = re.search(r'(\d{1,2}:\d{2}[ap]m)-(\d{1,2}:\d{2}[ap]m)', next_line['text'])
-                        
-                        # Check font attributes if available (using words to check font of first word)
-                        # This is hard with lines. Let's stick to text patterns and order for now, but be smarter.
-                        
-                        text = next_line['text'].strip()
-                        
-                        if time_match:
-                            current_session["start_time"] = time_match.group(1)
-                            current_session["end_time"] = time_match.group(2)
-                        elif "Floor" in text or "Building" in text or "Room" in text or "Hall" in text or "Level" in text:
-                             # Heuristic for location
-                             if not current_session["location"]:
-                                 current_session["location"] = text
-                             else:
-                                 current_session["location"] += " " + text
-                        elif not current_session["section"]:
-                            # First text line is likely Section
-                            current_session["section"] = text
-                        elif current_session["section"] and not current_session["title"] and not time_match:
-                             # Text after section (and maybe time/loc) is likely Title
-                             # But sometimes Section is multi-line.
-                             # If it's all caps or bold (we can't see bold easily in lines), assume Section?
-                             # Let's assume if we haven't seen time/loc yet, it might still be Section.
-                             if not current_session["start_time"]:
-                                 current_session["section"] += " " + text
-                             else:
-                                 current_session["title"] = text
-                        else:
-                            # Append to previous fields
-                            if current_session["title"]:
-                                current_session["title"] += " " + text
-                            elif current_session["location"]:
-                                current_session["location"] += " " + text
-                            elif current_session["section"]:
-                                current_session["section"] += " " + text
-                        
-                        i += 1
-                    
-                # 2. Detect Participants Section
-                elif current_session and "Participants" in text:
-                    # Start parsing participants
-                    i += 1
-                    current_paper = None
-                    
-                    while i < len(lines):
-                        p_line = lines[i]
-                        p_text = p_line['text']
-                        p_x0 = p_line['x0']
-                        
-                        # Stop conditions
-                        if "Discussants" in p_text or "Chair" in p_text:
-                            if current_paper:
-                                current_session["participants"].append(current_paper)
-                                current_paper = None
-                            break
-                        if p_x0 < SESSION_ID_X_MAX and (re.match(r'^\d{4}$', p_text.strip()) or re.match(r'^\d{4}\s+', p_text.strip())):
-                            i -= 1
-                            if current_paper:
-                                current_session["participants"].append(current_paper)
-                                current_paper = None
-                            break
-                            
-                        # Check for new paper start (Title)
-                        # Heuristic: Indentation is around 139.58
-                        if abs(p_x0 - PAPER_TITLE_X) < 10:
-                            # Check if this is actually a continuation of the previous author line (rare but possible)
-                            # Or a continuation of the previous title?
-                            # If we have a current paper and NO author yet, this is likely a title continuation
-                            if current_paper and not current_paper["name"]:
-                                current_paper["title"] += " " + p_text
-                            else:
-                                if current_paper:
-                                    current_session["participants"].append(current_paper)
-                                
-                                current_paper = {
-                                    "title": p_text,
-                                    "name": "",
-                                    "affiliation": ""
-                                }
-                        
-                        # Check for Author/Affiliation
-                        # Heuristic: Indentation is around 161.18
-                        elif abs(p_x0 - AUTHOR_X) < 10:
-                             # If it looks like an author line (has comma?)
-                             if "," in p_text or "University" in p_text or "College" in p_text:
-                                parts = p_text.split(',', 1)
-                                name = parts[0].strip()
-                                affiliation = parts[1].strip() if len(parts) > 1 else ""
-                                
-                                if current_paper:
-                                    if not current_paper["name"]:
-                                        current_paper["name"] = name
-                                        current_paper["affiliation"] = affiliation
-                                    else:
-                                        # New participant, same paper
-                                        current_session["participants"].append(current_paper)
-                                        current_paper = {
-                                            "title": current_paper["title"],
-                                            "name": name,
-                                            "affiliation": affiliation
-                                        }
-                                else:
-                                    # Orphan author line? Skip or attach to last session?
-                                    pass
-                             else:
-                                 # Might be title continuation if no author yet
-                                 if current_paper and not current_paper["name"]:
-                                     current_paper["title"] += " " + p_text
-                                 elif current_paper and current_paper["name"]:
-                                     # Affiliation continuation?
-                                     current_paper["affiliation"] += " " + p_text
-                                    
-                        else:
-                            # Unknown indentation
-                            # Assume title continuation if no author
-                            if current_paper and not current_paper["name"]:
-                                current_paper["title"] += " " + p_text
-                            elif current_paper:
-                                current_paper["affiliation"] += " " + p_text
-                        
-                        i += 1
-                    
-                    if current_paper:
-                        current_session["participants"].append(current_paper)
-
-                i += 1
-                
+        for n in page_numbers:
+            results.append(_timed_page_lines(pdf.pages[n], column_x))
+    return results
+
+
+def _timed_page_lines(page, column_x=None):
+    start = time.perf_counter()
+    lines = extract_page_lines(page) if column_x is None else extract_page_lines_strict(page, column_x)
+    # Drop pdfplumber's cached chars so memory doesn't grow with page count
+    page.close()
+    return page.page_number - 1, lines, time.perf_counter() - start
+
+
+def queue_pdf(pdf_path, workers=1, cache=None, executor=None, prepass=False):
+    """Plan a PDF's page layout and return a job for iter_pdf_lines().
+
+    With a cache, pages whose fingerprint is already stored are read back
+    instead of laid out. With prepass, the text of the other pages is read
+    first (page_prepass.py) and pages without sessions are skipped. With an
+    executor the remaining (dirty) pages are queued now in contiguous
+    chunks; each worker opens the PDF once per chunk, and a few more chunks
+    than workers keeps the pool busy when pages differ in cost. Otherwise
+    they're laid out as they're iterated.
+    """
+    with TRACER.span("open", file=pdf_path), pdfplumber.open(pdf_path) as pdf:
+        if cache:
+            fingerprints = [page_fingerprint(page) for page in pdf.pages]
+        else:
+            fingerprints = [None] * len(pdf.pages)
+
+    cached = {n for n, fingerprint in enumerate(fingerprints) if cache and cache.has_page_lines(fingerprint)}
+    dirty = [n for n in range(len(fingerprints)) if n not in cached]
+    skipped = set()
+    if prepass and dirty:
+        # Imported here so layout-only runs don't load PyPDF2
+        from page_prepass import session_pages
+
+        with TRACER.span("prepass", file=pdf_path):
+            relevant = session_pages(pdf_path, dirty)
+        if relevant is None:
+            print("PyPDF2 is not installed; laying out every page")
+        else:
+            skipped = set(dirty) - relevant
+            dirty = [n for n in dirty if n in relevant]
+    if cache:
+        cache.count_page_misses(len(dirty))
+
+    job = {"pdf_path": pdf_path, "fingerprints": fingerprints, "cached": cached, "skipped": skipped,
+           "pages": {}, "seconds": 0.0, "futures": []}
+    if executor is not None:
+        chunk_size = max(1, -(-len(dirty) // (workers * 4)))
+        job["futures"] = [
+            executor.submit(_extract_pages, pdf_path, dirty[i:i + chunk_size])
+            for i in range(0, len(dirty), chunk_size)
+        ]
+    return job
+
+
+def _store_page(job, n, lines, seconds, cache):
+    job["seconds"] += seconds
+    if cache:
+        cache.put_page_lines(job["fingerprints"][n], lines, seconds)
+
+
+def iter_pdf_lines(job, cache=None):
+    """Yield a queued PDF's line records page by page, in page order.
+
+    Only the pages a worker chunk returned ahead of time are held in
+    memory; everything else is laid out or read from the cache on demand.
+    """
+    futures = iter(job["futures"])
+    pdf = None
+    try:
+        for n, fingerprint in enumerate(job["fingerprints"]):
+            if n in job["skipped"]:
+                TRACER.count("pages.skipped")
+                continue
+            entry = None
+            if n in job["cached"]:
+                with TRACER.span("cache.page", page=n + 1):
+                    entry = cache.get_page_lines(fingerprint, n + 1)
+            if entry is not None:
+                lines, seconds = entry
+                job["seconds"] += seconds
+            elif job["futures"] and n not in job["cached"]:
+                while n not in job["pages"]:
+                    for result in next(futures).result():
+                        TRACER.add("layout.page", result[2], page=result[0] + 1)
+                        _store_page(job, *result, cache)
+                        job["pages"][result[0]] = result[1]
+                lines = job["pages"].pop(n)
+            else:
+                # No worker was given this page: laid out here, or a cached
+                # entry that turned out unreadable
+                if pdf is None:
+                    with TRACER.span("open", file=job["pdf_path"]):
+                        pdf = pdfplumber.open(job["pdf_path"])
+                with TRACER.span("layout.page", page=n + 1):
+                    _, lines, seconds = _timed_page_lines(pdf.pages[n])
+                _store_page(job, n, lines, seconds, cache)
+            TRACER.count("pages")
+            TRACER.count("lines", len(lines))
+            yield from lines
+    finally:
+        if pdf is not None:
+            pdf.close()
+
+
+def extract_lines_from_pdf(pdf_path, workers=1, cache=None, prepass=False):
+    """Return every line record in the PDF, in page order.
+
+    With workers > 1 pages are laid out in a process pool; the merged stream
+    is identical to the serial one. With prepass, pages without sessions
+    are left out.
+    """
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(iter_pdf_lines(queue_pdf(pdf_path, workers, cache, executor, prepass), cache))
+    return list(iter_pdf_lines(queue_pdf(pdf_path, cache=cache, prepass=prepass), cache))
+
+
+def _joined(existing, text):
+    return existing + " " + text if existing else text
+
+
+def iter_session_lines(lines, day_name, layout=None):
+    """Run the session state machine over a document's merged line stream.
+
+    Fields are told apart by font style and column rather than keywords.
+    The stream spans page breaks, so a participants block that continues on
+    the next page stays attached to its session. Each session is yielded as
+    a schedule_model.Session as soon as the next one starts, so `lines` may
+    be a lazy iterator.
+
+    layout is a profile from layout_profile.calibrate(); without one the
+    hand-measured DEFAULT_LAYOUT is used.
+    """
+    if layout is None:
+        classify, block_gap = CLASSIFIER.classify, BLOCK_GAP
+    else:
+        classify, block_gap = layout_classifier(layout).classify, layout["block_gap"]
+    interner = Interner()
+    day_name = interner.string(day_name)
+    current_session = None
+    current_paper = None
+    block = None
+    seen_day = False
+    last_right = None
+
+    for line in lines:
+        text = line['text'].strip()
+        kind, detail = classify(line, text)
+
+        # 1. Session ID (e.g., "2100"): regular weight, far left
+        if kind == SESSION_ID:
+            if current_paper:
+                current_session.participants.append(interner.participant(current_paper))
+            if current_session:
+                TRACER.end()
+                yield current_session
+            TRACER.begin("parse.header")
+
+            current_session = Session(day_name, detail.group(1), detail.group(2) or "", pages=[line['page']],
+                                      start=(line['page'], line['top'], line['x0']))
+            current_paper = None
+            block = "header"
+            seen_day = False
+            last_right = None
+            continue
+
+        if not current_session:
+            continue
+        if line['page'] != current_session.pages[-1]:
+            current_session.pages.append(line['page'])
+
+        # 2. Header column: day, then time and location. Location lines
+        # wrap and interleave with the right column, so they are picked up
+        # whatever block we're in.
+        if kind == DAY:
+            seen_day = True
+            continue
+        if kind == TIME and not current_session.start_time:
+            current_session.start_time = interner.string(detail.group(1))
+            current_session.end_time = interner.string(detail.group(2))
+            continue
+        if kind == TIME or kind == LOCATION:
+            current_session.location = _joined(current_session.location, text)
+            continue
+        if kind == OTHER:
+            continue
+
+        # 3. Right column
+        gap = line['top'] - last_right['top'] if last_right and last_right['page'] == line['page'] else 0
+        last_right = line
+
+        if kind == ROLE:
+            if current_paper:
+                current_session.participants.append(interner.participant(current_paper))
+                current_paper = None
+            if block == "header":
+                TRACER.end()
+                TRACER.begin("parse.participants")
+            block = detail
+            continue
+        if kind == HEADING:
+            if block == "header":
+                # Session title sits beside the id, the section beside the
+                # day; either may wrap onto following bold lines
+                if seen_day:
+                    current_session.section = _joined(current_session.section, text)
+                else:
+                    current_session.title = _joined(current_session.title, text)
+            continue
+
+        if block == "header" or gap > block_gap:
+            # Free text after the header or after a block is a session note
+            if current_paper:
+                current_session.participants.append(interner.participant(current_paper))
+                current_paper = None
+            block = "notes"
+
+        if block != "participants":
+            continue
+
+        # New paper start (Title)
+        if kind == PAPER:
+            # If we have a current paper and NO author yet, this is likely a title continuation
+            if current_paper and not current_paper.name:
+                current_paper.title += " " + text
+            else:
+                if current_paper:
+                    current_session.participants.append(interner.participant(current_paper))
+                current_paper = ParticipantDraft(text)
+
+        # Author/Affiliation
+        elif kind == AUTHOR:
+            parts = text.split(',', 1)
+            name = parts[0].strip()
+            affiliation = parts[1].strip() if len(parts) > 1 else ""
+
+            if current_paper and current_paper.name:
+                # New participant, same paper
+                current_session.participants.append(interner.participant(current_paper))
+                current_paper = ParticipantDraft(current_paper.title, name, affiliation)
+            elif current_paper:
+                current_paper.name = name
+                current_paper.affiliation = affiliation
+            else:
+                # Roundtables list participants without papers
+                current_paper = ParticipantDraft("", name, affiliation)
+
+        # Title continuation until an author is seen, affiliation continuation after
+        elif current_paper:
+            if not current_paper.name:
+                current_paper.title += " " + text
+            else:
+                current_paper.affiliation += " " + text
+
+    if current_paper:
+        current_session.participants.append(interner.participant(current_paper))
     if current_session:
-        sessions.append(current_session)
-        
-    return sessions
-
-def main():
-    files = [
-        ("spsa_thursday.pdf", "Thursday"),
-        ("spsa_friday.pdf", "Friday"),
-        ("spsa_saturday.pdf", "Saturday")
-    ]
-    
-    all_sessions = []
+        TRACER.end()
+        yield current_session
+
+
+def parse_session_lines(lines, day_name, layout=None):
+    return list(iter_session_lines(lines, day_name, layout))
+
+
+def iter_sessions(pdf_path, day_name, workers=1, cache=None, dates=None, calibrate_layout=True, prepass=False):
+    """Yield the sessions in one PDF as each session's block closes."""
+    return iter_all([(pdf_path, day_name)], workers, cache, dates, calibrate_layout, prepass)
+
+
+def extract_sessions_from_pdf(pdf_path, day_name, workers=1, cache=None, dates=None, calibrate_layout=True,
+                              prepass=False):
+    return list(iter_sessions(pdf_path, day_name, workers, cache, dates, calibrate_layout, prepass))
+
+
+def document_layout(job, digest, cache):
+    """Return (layout profile, lines) for a queued PDF.
+
+    A cached profile lets the lines stream; otherwise the whole document
+    is laid out first so calibrate() can see every line, and the profile is
+    cached for next time.
+    """
+    layout = cache.get_layout(digest) if cache else None
+    if layout is not None:
+        return layout, iter_pdf_lines(job, cache)
+    lines = list(iter_pdf_lines(job, cache))
+    with TRACER.span("calibrate", file=job["pdf_path"]):
+        layout = calibrate(lines)
+    if layout is None:
+        print(f"Could not calibrate the layout of {job['pdf_path']}; using the default layout")
+        layout = DEFAULT_LAYOUT
+    elif cache:
+        cache.put_layout(digest, layout)
+    return layout, lines
+
+
+def relayout_pages(job, page_numbers, cache=None, executor=None, workers=1, column_x=None):
+    """{page number: line records} for some of a queued PDF's pages, after the fact.
+
+    Pages come from the cache when it has them and are laid out again
+    otherwise, in the pool when there is one. With column_x they go through
+    the strict layout, cached under a key of their own.
+    """
+    variant = None if column_x is None else f"strict{column_x:g}"
+    found, missing = {}, []
+    for page_number in page_numbers:
+        entry = cache.get_page_lines(job["fingerprints"][page_number - 1], page_number, variant) if cache else None
+        if entry is not None:
+            found[page_number] = entry[0]
+        else:
+            missing.append(page_number - 1)
+    if not missing:
+        return found
+    if executor is None:
+        results = _extract_pages(job["pdf_path"], missing, column_x)
+    else:
+        size = max(1, -(-len(missing) // workers))
+        futures = [executor.submit(_extract_pages, job["pdf_path"], missing[i:i + size], column_x)
+                   for i in range(0, len(missing), size)]
+        results = [result for future in futures for result in future.result()]
+    for n, lines, seconds in results:
+        TRACER.add("layout.page" if column_x is None else "layout.strict", seconds, page=n + 1)
+        if cache:
+            cache.put_page_lines(job["fingerprints"][n], lines, seconds, variant)
+        found[n + 1] = lines
+    return found
+
+
+def _runs(sessions, flagged):
+    """(first, stop) index ranges of consecutive sessions on a flagged page."""
+    runs = []
+    for i, session in enumerate(sessions):
+        if not flagged.isdisjoint(session.pages):
+            if runs and runs[-1][1] == i:
+                runs[-1][1] = i + 1
+            else:
+                runs.append([i, i + 1])
+    return runs
+
+
+def _line_index(lines, start):
+    """Index of a session's id line (start is Session.start) among its page's lines."""
+    _, top, x0 = start
+    return next((i for i, line in enumerate(lines) if line['top'] == top and line['x0'] == x0), None)
+
+
+def refine_document(job, day, layout, sessions, threshold=QUALITY_THRESHOLD, cache=None, executor=None,
+                    workers=1):
+    """Return a document's sessions with low scorers' pages laid out again strictly.
+
+    Every session is scored (extraction_quality.py). Each run of sessions
+    on a low scorer's pages is parsed again from the lines between its
+    first id line and the next session's, with those pages from
+    extract_page_lines_strict() and the rest of the run's pages from the
+    cache or laid out again; the sessions around the run, and where it
+    starts and stops, are the same in either layout. The run is replaced
+    only if that scores better, so the strict layout can't make a document
+    worse.
+    """
+    with TRACER.span("quality", file=job["pdf_path"]):
+        scores = score_sessions([session.to_dict() for session in sessions])
+    low = [session for session, (score, _) in zip(sessions, scores) if score < threshold]
+    if not low:
+        return sessions
+    flagged = {page for session in low for page in session.pages}
+    runs = _runs(sessions, flagged)
+    needed = set()
+    for first, stop in runs:
+        needed.update(page for session in sessions[first:stop] for page in session.pages)
+        if stop < len(sessions):
+            needed.add(sessions[stop].start[0])
+    TRACER.count("quality.low", len(low))
+    TRACER.count("pages.strict", len(flagged))
+
+    column_x = layout["paper_title_x"] - STRICT_COLUMN_MARGIN
+    with TRACER.span("refine", file=job["pdf_path"]):
+        pages = relayout_pages(job, sorted(needed - flagged), cache, executor, workers)
+        pages.update(relayout_pages(job, sorted(flagged), cache, executor, workers, column_x))
+
+    replacements = []
+    for first, stop in runs:
+        window = sorted({page for session in sessions[first:stop] for page in session.pages}
+                        | ({sessions[stop].start[0]} if stop < len(sessions) else set()))
+        lines = [line for page in window for line in pages[page]]
+        begin = _line_index(pages[window[0]], sessions[first].start)
+        end = len(lines)
+        if stop < len(sessions):
+            following = _line_index(pages[window[-1]], sessions[stop].start)
+            end = None if following is None else end - len(pages[window[-1]]) + following
+        # Without both id lines (not expected) there is nothing to compare
+        replacements.append(None if begin is None or end is None
+                            else list(iter_session_lines(lines[begin:end], day, layout)))
+
+    # Score both parses against every id and room either of them found
+    scorer = QualityScorer([session.to_dict() for session in sessions]
+                           + [session.to_dict() for new in replacements if new for session in new])
+
+    def penalty(run):
+        return sum(1 - scorer.score(session.to_dict())[0] for session in run)
+
+    result, position, repaired = [], 0, 0
+    for (first, stop), new in zip(runs, replacements):
+        old = sessions[first:stop]
+        result.extend(sessions[position:first])
+        # Never trade sessions away: a merge can hide junk as well as fix it
+        if new is not None and len(new) >= len(old) and penalty(new) < penalty(old):
+            result.extend(new)
+            repaired += len(old)
+        else:
+            result.extend(old)
+        position = stop
+    result.extend(sessions[position:])
+    TRACER.count("quality.repaired", repaired)
+    print(f"{job['pdf_path']}: {len(low)} low-scoring session(s); laid out {len(flagged)} of "
+          f"{len(job['fingerprints'])} page(s) again, {repaired} session(s) replaced")
+    return result
+
+
+def iter_all(files, workers=1, cache=None, dates=None, calibrate_layout=True, prepass=False,
+             quality_threshold=QUALITY_THRESHOLD):
+    """Yield sessions from every available PDF in order.
+
+    With workers > 1 all files share one pool. Peak memory is bounded by
+    the pages in flight, except that with a cache the current file's
+    sessions are also kept until its entry is written, and that a document
+    without a cached layout profile is laid out whole for calibration.
+    Normalized time fields (schedule_time.add_time_fields) are added on the
+    way out, so the cache holds only what the parser produced.
+
+    With calibrate_layout=False the hand-measured DEFAULT_LAYOUT is used and
+    cached sessions (which were parsed with calibrated layouts) are skipped.
+    With prepass=True (the hybrid engine) pages the text pre-pass finds no
+    sessions on are not laid out; sessions are only cached for files where
+    it skipped nothing, since those match a full layout run by construction.
+
+    With a quality_threshold (0 or None turns it off) each document's
+    sessions go through refine_document() before any is yielded, so they
+    are held until the document is scored, as with a cache; its lines are
+    not, and the pages of low scorers are read back or laid out again.
+    """
+    files = [(pdf_file, day) for pdf_file, day in files if os.path.exists(pdf_file)]
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        # Queue every file's pages before waiting on any of them so the
+        # pool never drains between days
+        jobs = []
+        session_cache = cache if calibrate_layout else None
+        # Refined and unrefined sessions differ, so each threshold has its own entry
+        session_variant = f"quality{quality_threshold or 0:g}"
+        for pdf_file, day in files:
+            with TRACER.span("cache.sessions", file=pdf_file):
+                digest = file_digest(pdf_file) if cache else None
+                sessions = session_cache.get_sessions(digest, day, session_variant) if session_cache else None
+            job = None if sessions is not None else queue_pdf(pdf_file, workers, cache, executor, prepass)
+            if job is not None and cache:
+                # Lets the inspect tools read this file's pages back (layout_dump.py)
+                cache.put_page_index(digest, job["fingerprints"])
+            jobs.append((day, digest, sessions, job))
+
+        for day, digest, sessions, job in jobs:
+            if job is None:
+                for session in sessions:
+                    TRACER.count("sessions")
+                    yield add_time_fields(session, dates)
+                continue
+            if calibrate_layout:
+                layout, lines = document_layout(job, digest, cache)
+            else:
+                layout, lines = DEFAULT_LAYOUT, iter_pdf_lines(job, cache)
+            parsed = iter_session_lines(lines, day, layout)
+            if quality_threshold:
+                parsed = refine_document(job, day, layout, list(parsed), quality_threshold, cache, executor,
+                                         workers)
+            sessions = []
+            for session in parsed:
+                session = session.to_dict()
+                if session_cache:
+                    sessions.append(session)
+                TRACER.count("sessions")
+                yield add_time_fields(session, dates)
+            if session_cache and not job["skipped"]:
+                session_cache.put_sessions(digest, day, sessions, job["seconds"], session_variant)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def extract_all(files, workers=1, cache=None, dates=None, calibrate_layout=True, prepass=False,
+                quality_threshold=QUALITY_THRESHOLD):
+    return list(iter_all(files, workers, cache, dates, calibrate_layout, prepass, quality_threshold))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract SPSA sessions from the day PDFs.")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="lay out pages in a process pool of this size (default: 1, serial)")
+    parser.add_argument("--compare-serial", action="store_true",
+                        help="also run serially, check the output is identical and report the speedup "
+                             "(both runs skip the cache, so they lay out the same pages)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"where to keep cached pages and sessions (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="lay out and parse everything without reading or writing the cache")
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="invalidate the cache before extracting")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="json",
+                        help="json: one indented array (default); jsonl: one session per line")
+    parser.add_argument("-o", "--output", default=None,
+                        help="output file (default: schedule_all.json, or schedule_all.jsonl)")
+    parser.add_argument("--dates", type=parse_dates, default=None,
+                        help="calendar date per day, e.g. Thursday=2026-01-08,Friday=2026-01-09 "
+                             "(default: schedule_time.CONFERENCE_DATES)")
+    parser.add_argument("--engine", choices=ENGINES, default="layout",
+                        help="layout: lay out every page with pdfplumber (default); hybrid: read each page's "
+                             "text with PyPDF2 first and lay out only pages with sessions")
+    parser.add_argument("--no-calibrate", action="store_true",
+                        help="use the hand-measured layout constants instead of calibrating each PDF")
+    parser.add_argument("--quality-threshold", type=float, default=QUALITY_THRESHOLD, metavar="SCORE",
+                        help="lay out the pages of sessions scoring below this again with the strict layout "
+                             f"(default: {QUALITY_THRESHOLD}; 0 turns it off)")
+    parser.add_argument("--artifacts-dir", default=DEFAULT_OUTPUT_DIR,
+                        help=f"where to write the compact per-day files for the web page (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument("--no-artifacts", action="store_true",
+                        help="only write the full output file")
+    parser.add_argument("--history-dir", default=DEFAULT_HISTORY_DIR,
+                        help="earlier versions of the artifacts, for the patches clients apply instead of "
+                             f"refetching (see schedule_diff.py; default: {DEFAULT_HISTORY_DIR})")
+    parser.add_argument("--no-history", action="store_true",
+                        help="don't record this version or write patches")
+    parser.add_argument("--db", default=None, metavar="PATH",
+                        help="also load the sessions into this SQLite database (see schedule_db.py); "
+                             "only days that changed are reloaded")
+    parser.add_argument("--trace", metavar="FILE", default=None,
+                        help="record timing spans and counters to FILE (Chrome trace format, JSON)")
+    parser.add_argument("--profile", metavar="FILE", default=None,
+                        help="run under cProfile and write the stats to FILE (e.g. extract.prof)")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and re-extract whenever an input PDF changes; with the cache, "
+                             "only changed files and pages are laid out and parsed again")
+    parser.add_argument("--debounce", type=float, default=2.0, metavar="SECONDS",
+                        help="in --watch mode, wait until the PDFs have been unchanged this long (default: 2)")
+    args = parser.parse_args(argv)
+    if args.trace:
+        TRACER.enable()
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        if args.watch:
+            watch(args)
+        else:
+            run(args)
+    finally:
+        if args.profile:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"Profile written to {args.profile} (view with: python3 -m pstats {args.profile})")
+    if args.trace:
+        print_summary(write_trace(args.trace))
+        print(f"Trace written to {args.trace}")
+
+
+def input_state(files):
+    """(mtime, size) of each input PDF, None where it's missing."""
+    state = {}
+    for pdf_file, _ in files:
+        try:
+            stat = os.stat(pdf_file)
+            state[pdf_file] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            state[pdf_file] = None
+    return state
+
+
+def wait_for_change(files, state, debounce, poll=WATCH_POLL_INTERVAL):
+    """Block until the inputs differ from state and then stay unchanged for debounce seconds.
+
+    Copying or re-exporting a PDF writes it in several bursts; extracting
+    after the first one would read a truncated file. Returns the new state.
+    """
+    while (current := input_state(files)) == state:
+        time.sleep(poll)
+    quiet_since = time.monotonic()
+    while time.monotonic() - quiet_since < debounce:
+        time.sleep(poll)
+        latest = input_state(files)
+        if latest != current:
+            current, quiet_since = latest, time.monotonic()
+    return current
+
+
+def watch(args, files=DAY_FILES):
+    """Extract, then re-extract every time the input PDFs change, until interrupted.
+
+    Nothing beyond the first run is forced: the session cache skips files
+    whose digest is unchanged and the page cache skips pages whose content
+    is unchanged, so a re-issued day costs only its edited pages. A failed
+    run (say, a PDF still being copied) keeps the previous output.
+    """
+    state = input_state(files)
+    run(args, files)
+    # Only the first run may clear the cache
+    args.clear_cache = False
+    print(f"Watching {', '.join(pdf_file for pdf_file, _ in files)} for changes (Ctrl-C to stop)")
+    try:
+        while True:
+            new_state = wait_for_change(files, state, args.debounce)
+            changed = [pdf_file for pdf_file in new_state if new_state[pdf_file] != state[pdf_file]]
+            state = new_state
+            print(f"\n{time.strftime('%H:%M:%S')} changed: {', '.join(changed)}")
+            try:
+                run(args, files)
+            except Exception as e:
+                print(f"Extraction failed: {e!r}; keeping the previous output")
+    except KeyboardInterrupt:
+        print("Stopped watching")
+
+
+def run(args, files=DAY_FILES):
+    output_file = args.output or f"schedule_all.{args.format}"
+    write = WRITERS[args.format]
+
     for pdf_file, day in files:
         if os.path.exists(pdf_file):
             print(f"Processing {pdf_file}...")
-            sessions = extract_sessions_from_pdf(pdf_file, day)
-            all_sessions.extend(sessions)
         else:
             print(f"File {pdf_file} not found.")
-            
-    with open("schedule_all.json", "w") as f:
-        json.dump(all_sessions, f, indent=2)
-    
-    print(f"Extracted {len(all_sessions)} sessions to schedule_all.json")
+
+    cache = None
+    if not args.no_cache:
+        cache = ExtractionCache(args.cache_dir, PARSER_VERSION)
+        if args.clear_cache:
+            cache.clear()
+        if args.compare_serial:
+            # Cache hits would make the timed run look faster than the serial one
+            print("--compare-serial: not using the cache, so both runs lay out every page")
+            cache = None
+
+    # Sessions are written as they're parsed rather than collected first,
+    # into a temporary file that replaces the output only once it's complete
+    start = time.perf_counter()
+    with atomic_write(output_file) as f:
+        count = write(iter_all(files, args.workers, cache, args.dates, not args.no_calibrate,
+                               args.engine == "hybrid", args.quality_threshold), f)
+    elapsed = time.perf_counter() - start
+
+    print(f"Extracted {count} sessions to {output_file}")
+    print(f"Extraction took {elapsed:.2f}s with {args.workers} worker(s)")
+    if cache:
+        print(cache.summary())
+
+    if not args.no_artifacts or args.db:
+        sessions = load_sessions(output_file)
+    if not args.no_artifacts:
+        with TRACER.span("artifacts"):
+            manifest = build_artifacts(sessions, args.artifacts_dir, None if args.no_history else args.history_dir)
+        print_report(manifest, output_file)
+    if args.db:
+        with TRACER.span("db"):
+            result = build_db(sessions, args.db)
+        print(f"{args.db}: reloaded {', '.join(result['loaded']) or 'nothing'}"
+              + (f"; removed {', '.join(result['removed'])}" if result["removed"] else ""))
+
+    if args.compare_serial:
+        start = time.perf_counter()
+        serial_output = io.StringIO()
+        write(iter_all(files, dates=args.dates, calibrate_layout=not args.no_calibrate,
+                       prepass=args.engine == "hybrid", quality_threshold=args.quality_threshold), serial_output)
+        serial_elapsed = time.perf_counter() - start
+        with open(output_file) as f:
+            identical = f.read() == serial_output.getvalue()
+        print(f"Serial run took {serial_elapsed:.2f}s; output {'identical' if identical else 'DIFFERENT'}; "
+              f"speedup {serial_elapsed / elapsed:.2f}x")
+        if not identical:
+            raise SystemExit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,174 @@
+"""
+On-disk cache for extract_sessions.py, keyed by content hash.
+
+Two levels:
+  files/  parsed sessions for a whole PDF, keyed by the file's SHA-256,
+          the day name, the quality threshold they were refined at and
+          PARSER_VERSION. A hit skips opening the PDF.
+  pages/  line records for one page, keyed by a fingerprint of the page's
+          content streams and fonts. When a file has changed, only the pages
+          whose fingerprint is new get laid out again. The strict layout of
+          a page (extract_sessions.refine_document) is kept beside it under
+          the fingerprint plus a variant suffix.
+
+Calibrated layout profiles (layout_profile.py) are kept per file in
+layouts/, and the list of a file's page fingerprints in documents/, both
+keyed by the file's SHA-256. With documents/ and pages/ together a file's
+laid-out lines can be read back without opening it (layout_dump.py).
+
+Entries record how long they took to build, so a run can report the time
+the cache saved.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+
+DEFAULT_CACHE_DIR = ".extract_cache"
+
+# Bump whenever extract_sessions.py's extract_page_lines(_strict),
+# parse_session_lines or refine_document change their output, so cached
+# pages and sessions from an older parser are ignored
+PARSER_VERSION = 4
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def page_fingerprint(page):
+    """Hash what a page draws: its content streams plus its fonts' glyph maps.
+
+    Text in subset fonts is stored as glyph codes, so identical content bytes
+    only mean identical text when the ToUnicode maps match too.
+    """
+    from pdfminer.pdftypes import resolve1
+
+    h = hashlib.sha256()
+    page_obj = page.page_obj
+    for stream in page_obj.contents:
+        h.update(resolve1(stream).get_data())
+
+    fonts = resolve1(page_obj.resources.get("Font")) or {}
+    for name in sorted(fonts):
+        font = resolve1(fonts[name])
+        h.update(str(name).encode())
+        h.update(str(font.get("BaseFont")).encode())
+        to_unicode = resolve1(font.get("ToUnicode"))
+        if to_unicode is not None and hasattr(to_unicode, "get_data"):
+            h.update(to_unicode.get_data())
+
+    h.update(repr(page.bbox).encode())
+    return h.hexdigest()
+
+
+class ExtractionCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, version=0):
+        self.root = os.path.join(cache_dir, f"v{version}")
+        self.cache_dir = cache_dir
+        self.stats = {
+            "file_hits": 0,
+            "file_misses": 0,
+            "page_hits": 0,
+            "page_misses": 0,
+            "seconds_saved": 0.0,
+        }
+
+    def clear(self):
+        """Invalidate everything, including entries from older parser versions.
+
+        Only the v<N> directories the cache writes are removed, never
+        anything else in cache_dir (which may be a shared directory).
+        """
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            if re.fullmatch(r"v\d+", name) and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _path(self, kind, key):
+        return os.path.join(self.root, kind, key[:2], key + ".json")
+
+    def _load(self, kind, key):
+        try:
+            with open(self._path(kind, key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, kind, key, entry):
+        path = self._path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so a crashed run can't leave a truncated entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def get_sessions(self, digest, day_name, variant=None):
+        """Parsed sessions for a file, or None; variant names how they were post-processed ("quality...")."""
+        key = f"{digest}-{day_name.lower()}"
+        entry = self._load("files", f"{key}-{variant}" if variant else key)
+        if entry is None:
+            self.stats["file_misses"] += 1
+            return None
+        self.stats["file_hits"] += 1
+        self.stats["seconds_saved"] += entry["seconds"]
+        return entry["sessions"]
+
+    def put_sessions(self, digest, day_name, sessions, seconds, variant=None):
+        key = f"{digest}-{day_name.lower()}"
+        self._store("files", f"{key}-{variant}" if variant else key, {"seconds": seconds, "sessions": sessions})
+
+    def get_layout(self, digest):
+        return self._load("layouts", digest)
+
+    def put_layout(self, digest, layout):
+        self._store("layouts", digest, layout)
+
+    def get_page_index(self, digest):
+        entry = self._load("documents", digest)
+        return entry["pages"] if entry is not None else None
+
+    def put_page_index(self, digest, fingerprints):
+        self._store("documents", digest, {"pages": fingerprints})
+
+    def has_page_lines(self, fingerprint):
+        return os.path.exists(self._path("pages", fingerprint))
+
+    def count_page_misses(self, n):
+        """Record pages that are laid out without asking get_page_lines()."""
+        self.stats["page_misses"] += n
+
+    def get_page_lines(self, fingerprint, page_number, variant=None):
+        """(lines, seconds) for a page, or None; variant names another layout of it ("strict...")."""
+        entry = self._load("pages", f"{fingerprint}-{variant}" if variant else fingerprint)
+        if entry is None:
+            self.stats["page_misses"] += 1
+            return None
+        self.stats["page_hits"] += 1
+        self.stats["seconds_saved"] += entry["seconds"]
+        lines = entry["lines"]
+        # The same page may have moved within the document
+        for line in lines:
+            line["page"] = page_number
+        return lines, entry["seconds"]
+
+    def put_page_lines(self, fingerprint, lines, seconds, variant=None):
+        self._store("pages", f"{fingerprint}-{variant}" if variant else fingerprint,
+                    {"seconds": seconds, "lines": lines})
+
+    def summary(self):
+        s = self.stats
+        return (f"Cache: files {s['file_hits']} hit / {s['file_misses']} miss, "
+                f"pages {s['page_hits']} hit / {s['page_misses']} miss, "
+                f"~{s['seconds_saved']:.2f}s saved")
@@ -0,0 +1,119 @@
+"""
+Per-session confidence scores for extracted sessions.
+
+Layout slips show up in the output in recognizable ways: a title that
+swallowed the next session's header carries that session's id or a
+clock time, a header line that bled into the right column repeats the
+weekday, a room name ends up inside a paper title, or fields are simply
+missing. Each session starts at 1.0 and loses PENALTIES for every issue
+found; extract_sessions.py re-lays out the pages of sessions scoring
+below THRESHOLD with a stricter strategy (see refine_document there).
+
+Ids and rooms are judged against the whole document: a four-digit
+number only counts as an embedded id if it is the id of another session
+that day (so "2024" in a title is fine), and only rooms that appear as
+some session's location are looked for in titles.
+
+    python3 extraction_quality.py [schedule_all.json] [--threshold 0.75]
+"""
+
+import argparse
+import re
+from collections import Counter
+
+from schedule_time import TIME_RANGE_RE
+
+THRESHOLD = 0.75
+
+PENALTIES = {
+    "missing title": 0.4,
+    "missing time": 0.4,
+    "missing location": 0.3,
+    "missing section": 0.3,
+    "participant without name": 0.1,  # each, up to three
+    "embedded session id": 0.4,
+    "embedded time": 0.3,
+    "repeated day": 0.3,
+    "room in title": 0.3,
+}
+
+WEEKDAY_RE = re.compile(r"\b(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\b")
+NUMBER_RE = re.compile(r"\b\d{4}\b")
+
+# Shorter room names ("Bridge") are too likely to be ordinary words in a title
+MIN_ROOM_LENGTH = 12
+
+
+class QualityScorer:
+    """Scores sessions against the ids and rooms of the document they came from."""
+
+    def __init__(self, sessions):
+        self.ids = {}
+        rooms = set()
+        for session in sessions:
+            self.ids.setdefault(session["day"], set()).add(session["id"])
+            if len(session.get("location") or "") >= MIN_ROOM_LENGTH:
+                rooms.add(session["location"])
+        # Longest first, so a room is found before a shorter one it contains
+        self.room_re = re.compile("|".join(re.escape(r) for r in sorted(rooms, key=len, reverse=True))) if rooms else None
+
+    def issues(self, session):
+        found = []
+        for field, issue in (("title", "missing title"), ("start_time", "missing time"),
+                             ("location", "missing location"), ("section", "missing section")):
+            if not session.get(field):
+                found.append(issue)
+        nameless = sum(1 for p in session.get("participants", []) if not p.get("name"))
+        found.extend(["participant without name"] * min(nameless, 3))
+
+        header_text = [session.get("title") or "", session.get("section") or ""]
+        paper_titles = list(dict.fromkeys(p["title"] for p in session.get("participants", []) if p.get("title")))
+        other_ids = self.ids.get(session["day"], set()) - {session["id"]}
+        if any(number in other_ids for text in header_text + [session.get("location") or ""]
+               for number in NUMBER_RE.findall(text)):
+            found.append("embedded session id")
+        if any(TIME_RANGE_RE.search(text) for text in header_text + paper_titles):
+            found.append("embedded time")
+        days = Counter(WEEKDAY_RE.findall(" ".join(header_text + [session.get("location") or ""])))
+        if any(count > 1 for count in days.values()) or WEEKDAY_RE.search(session.get("location") or ""):
+            found.append("repeated day")
+        if self.room_re and any(self.room_re.search(text) for text in header_text + paper_titles):
+            found.append("room in title")
+        return found
+
+    def score(self, session):
+        """(score, issues): 1.0 minus the penalties, floored at 0."""
+        found = self.issues(session)
+        return max(0.0, round(1.0 - sum(PENALTIES[issue] for issue in found), 3)), found
+
+
+def score_sessions(sessions):
+    """[(score, issues)] for each session, scored against all of them."""
+    scorer = QualityScorer(sessions)
+    return [scorer.score(session) for session in sessions]
+
+
+def main(argv=None):
+    from build_artifacts import load_sessions
+
+    parser = argparse.ArgumentParser(description="Score extracted sessions and list the suspicious ones.")
+    parser.add_argument("source", nargs="?", default="schedule_all.json")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"list sessions scoring below this (default: {THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    sessions = load_sessions(args.source)
+    scores = score_sessions(sessions)
+    issues = Counter(issue for _, found in scores for issue in found)
+    low = [(score, found, session) for (score, found), session in zip(scores, sessions) if score < args.threshold]
+    print(f"{len(sessions)} sessions, mean score {sum(s for s, _ in scores) / max(1, len(scores)):.3f}, "
+          f"{len(low)} below {args.threshold}")
+    for issue, count in issues.most_common():
+        print(f"  {count:>5}  {issue}")
+    for score, found, session in low:
+        print(f"\n{score:.2f}  {session['day']} {session['id']}  {session.get('title')!r}")
+        print(f"      {', '.join(found)}")
+
+
+if __name__ == "__main__":
+    main()
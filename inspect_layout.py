@@ -1,42 +1,48 @@
-import pdfplumber
-
-def inspect_layout(pdf_path, page_num=2):
-    with pdfplumber.open(pdf_path) as pdf:
-        page = pdf.pages[page_num]
-        print(f"--- Page {page_num+1} Layout ---")
-        for char in page.chars[:500]: # Inspect first 500 chars to get a sense of styles
-             pass # Just to load chars
-        
-        # Group chars into words/lines to see font attributes
-        words = page.extract_words(extra_attrs=["fontname", "size"])
-        for word in words[:50]:
-            print(f"{word['text']} | Font: {word['fontname']} | Size: {word['size']}")
-
-        print("\n" + "="*50 + "\n")
-        
-        # Focus on the Participants section to check indentation and vertical spacing
-        print("Checking indentation and vertical spacing in Participants section:")
-        in_participants = False
-        last_bottom = 0
-        for line in page.extract_text_lines():
-            text = line['text']
-            if "Participants" in text:
-                in_participants = True
-                print(f"HEADER: {text} | x0: {line['x0']} | bottom: {line['bottom']}")
-                last_bottom = line['bottom']
-                continue
-            if in_participants:
-                if "Discussants" in text or "Chair" in text:
-                    in_participants = False
-                    break
-                
-                # Filter out left column noise
-                if line['x0'] < 100:
-                    continue
-                    
-                gap = line['top'] - last_bottom
-                print(f"LINE: {text} | x0: {line['x0']} | gap: {gap:.2f}")
-                last_bottom = line['bottom']
+"""
+Print a page's line records: position, spacing, font and line class.
+
+Reads the layout dump in .extract_cache/ (layout_dump.py) rather than
+opening the PDF. Lines are classified with the layout profile extraction
+calibrated for the PDF, when one is cached.
+
+    python3 inspect_layout.py [spsa_thursday.pdf] [--page 1]
+"""
+
+import argparse
+
+from layout_dump import cached_layout, document_pages
+from line_classifier import LineClassifier
+
+
+def inspect_layout(pdf_path, page_num=1):
+    [(n, lines)] = document_pages(pdf_path, [page_num])
+    layout = cached_layout(pdf_path)
+    classifier = LineClassifier.from_layout(layout) if layout else None
+
+    print(f"--- Page {n} Layout ---")
+    if classifier is None:
+        print("(no calibrated layout cached; run extract_sessions.py to classify lines)")
+    print(f"{'top':>7} {'gap':>6} {'x0':>7} {'size':>5} {'style':<5} {'font':<24} {'class':<11} text")
+    previous_top = None
+    for line in lines:
+        gap = f"{line['top'] - previous_top:6.2f}" if previous_top is not None else " " * 6
+        previous_top = line["top"]
+        style = ("B" if line["bold"] else "") + ("I" if line["italic"] else "")
+        kind = classifier.classify(line, line["text"].strip())[0] if classifier else "-"
+        print(f"{line['top']:7.2f} {gap} {line['x0']:7.2f} {line['size']:5.2f} {style:<5} "
+              f"{line['fontname'][:24]:<24} {kind:<11} {line['text']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print a page's line records from the layout dump.")
+    parser.add_argument("pdf", nargs="?", default="spsa_thursday.pdf")
+    parser.add_argument("--page", type=int, default=1, help="1-based page number (default: 1)")
+    args = parser.parse_args(argv)
+    try:
+        inspect_layout(args.pdf, args.page)
+    except ValueError as e:
+        parser.error(str(e))
+
 
 if __name__ == "__main__":
-    inspect_layout("spsa_thursday.pdf", page_num=0) # Page 1 might be cover, let's check page 0 (first page)
+    main()
@@ -1,12 +1,35 @@
-import pdfplumber
+"""
+Print the text of program PDF pages as extraction laid them out.
+
+Reads the layout dump in .extract_cache/ (layout_dump.py) rather than
+opening the PDF; pages not dumped yet are laid out once and kept.
+
+    python3 inspect_pdf.py [spsa_thursday.pdf] [--pages 1-3]
+"""
+
+import argparse
+
+from layout_dump import document_pages, page_text, parse_page_range
+
+
+def inspect_pdf(pdf_path, pages=(1, 2, 3)):
+    for n, lines in document_pages(pdf_path, pages):
+        print(f"--- Page {n} ---")
+        print(page_text(lines))
+        print("\n" + "=" * 50 + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the text of PDF pages from the layout dump.")
+    parser.add_argument("pdf", nargs="?", default="spsa_thursday.pdf")
+    parser.add_argument("--pages", type=parse_page_range, default=[1, 2, 3],
+                        help="pages to print, e.g. 4 or 1-3,7 (default: 1-3)")
+    args = parser.parse_args(argv)
+    try:
+        inspect_pdf(args.pdf, args.pages)
+    except ValueError as e:
+        parser.error(str(e))
 
-def inspect_pdf(pdf_path, num_pages=3):
-    with pdfplumber.open(pdf_path) as pdf:
-        for i, page in enumerate(pdf.pages[:num_pages]):
-            print(f"--- Page {i+1} ---")
-            text = page.extract_text()
-            print(text)
-            print("\n" + "="*50 + "\n")
 
 if __name__ == "__main__":
-    inspect_pdf("spsa_thursday.pdf")
+    main()
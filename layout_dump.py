@@ -0,0 +1,91 @@
+"""
+Laid-out pages read back from the extraction cache.
+
+Extraction keeps every page's line records in .extract_cache/ (pages/,
+keyed by page fingerprint) and each file's list of page fingerprints
+(documents/, keyed by file digest). document_pages() reads a PDF's pages
+from there, so the inspect and debug tools print the exact lines the
+parser saw without importing pdfplumber or laying anything out again.
+Pages that aren't cached yet (a new PDF, or pages the hybrid engine
+skipped) are laid out once, the way extraction would, and stored.
+
+Each line record is one run of words in a single font and column:
+
+  {"text", "x0", "top", "page", "fontname", "size", "bold", "italic"}
+"""
+
+import time
+
+from extraction_cache import (
+    DEFAULT_CACHE_DIR,
+    PARSER_VERSION,
+    ExtractionCache,
+    file_digest,
+    page_fingerprint,
+)
+
+
+def document_pages(pdf_path, pages=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Return [(page number, line records)] for the 1-based pages given (default: all)."""
+    cache = ExtractionCache(cache_dir, PARSER_VERSION)
+    digest = file_digest(pdf_path)
+    fingerprints = cache.get_page_index(digest)
+    if fingerprints is not None:
+        numbers = _page_numbers(pages, len(fingerprints), pdf_path)
+        result = [(n, cache.get_page_lines(fingerprints[n - 1], n)) for n in numbers]
+        if all(entry is not None for _, entry in result):
+            return [(n, lines) for n, (lines, _) in result]
+
+    # Not all dumped yet: lay out what's missing and keep it
+    import pdfplumber
+
+    from extract_sessions import extract_page_lines
+
+    result = []
+    with pdfplumber.open(pdf_path) as pdf:
+        if fingerprints is None:
+            fingerprints = [page_fingerprint(page) for page in pdf.pages]
+            cache.put_page_index(digest, fingerprints)
+        for n in _page_numbers(pages, len(fingerprints), pdf_path):
+            entry = cache.get_page_lines(fingerprints[n - 1], n)
+            if entry is None:
+                start = time.perf_counter()
+                lines = extract_page_lines(pdf.pages[n - 1])
+                cache.put_page_lines(fingerprints[n - 1], lines, time.perf_counter() - start)
+            else:
+                lines = entry[0]
+            result.append((n, lines))
+    return result
+
+
+def cached_layout(pdf_path, cache_dir=DEFAULT_CACHE_DIR):
+    """The layout profile extraction calibrated for this PDF, or None."""
+    return ExtractionCache(cache_dir, PARSER_VERSION).get_layout(file_digest(pdf_path))
+
+
+def _page_numbers(pages, page_count, pdf_path):
+    numbers = list(pages) if pages is not None else list(range(1, page_count + 1))
+    for n in numbers:
+        if not 1 <= n <= page_count:
+            raise ValueError(f"{pdf_path} has pages 1-{page_count}, not {n}")
+    return numbers
+
+
+def parse_page_range(spec):
+    """'3' -> [3]; '1-3,7' -> [1, 2, 3, 7]."""
+    numbers = []
+    for part in spec.split(","):
+        first, _, last = part.partition("-")
+        numbers.extend(range(int(first), int(last or first) + 1))
+    return numbers
+
+
+def page_text(lines):
+    """The page as plain text: records sharing a baseline joined left to right."""
+    rows = []
+    for line in lines:
+        if rows and abs(line["top"] - rows[-1][0]) < 1:
+            rows[-1][1].append(line["text"])
+        else:
+            rows.append((line["top"], [line["text"]]))
+    return "\n".join("  ".join(texts) for _, texts in rows)
@@ -0,0 +1,128 @@
+"""
+Layout calibration: find a program PDF's columns and spacing from its lines.
+
+extract_sessions.py used to rely on x positions measured by hand with
+inspect_layout.py (session ids left of x=100, paper titles at 139.58,
+authors at 161.18, ...). calibrate() derives them from the line records of
+the whole document in one vectorized pass:
+
+  - x0 of regular-weight lines is histogrammed (0.1pt bins); bins holding at
+    least MIN_LEVEL_SHARE of those lines are the indentation levels
+  - the session id column is the most common x0 of regular lines that look
+    like an id ("2100 ..."); the next two levels to its right are paper
+    titles and authors
+  - the header column ends halfway between the rightmost header line (day,
+    time, location: italic) and the paper title column
+  - vertical steps between consecutive right-column lines give the line
+    pitch (the most common step) and the block gap (halfway between the
+    pitch and the most common larger step)
+  - the most common font size is the body size
+
+The result is a plain dict (a "layout profile") that extract_sessions.py
+caches per document and turns into a LineClassifier. calibrate() returns
+None when NumPy isn't installed or the document doesn't show the expected
+structure; callers then fall back to the hand-measured defaults.
+
+    python3 layout_profile.py spsa_thursday.pdf [...]
+"""
+
+import argparse
+import json
+
+from line_classifier import SESSION_ID_RE
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LAYOUT_FORMAT = 1
+
+# A level must hold this share of regular-weight lines to count as a column
+MIN_LEVEL_SHARE = 0.02
+
+# Furthest a paper title or author line may sit from its column
+MAX_TOLERANCE = 10
+
+# A step this much bigger than the line pitch separates blocks
+BLOCK_STEP_RATIO = 1.3
+
+
+def _mode(values, decimals=1):
+    levels, counts = np.unique(np.round(values, decimals), return_counts=True)
+    return float(levels[np.argmax(counts)])
+
+
+def indentation_levels(x0, min_share=MIN_LEVEL_SHARE):
+    """Distinct x0 positions (0.1pt bins) holding at least min_share of the lines, left to right."""
+    levels, counts = np.unique(np.round(x0, 1), return_counts=True)
+    return levels[counts >= max(1, min_share * len(x0))].tolist()
+
+
+def calibrate(lines):
+    """Return a layout profile for a document's line records, or None if it can't be found."""
+    if np is None or not lines:
+        return None
+
+    x0 = np.array([line["x0"] for line in lines], dtype=float)
+    top = np.array([line["top"] for line in lines], dtype=float)
+    page = np.array([line["page"] for line in lines])
+    size = np.array([line["size"] for line in lines], dtype=float)
+    bold = np.array([line["bold"] for line in lines])
+    italic = np.array([line["italic"] for line in lines])
+    regular = ~bold & ~italic
+    id_like = np.array([SESSION_ID_RE.match(line["text"].strip()) is not None for line in lines]) & regular
+
+    if not id_like.any() or not italic.any():
+        return None
+    session_id_x = _mode(x0[id_like])
+    right_levels = [level for level in indentation_levels(x0[regular]) if level > session_id_x]
+    if len(right_levels) < 2:
+        return None
+    paper_title_x, author_x = right_levels[:2]
+
+    header_right = float(x0[italic & (x0 < paper_title_x)].max(initial=session_id_x))
+    header_column_x_max = (header_right + paper_title_x) / 2
+    session_id_x_max = (session_id_x + header_column_x_max) / 2
+
+    # Steps between consecutive right-column lines on the same page
+    right = x0 >= header_column_x_max
+    right_top, right_page = top[right], page[right]
+    steps = np.diff(right_top)[np.diff(right_page) == 0]
+    steps = steps[steps > 0]
+    if not len(steps):
+        return None
+    line_pitch = _mode(steps)
+    block_steps = steps[steps > line_pitch * BLOCK_STEP_RATIO]
+    block_gap = (line_pitch + _mode(block_steps)) / 2 if len(block_steps) else line_pitch * 1.5
+
+    return {
+        "format": LAYOUT_FORMAT,
+        "session_id_x": session_id_x,
+        "session_id_x_max": round(session_id_x_max, 2),
+        "header_column_x_max": round(header_column_x_max, 2),
+        "paper_title_x": paper_title_x,
+        "author_x": author_x,
+        "tolerance": round(min(MAX_TOLERANCE, (author_x - paper_title_x) / 2), 2),
+        "line_pitch": line_pitch,
+        "block_gap": round(block_gap, 2),
+        "body_size": _mode(size, 2),
+        "lines": len(lines),
+    }
+
+
+def main():
+    import extract_sessions
+
+    parser = argparse.ArgumentParser(description="Print the calibrated layout profile of program PDFs.")
+    parser.add_argument("pdfs", nargs="+")
+    args = parser.parse_args()
+
+    for pdf_path in args.pdfs:
+        profile = calibrate(extract_sessions.extract_lines_from_pdf(pdf_path))
+        print(pdf_path)
+        print(json.dumps(profile, indent=2) if profile else "  could not calibrate; defaults would be used")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Line classification shared by extract_sessions.py and parse_schedule.py.
+
+Every pattern either parser tests a line against is compiled once here,
+and each keyword list is folded into a single alternation, so a line is
+scanned once per list instead of once per keyword. Each parser makes one
+classify call per line and branches on the kind it gets back.
+"""
+
+import re
+
+# Line kinds
+SESSION_ID = "session_id"
+DAY = "day"
+TIME = "time"
+LOCATION = "location"
+CATEGORY = "category"
+ROLE = "role"
+HEADING = "heading"
+PAPER = "paper"
+AUTHOR = "author"
+TEXT = "text"
+OTHER = "other"
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def keyword_pattern(keywords, flags=0):
+    """Compile keywords into one alternation; .search() is true if any keyword occurs."""
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords), flags)
+
+
+SESSION_ID_RE = re.compile(r'^(\d{4})(?:\s+(.*))?$')
+SESSION_ID_PREFIX_RE = re.compile(r'^(\d{4})')
+SESSION_ID_STRIP_RE = re.compile(r'^\d{4}\s+')
+TIME_RANGE_RE = re.compile(r'(\d{1,2}:\d{2}[ap]m)-(\d{1,2}:\d{2}[ap]m)')
+TIME_START_RE = re.compile(r'\d{1,2}:\d{2}[ap]m', re.IGNORECASE)
+DAY_RE = re.compile('|'.join(DAY_NAMES), re.IGNORECASE)
+METADATA_RE = re.compile('|'.join(DAY_NAMES + [r'\d{1,2}:\d{2}[ap]m', 'Floor', 'Building', 'Room']),
+                         re.IGNORECASE)
+
+LOCATION_RE = keyword_pattern(['Floor', 'Building', 'Room', 'Bridge', 'Riverside', 'Churchill', 'Canal',
+                               'Cambridge'])
+CATEGORY_RE = keyword_pattern(['Undergraduate Research', 'Comparative Politics', 'Public Opinion',
+                               'Conference Within A Conference', 'Political Methodology', 'International Conflict',
+                               'Human Rights', 'Race and Ethnicity', 'Women, Gender, and Politics',
+                               'Environmental Politics', 'American Political Development', 'Presidential',
+                               'Local and Urban Politics', 'Political Theory', 'Teaching Political Science',
+                               'Meetings', 'Political Psychology'])
+INSTITUTION_RE = keyword_pattern(['University', 'College', 'Institute', 'School', 'Center', 'State',
+                                  'Student', 'Professor', 'Dr.', 'MIT', 'UCLA', 'USC'])
+AUTHOR_HINT_RE = keyword_pattern([',', 'University', 'College'])
+
+# Bold role headers in the PDF layout
+ROLE_HEADERS = {
+    "participant": "participants",
+    "participants": "participants",
+    "chair": "chair",
+    "chairs": "chair",
+    "discussant": "discussants",
+    "discussants": "discussants",
+}
+
+# Role headers as ScheduleParser has always matched them in plain text
+TEXT_ROLE_HEADERS = {
+    "chair": "chair",
+    "chair:": "chair",
+    "participants": "participants",
+    "participants:": "participants",
+}
+
+
+def classify_text(line):
+    """Classify a stripped line of plain PDF text for ScheduleParser.
+
+    Returns (kind, role); role is set only for ROLE lines. Kinds are tested
+    in the order the parser has always tested them, so a line that is both
+    a day and a location is a DAY.
+    """
+    if DAY_RE.match(line):
+        return DAY, None
+    if TIME_START_RE.match(line):
+        return TIME, None
+    if LOCATION_RE.search(line):
+        return LOCATION, None
+    if CATEGORY_RE.search(line):
+        return CATEGORY, None
+    lower = line.lower()
+    role = TEXT_ROLE_HEADERS.get(lower)
+    if role is None and lower.startswith('discussant'):
+        role = 'discussants'
+    if role:
+        return ROLE, role
+    return TEXT, None
+
+
+def is_metadata_line(line):
+    return METADATA_RE.search(line) is not None
+
+
+def looks_like_person(line):
+    """Typically 'Name, Affiliation' with an institution keyword."""
+    return ',' in line and INSTITUTION_RE.search(line) is not None
+
+
+class LineClassifier:
+    """Classify styled line records from extract_sessions by column and font.
+
+    Font styles (from inspection):
+      Bold: Session Title, Section, "Participants", "Chair", "Discussants"
+      Bold Italic: Day
+      Italic: Time, Location
+      Regular: Session ID, Paper Title, Author Name
+    """
+
+    def __init__(self, session_id_x_max, header_column_x_max, paper_title_x, author_x, tolerance=10):
+        self.session_id_x_max = session_id_x_max
+        self.header_column_x_max = header_column_x_max
+        self.paper_title_x = paper_title_x
+        self.author_x = author_x
+        self.tolerance = tolerance
+
+    @classmethod
+    def from_layout(cls, layout):
+        """Classifier for a layout profile (layout_profile.calibrate() or extract_sessions.DEFAULT_LAYOUT)."""
+        return cls(layout["session_id_x_max"], layout["header_column_x_max"],
+                   layout["paper_title_x"], layout["author_x"], layout["tolerance"])
+
+    def classify(self, line, text):
+        """Return (kind, detail) for a line record whose stripped text is `text`.
+
+        detail is the regex match for SESSION_ID and TIME lines and the role
+        name for ROLE lines.
+        """
+        x0 = line['x0']
+        bold = line['bold']
+        italic = line['italic']
+
+        # Header column: id, day, time and location
+        if x0 < self.header_column_x_max:
+            if x0 < self.session_id_x_max and not (bold or italic):
+                match = SESSION_ID_RE.match(text)
+                if match:
+                    return SESSION_ID, match
+            if bold and italic:
+                return DAY, None
+            if italic:
+                match = TIME_RANGE_RE.search(text)
+                return (TIME, match) if match else (LOCATION, None)
+            return OTHER, None
+
+        # Right column: headings and role headers in bold, papers and authors
+        if bold:
+            role = ROLE_HEADERS.get(text.lower().rstrip(':'))
+            return (ROLE, role) if role else (HEADING, None)
+        if abs(x0 - self.paper_title_x) < self.tolerance:
+            return PAPER, None
+        if abs(x0 - self.author_x) < self.tolerance and AUTHOR_HINT_RE.search(text):
+            return AUTHOR, None
+        return TEXT, None
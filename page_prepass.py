@@ -0,0 +1,71 @@
+"""
+Text pre-pass: which pages of a program PDF hold sessions.
+
+Laying a page out with pdfplumber (every character, clustered into words
+and lines) costs several times what PyPDF2's plain text extraction does.
+The hybrid engine in extract_sessions.py (--engine hybrid) reads each page's
+text first and lays out only the pages that show a session: a line that
+starts with a session id ("3100 ...") or a role header ("Participants",
+"Chair", "Discussants"). Cover pages, ads and the participant index have
+neither and are skipped.
+
+A false positive (a title line starting with a year, say) only costs a
+layout that wasn't needed; the markers are chosen so that every page that
+carries part of a session has one. session_pages() returns None when PyPDF2
+isn't installed, and callers then lay out every page.
+
+    python3 page_prepass.py spsa_friday.pdf [...]
+"""
+
+import argparse
+import time
+
+from line_classifier import ROLE_HEADERS, SESSION_ID_RE
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+
+def page_has_sessions(text):
+    for line in text.splitlines():
+        line = line.strip()
+        if SESSION_ID_RE.match(line) or line.lower().rstrip(':') in ROLE_HEADERS:
+            return True
+    return False
+
+
+def session_pages(pdf_path, page_numbers=None):
+    """Set of 0-based page numbers (of page_numbers, default all) that show sessions, or None."""
+    if PyPDF2 is None:
+        return None
+    with open(pdf_path, "rb") as f:
+        pages = PyPDF2.PdfReader(f).pages
+        if page_numbers is None:
+            page_numbers = range(len(pages))
+        return {n for n in page_numbers if page_has_sessions(pages[n].extract_text() or "")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show which pages of program PDFs the hybrid engine would lay out.")
+    parser.add_argument("pdfs", nargs="+")
+    args = parser.parse_args()
+
+    if PyPDF2 is None:
+        raise SystemExit("PyPDF2 is not installed")
+    for pdf_path in args.pdfs:
+        start = time.perf_counter()
+        with open(pdf_path, "rb") as f:
+            page_count = len(PyPDF2.PdfReader(f).pages)
+        pages = session_pages(pdf_path)
+        elapsed = time.perf_counter() - start
+        skipped = [n + 1 for n in range(page_count) if n not in pages]
+        print(f"{pdf_path}: {len(pages)}/{page_count} pages with sessions ({elapsed:.2f}s)")
+        print("  " + "".join("S" if n in pages else "." for n in range(page_count)))
+        if skipped:
+            print(f"  skipped: {', '.join(map(str, skipped))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,37 +9,71 @@ import json
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional
+
+from line_classifier import (
+    CATEGORY, DAY, LOCATION, TIME,
+    SESSION_ID_PREFIX_RE, SESSION_ID_STRIP_RE,
+    classify_text, is_metadata_line, looks_like_person,
+)
+
+from schedule_model import Interner, ParticipantDraft, Session
+from schedule_time import add_time_fields, format_clock, parse_time_range
+
+SESSION_SPLIT = re.compile(r'\n(?=\d{4}\s+)')
 
 
 class ScheduleParser:
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: str, day: str = ""):
         self.pdf_path = pdf_path
+        self.day = day
         self.sessions = []
+        self.interner = Interner()
 
     def parse(self) -> List[Dict[str, Any]]:
         """Parse the PDF and extract all sessions."""
+        self.sessions.extend(self.iter_sessions())
+        return self.sessions
+
+    def iter_sessions(self) -> Iterator[Dict[str, Any]]:
+        """Yield sessions as dicts in parse_schedule's JSON shape."""
+        for session in self.iter_models():
+            yield add_time_fields(session.to_schedule_parser_dict())
+
+    def iter_models(self) -> Iterator[Session]:
+        """Yield schedule_model.Session objects as the PDF is read page by page.
+
+        Only the text of the session block still open at a page break is
+        carried over, instead of the whole document.
+        """
+        pending = ""
         with open(self.pdf_path, 'rb') as pdf_file:
             pdf_reader = PyPDF2.PdfReader(pdf_file)
-            full_text = ""
             for page in pdf_reader.pages:
-                full_text += page.extract_text() + "\n"
+                pending += page.extract_text() + "\n"
+                # Split into sessions by session ID pattern (4 digits at start of line);
+                # the last block may continue on the next page
+                *blocks, pending = SESSION_SPLIT.split(pending)
+                yield from self._parse_blocks(blocks)
 
-        # Split into sessions by session ID pattern (4 digits at start of line)
-        session_blocks = re.split(r'\n(?=\d{4}\s+)', full_text)
+        yield from self._parse_blocks([pending])
 
-        for block in session_blocks:
+    def _parse_blocks(self, blocks: List[str]) -> Iterator[Session]:
+        for block in blocks:
             if not block.strip() or len(block.strip()) < 10:
                 continue
 
-            session = self.parse_session(block)
+            session = self.parse_session_model(block)
             if session:
-                self.sessions.append(session)
-
-        return self.sessions
+                yield session
 
     def parse_session(self, text: str) -> Dict[str, Any]:
-        """Parse a single session block."""
+        """Parse a single session block into parse_schedule's JSON shape."""
+        session = self.parse_session_model(text)
+        return add_time_fields(session.to_schedule_parser_dict()) if session else None
+
+    def parse_session_model(self, text: str) -> Optional[Session]:
+        """Parse a single session block into a schedule_model.Session."""
         lines = [line.strip() for line in text.split('\n') if line.strip()]
 
         if not lines:
@@ -47,23 +81,18 @@ class ScheduleParser:
 
         # Extract session ID
         first_line = lines[0]
-        session_id_match = re.match(r'^(\d{4})', first_line)
+        session_id_match = SESSION_ID_PREFIX_RE.match(first_line)
         if not session_id_match:
             return None
 
-        session_id = session_id_match.group(1)
+        interner = self.interner
+        session = Session(interner.string(self.day), session_id_match.group(1))
 
         # Find the title (usually follows the session ID)
-        title = ""
         day_time = ""
-        location = ""
-        category = ""
-        chair = []
-        participants = []
-        discussants = []
 
         current_section = None
-        current_participant = {}
+        current_participant = None
 
         i = 0
         while i < len(lines):
@@ -72,20 +101,22 @@ class ScheduleParser:
             # Session ID and title usually on first line or next line
             if i == 0 or i == 1:
                 # Remove session ID from line if present
-                line_clean = re.sub(r'^\d{4}\s+', '', line)
-                if not title and line_clean and not self.is_metadata_line(line_clean):
-                    title = line_clean
+                line_clean = SESSION_ID_STRIP_RE.sub('', line)
+                if not session.title and line_clean and not self.is_metadata_line(line_clean):
+                    session.title = line_clean
                 i += 1
                 continue
 
+            kind, role = classify_text(line)
+
             # Check for day/time patterns
-            if re.match(r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)', line, re.IGNORECASE):
+            if kind == DAY:
                 day_time = line
                 i += 1
                 continue
 
             # Check for time patterns
-            if re.match(r'\d{1,2}:\d{2}[ap]m', line, re.IGNORECASE):
+            if kind == TIME:
                 if not day_time or 'Floor' in day_time or 'Building' in day_time:
                     day_time = line
                 else:
@@ -94,61 +125,42 @@ class ScheduleParser:
                 continue
 
             # Location usually has Floor, Building, Room names
-            if any(keyword in line for keyword in ['Floor', 'Building', 'Room', 'Bridge', 'Riverside', 'Churchill', 'Canal', 'Cambridge']):
-                if not location:
-                    location = line
+            if kind == LOCATION:
+                if not session.location:
+                    session.location = line
                 else:
-                    location += " " + line
+                    session.location += " " + line
                 i += 1
                 continue
 
             # Category keywords
-            category_keywords = ['Undergraduate Research', 'Comparative Politics', 'Public Opinion',
-                                'Conference Within A Conference', 'Political Methodology', 'International Conflict',
-                                'Human Rights', 'Race and Ethnicity', 'Women, Gender, and Politics',
-                                'Environmental Politics', 'American Political Development', 'Presidential',
-                                'Local and Urban Politics', 'Political Theory', 'Teaching Political Science',
-                                'Meetings', 'Political Psychology']
-
-            for keyword in category_keywords:
-                if keyword in line:
-                    category = line
-                    i += 1
-                    break
-
-            if category and category in line:
+            if kind == CATEGORY:
+                session.section = interner.string(line)
                 i += 1
-                continue
 
-            # Section headers
-            if line.lower() == 'chair' or line.lower() == 'chair:':
-                current_section = 'chair'
+            if session.section and session.section in line:
                 i += 1
                 continue
 
-            if line.lower() == 'participants' or line.lower() == 'participants:':
-                current_section = 'participants'
-                # Save any pending participant
-                if current_participant and current_participant.get('name'):
-                    participants.append(current_participant)
-                    current_participant = {}
+            # Section headers
+            if role == 'chair':
+                current_section = 'chair'
                 i += 1
                 continue
 
-            if line.lower().startswith('discussant'):
-                current_section = 'discussants'
+            if role == 'participants' or role == 'discussants':
+                current_section = role
                 # Save any pending participant
-                if current_participant and current_participant.get('name'):
-                    participants.append(current_participant)
-                    current_participant = {}
+                if current_participant and current_participant.name:
+                    session.participants.append(interner.participant(current_participant))
+                    current_participant = None
                 i += 1
                 continue
 
             # Parse chair
             if current_section == 'chair':
                 if self.looks_like_person(line):
-                    name, affiliation = self.parse_person_line(line)
-                    chair.append({'name': name, 'affiliation': affiliation})
+                    session.chairs.append(interner.person(*self.parse_person_line(line)))
                 else:
                     current_section = None
 
@@ -156,68 +168,48 @@ class ScheduleParser:
             elif current_section == 'participants':
                 if self.looks_like_person(line):
                     # Save previous participant if exists
-                    if current_participant and current_participant.get('name'):
-                        participants.append(current_participant)
+                    if current_participant and current_participant.name:
+                        session.participants.append(interner.participant(current_participant))
 
                     name, affiliation = self.parse_person_line(line)
-                    current_participant = {
-                        'name': name,
-                        'affiliation': affiliation,
-                        'paper': ''
-                    }
+                    current_participant = ParticipantDraft("", name, affiliation)
                 elif current_participant:
                     # This is likely a paper title
-                    if not current_participant.get('paper'):
-                        current_participant['paper'] = line
+                    if not current_participant.title:
+                        current_participant.title = line
                     else:
-                        current_participant['paper'] += ' ' + line
+                        current_participant.title += ' ' + line
 
             # Parse discussants
             elif current_section == 'discussants':
                 if self.looks_like_person(line):
-                    name, affiliation = self.parse_person_line(line)
-                    discussants.append({'name': name, 'affiliation': affiliation})
+                    session.discussants.append(interner.person(*self.parse_person_line(line)))
 
             i += 1
 
         # Save last participant
-        if current_participant and current_participant.get('name'):
-            participants.append(current_participant)
-
-        session = {
-            'id': session_id,
-            'title': title,
-            'day_time': day_time,
-            'location': location,
-            'category': category,
-            'chair': chair,
-            'participants': participants,
-            'discussants': discussants
-        }
+        if current_participant and current_participant.name:
+            session.participants.append(interner.participant(current_participant))
+
+        # Normalize to the first "start-end" range; the raw text can pick up
+        # wrapped lines or a second range
+        session.location = interner.string(session.location)
+        times = parse_time_range(day_time)
+        if times:
+            session.start_time, session.end_time = (
+                interner.string(format_clock(m)) if m is not None else "" for m in times)
+        else:
+            session.time_text = day_time
 
         return session
 
     def is_metadata_line(self, line: str) -> bool:
         """Check if a line is metadata (day, time, location, etc.)"""
-        metadata_patterns = [
-            r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)',
-            r'\d{1,2}:\d{2}[ap]m',
-            r'Floor',
-            r'Building',
-            r'Room'
-        ]
-        return any(re.search(pattern, line, re.IGNORECASE) for pattern in metadata_patterns)
+        return is_metadata_line(line)
 
     def looks_like_person(self, line: str) -> bool:
         """Heuristic to identify if a line contains a person's name and affiliation."""
-        # Typically: Name, Affiliation
-        # Has a comma and contains a university/institution keyword
-        if ',' not in line:
-            return False
-
-        institution_keywords = ['University', 'College', 'Institute', 'School', 'Center', 'State',
-                               'Student', 'Professor', 'Dr.', 'MIT', 'UCLA', 'USC']
-        return any(keyword in line for keyword in institution_keywords)
+        return looks_like_person(line)
 
     def parse_person_line(self, line: str) -> tuple:
         """Extract name and affiliation from a person line."""
@@ -244,7 +236,7 @@ def parse_all_pdfs():
             continue
 
         print(f"Parsing {pdf_file}...")
-        parser = ScheduleParser(str(pdf_path))
+        parser = ScheduleParser(str(pdf_path), day.capitalize())
         sessions = parser.parse()
 
         all_sessions[day] = sessions
@@ -0,0 +1,129 @@
+"""
+People and institutions, deduplicated across days.
+
+Every participant record repeats its name and affiliation as free text.
+build_people_index() normalizes both (accents, case, whitespace, trailing
+punctuation left by wrapped lines), merges records that agree, and gives
+each person and institution a stable id derived from its normalized key,
+so ids survive rebuilds and reordering:
+
+  {"format": 1,
+   "institutions": [{"id": "i3f9a0c21d4", "name": "University of Florida", "sessions": [3, 17]}, ...],
+   "people": [{"id": "p81b7e05a92", "name": "Daniel Smith", "institution": 12, "sessions": [3, 40]}, ...]}
+
+A person is a normalized name at a normalized institution: the same name
+at two institutions stays two people, since both happen in practice (two
+Daniel Smiths; one author listing Universitat de Barcelona and University
+of Barcelona), and merging strangers is the worse mistake. "institution"
+is an index into "institutions" (or null), and "sessions" are ordinals, as
+in the search index, so "every session for this person" is one lookup.
+
+    python3 people_index.py [schedule_all.json] [name]
+"""
+
+import argparse
+import hashlib
+import re
+
+from search_index import normalize
+
+PEOPLE_INDEX_FORMAT = 1
+
+WHITESPACE_RE = re.compile(r'\s+')
+EDGE_PUNCTUATION = " ,;:.-"
+
+
+def normalize_key(text):
+    """Folded form used to decide whether two strings name the same entity."""
+    return WHITESPACE_RE.sub(" ", normalize(text or "")).strip(EDGE_PUNCTUATION)
+
+
+def clean_display(text):
+    return WHITESPACE_RE.sub(" ", text or "").strip(EDGE_PUNCTUATION)
+
+
+def stable_id(prefix, key):
+    return prefix + hashlib.sha1(key.encode("utf-8")).hexdigest()[:10]
+
+
+def _display_rank(variant, count):
+    # Most used spelling first; prefer mixed case over ALL CAPS or all lower
+    return count, variant != variant.upper() and variant != variant.lower()
+
+
+def build_people_index(sessions):
+    """Return (index, person_numbers).
+
+    person_numbers[ordinal][i] is the index into index["people"] of the i-th
+    participant of that session.
+    """
+    institutions = {}  # key -> {"variants": {text: count}, "sessions": set()}
+    people = {}        # (name key, institution key) -> {"name": text, "sessions": set()}
+    keys = []
+    for ordinal, session in enumerate(sessions):
+        session_keys = []
+        for participant in session.get("participants", []):
+            institution_key = normalize_key(participant.get("affiliation"))
+            if institution_key:
+                entry = institutions.setdefault(institution_key, {"variants": {}, "sessions": set()})
+                variant = clean_display(participant["affiliation"])
+                entry["variants"][variant] = entry["variants"].get(variant, 0) + 1
+                entry["sessions"].add(ordinal)
+            key = (normalize_key(participant["name"]), institution_key)
+            people.setdefault(key, {"name": clean_display(participant["name"]), "sessions": set()})
+            people[key]["sessions"].add(ordinal)
+            session_keys.append(key)
+        keys.append(session_keys)
+
+    institution_keys = sorted(institutions)
+    institution_numbers = {key: i for i, key in enumerate(institution_keys)}
+    person_keys = sorted(people)
+    person_numbers = {key: i for i, key in enumerate(person_keys)}
+
+    index = {
+        "format": PEOPLE_INDEX_FORMAT,
+        "institutions": [
+            {"id": stable_id("i", key),
+             "name": max(institutions[key]["variants"].items(), key=lambda item: _display_rank(*item))[0],
+             "sessions": sorted(institutions[key]["sessions"])}
+            for key in institution_keys
+        ],
+        "people": [
+            {"id": stable_id("p", "\t".join(key)),
+             "name": people[key]["name"],
+             "institution": institution_numbers.get(key[1]),
+             "sessions": sorted(people[key]["sessions"])}
+            for key in person_keys
+        ],
+    }
+    return index, [[person_numbers[key] for key in session_keys] for session_keys in keys]
+
+
+def main():
+    from build_artifacts import load_sessions
+
+    parser = argparse.ArgumentParser(description="Deduplicate people and institutions across days.")
+    parser.add_argument("source", nargs="?", default="schedule_all.json")
+    parser.add_argument("name", nargs="?", help="list the sessions of people whose name contains this")
+    args = parser.parse_args()
+
+    sessions = load_sessions(args.source)
+    index, _ = build_people_index(sessions)
+    records = sum(len(s["participants"]) for s in sessions)
+    affiliations = {p["affiliation"] for s in sessions for p in s["participants"] if p["affiliation"]}
+    print(f"{records} participant records -> {len(index['people'])} people; "
+          f"{len(affiliations)} affiliation strings -> {len(index['institutions'])} institutions")
+
+    if args.name:
+        wanted = normalize_key(args.name)
+        for person in index["people"]:
+            if wanted in normalize_key(person["name"]):
+                institution = index["institutions"][person["institution"]]["name"] if person["institution"] is not None else ""
+                print(f"\n{person['name']} ({institution}) [{person['id']}]")
+                for ordinal in person["sessions"]:
+                    s = sessions[ordinal]
+                    print(f"  {s['day']:<9} {s['start_time']:>7}  {s['id']}  {s['title']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Related sessions: the nearest panels by what their papers are about.
+
+Each session is a bag of words from its title and its distinct paper
+titles, tokenized like the search index, minus stopwords. Words are
+weighted TF-IDF (1 + log tf, smoothed idf) and each session's vector
+scaled to unit length, so similarity is the cosine, a dot product.
+
+The vectors are a CSR matrix held in three NumPy arrays (no SciPy). Every
+session's top k comes from blocked matrix products: a chunk of sessions is
+made dense and multiplied against each block of sessions in turn, keeping
+the best k per row with argpartition. The chunk size is chosen so the
+dense blocks and products stay within --memory-mb, whatever the program's
+size. related_pairwise() computes the same thing one pair at a time and is
+the reference benchmark_related.py checks against.
+
+build_artifacts.py writes data/related.json (skipped without NumPy):
+
+  {"format": 1, "k": 5, "related": [[40, 212, 7], ...], "scores": [[0.412, 0.33, 0.301], ...]}
+
+"related"[ordinal] lists that session's nearest sessions by ordinal, best
+first; sessions sharing nothing above MIN_SCORE are left out.
+
+    python3 related_sessions.py [schedule_all.json] [ordinal] [-k 5]
+"""
+
+import argparse
+import math
+
+from search_index import tokenize
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+RELATED_FORMAT = 1
+DEFAULT_K = 5
+DEFAULT_MEMORY_MB = 64
+MIN_SCORE = 0.05
+
+STOPWORDS = frozenset("""
+    a about after against all among an and are as at be between beyond by can do does for from
+    how in into is it its more new not of on or our over the their them they this through to
+    under using versus vs we what when where which who why with within without
+""".split())
+
+
+def session_terms(session):
+    """Tokens of the session title and each distinct paper title."""
+    texts = [session.get("title") or ""]
+    texts.extend(dict.fromkeys(p["title"] for p in session.get("participants", []) if p.get("title")))
+    return [token for text in texts for token in tokenize(text)
+            if len(token) > 2 and token not in STOPWORDS and not token.isdigit()]
+
+
+def tfidf_vectors(sessions):
+    """Unit-length TF-IDF vectors as [{term number: weight}], plus the vocabulary size."""
+    counts = []
+    vocabulary = {}
+    document_frequency = []
+    for session in sessions:
+        tf = {}
+        for token in session_terms(session):
+            term = vocabulary.setdefault(token, len(vocabulary))
+            tf[term] = tf.get(term, 0) + 1
+        for term in tf:
+            if term == len(document_frequency):
+                document_frequency.append(0)
+            document_frequency[term] += 1
+        counts.append(tf)
+
+    n = len(sessions)
+    idf = [math.log((1 + n) / (1 + df)) + 1 for df in document_frequency]
+    vectors = []
+    for tf in counts:
+        weights = {term: (1 + math.log(count)) * idf[term] for term, count in tf.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        vectors.append({term: w / norm for term, w in weights.items()} if norm else {})
+    return vectors, len(vocabulary)
+
+
+def _ranked(candidates, k):
+    # Best score first, lower ordinal first on ties
+    best = sorted(candidates, key=lambda item: (-item[1], item[0]))[:k]
+    return [ordinal for ordinal, _ in best], [round(score, 3) for _, score in best]
+
+
+def related_pairwise(sessions, k=DEFAULT_K):
+    """Top k per session by computing every pair's cosine on its own; returns (related, scores)."""
+    vectors, _ = tfidf_vectors(sessions)
+    related, scores = [], []
+    for i, a in enumerate(vectors):
+        candidates = []
+        for j, b in enumerate(vectors):
+            if i == j:
+                continue
+            if len(b) < len(a):
+                score = sum(w * a.get(term, 0.0) for term, w in b.items())
+            else:
+                score = sum(w * b.get(term, 0.0) for term, w in a.items())
+            if score >= MIN_SCORE:
+                candidates.append((j, score))
+        ordinals, top = _ranked(candidates, k)
+        related.append(ordinals)
+        scores.append(top)
+    return related, scores
+
+
+def csr_matrix(vectors):
+    """(indptr, indices, data) for the vectors, one row per session."""
+    indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(v) for v in vectors])
+    indices = np.fromiter((term for v in vectors for term in v), dtype=np.int64, count=indptr[-1])
+    data = np.fromiter((w for v in vectors for w in v.values()), dtype=np.float32, count=indptr[-1])
+    return indptr, indices, data
+
+
+def dense_rows(matrix, vocabulary_size, start, stop):
+    """Rows start:stop of a CSR matrix as a dense float32 array."""
+    indptr, indices, data = matrix
+    dense = np.zeros((stop - start, vocabulary_size), dtype=np.float32)
+    rows = np.repeat(np.arange(stop - start), np.diff(indptr[start:stop + 1]))
+    span = slice(indptr[start], indptr[stop])
+    dense[rows, indices[span]] = data[span]
+    return dense
+
+
+def chunk_size(vocabulary_size, memory_mb, k=DEFAULT_K):
+    """Largest c whose working arrays fit in memory_mb.
+
+    Counted in float32s: the two dense c x vocabulary blocks, the c x c
+    product and argpartition's c x c int64 indices into it (two floats
+    each), and the running top k, c x 2k scores and int64 ordinals.
+    """
+    floats = memory_mb * 2**20 / 4
+    linear = 2 * vocabulary_size + 6 * k
+    c = (math.sqrt(linear ** 2 + 12 * floats) - linear) / 6
+    return max(1, int(c))
+
+
+def related_batched(sessions, k=DEFAULT_K, memory_mb=DEFAULT_MEMORY_MB):
+    """Top k per session from blocked matrix products; returns (related, scores).
+
+    Sessions are taken a chunk at a time; each chunk is multiplied against
+    every block of sessions (both made dense from the CSR rows). Each
+    product is cut to its own k best per row before being merged with the
+    k best so far, so only the product and c x 2k candidates are held.
+    """
+    vectors, vocabulary_size = tfidf_vectors(sessions)
+    n = len(vectors)
+    matrix = csr_matrix(vectors)
+    top = min(k, n - 1)
+    if top <= 0:
+        return [[] for _ in sessions], [[] for _ in sessions]
+    chunk = chunk_size(vocabulary_size, memory_mb, top)
+
+    related, scores = [], []
+    for start in range(0, n, chunk):
+        stop = min(n, start + chunk)
+        rows = dense_rows(matrix, vocabulary_size, start, stop)
+        best_scores = np.full((stop - start, 0), -1.0, dtype=np.float32)
+        best = np.zeros((stop - start, 0), dtype=np.int64)
+        for block_start in range(0, n, chunk):
+            block_stop = min(n, block_start + chunk)
+            similarity = rows @ dense_rows(matrix, vocabulary_size, block_start, block_stop).T
+            if block_start == start:
+                np.fill_diagonal(similarity, -1.0)
+            if similarity.shape[1] > top:
+                keep = np.argpartition(similarity, -top, axis=1)[:, -top:]
+                similarity = np.take_along_axis(similarity, keep, axis=1)
+                ordinals = keep + block_start
+            else:
+                ordinals = np.broadcast_to(np.arange(block_start, block_stop), similarity.shape)
+            candidates = np.hstack([best_scores, similarity])
+            ordinals = np.hstack([best, ordinals])
+            if candidates.shape[1] > top:
+                keep = np.argpartition(-candidates, top - 1, axis=1)[:, :top]
+                candidates = np.take_along_axis(candidates, keep, axis=1)
+                ordinals = np.take_along_axis(ordinals, keep, axis=1)
+            best_scores, best = candidates, ordinals
+        for row_scores, row_ordinals in zip(best_scores.tolist(), best.tolist()):
+            ordinals, values = _ranked(((j, score) for j, score in zip(row_ordinals, row_scores)
+                                        if score >= MIN_SCORE), k)
+            related.append(ordinals)
+            scores.append(values)
+    return related, scores
+
+
+def build_related_index(sessions, k=DEFAULT_K):
+    """The related.json document, or None without NumPy."""
+    if np is None:
+        return None
+    related, scores = related_batched(sessions, k)
+    return {"format": RELATED_FORMAT, "k": k, "related": related, "scores": scores}
+
+
+def main():
+    from build_artifacts import load_sessions
+
+    parser = argparse.ArgumentParser(description="Find each session's most similar sessions.")
+    parser.add_argument("source", nargs="?", default="schedule_all.json")
+    parser.add_argument("ordinal", nargs="?", type=int, help="list this session's related sessions")
+    parser.add_argument("-k", type=int, default=DEFAULT_K)
+    args = parser.parse_args()
+
+    sessions = load_sessions(args.source)
+    if np is None:
+        related, scores = related_pairwise(sessions, args.k)
+    else:
+        related, scores = related_batched(sessions, args.k)
+    ordinals = [args.ordinal] if args.ordinal is not None else range(min(5, len(sessions)))
+    for i in ordinals:
+        s = sessions[i]
+        print(f"\n[{i}] {s['day']} {s['start_time']} {s['id']}  {s['title']}")
+        for j, score in zip(related[i], scores[i]):
+            r = sessions[j]
+            print(f"  {score:.3f}  [{j}] {r['day']} {r['start_time']} {r['id']}  {r['title']}")
+
+
+if __name__ == "__main__":
+    main()
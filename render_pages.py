@@ -0,0 +1,135 @@
+"""
+Pre-rendered session cards for the web page.
+
+Building every card in the browser means one long string per filter
+change, escaped text and all, which low-end phones stall on. The
+unfiltered day lists never change between builds, so they are rendered
+here, escaped once, in the same markup index.html's renderSession()
+produces:
+
+  data/pages/{day}-{n}.html   CHUNK_SIZE cards each, in schedule order
+
+The page paints the first chunk as soon as it arrives and fetches the
+next when the reader scrolls near the end. Each card carries a stable
+anchor, {day}-{session id}-{n} (n counts earlier sessions with the same
+id that day), so links to a session survive rebuilds that move it to
+another chunk.
+
+    python3 render_pages.py [schedule_all.json] [--chunk-size 25]
+"""
+
+import argparse
+import html
+import time
+
+from tracing import TRACER
+
+CHUNK_SIZE = 25
+
+
+def escape(text):
+    return html.escape(text, quote=True)
+
+
+def session_anchors(sessions):
+    """Stable anchor for each session: day, id and its position among that id's sessions."""
+    seen = {}
+    anchors = []
+    for session in sessions:
+        key = (session["day"], session["id"])
+        seen[key] = seen.get(key, -1) + 1
+        anchors.append(f"{session['day'].lower()}-{session['id']}-{seen[key]}")
+    return anchors
+
+
+def render_session(session, ordinal, anchor, person_numbers=None, has_related=False):
+    """One card, matching renderSession() in index.html."""
+    parts = [f'<div class="session-card" id="{escape(anchor)}">',
+             f'<span class="session-id">Session {escape(session["id"])}</span>']
+    if session.get("title"):
+        parts.append(f'<h2 class="session-title">{escape(session["title"])}</h2>')
+    parts.append('<div class="session-meta">')
+    if session.get("day"):
+        parts.append(f'<div class="meta-item"><strong>📅 Day:</strong> {escape(session["day"])}</div>')
+    if session.get("start_time") and session.get("end_time"):
+        clock = f'{session["start_time"]} - {session["end_time"]}'
+        parts.append(f'<div class="meta-item"><strong>⏰ Time:</strong> {escape(clock)}</div>')
+    if session.get("location"):
+        parts.append(f'<div class="meta-item"><strong>📍 Location:</strong> {escape(session["location"])}</div>')
+    parts.append('</div>')
+    if session.get("section"):
+        parts.append(f'<div><span class="category-badge">{escape(session["section"])}</span></div>')
+    if has_related:
+        parts.append(f'<button class="related-link" data-related="{ordinal}">Similar sessions</button>')
+
+    participants = session.get("participants") or []
+    if participants:
+        parts.append('<div class="section"><div class="section-title">Participants</div>')
+        for i, participant in enumerate(participants):
+            parts.append('<div class="person">')
+            if participant.get("title"):
+                parts.append(f'<div class="person-paper"><strong>Paper:</strong> {escape(participant["title"])}</div>')
+            if participant.get("name"):
+                name = escape(participant["name"])
+                if person_numbers is not None:
+                    name = (f'<button class="person-link" data-person="{person_numbers[i]}" '
+                            f'title="All sessions with {name}">{name}</button>')
+                parts.append(f'<div class="person-name">{name}</div>')
+            if participant.get("affiliation"):
+                parts.append(f'<div class="person-affiliation">{escape(participant["affiliation"])}</div>')
+            parts.append('</div>')
+        parts.append('</div>')
+    parts.append('</div>')
+    return "".join(parts)
+
+
+def render_days(sessions, person_numbers=None, related=None, chunk_size=CHUNK_SIZE):
+    """Yield (day, [chunk HTML], seconds) per day; sessions in shard order, so index = ordinal.
+
+    person_numbers and related (related_sessions' lists) are per ordinal,
+    as in build_artifacts; without them cards have no person links or
+    "Similar sessions" button, as in the page before those indexes load.
+    """
+    anchors = session_anchors(sessions)
+    start = 0
+    while start < len(sessions):
+        day = sessions[start]["day"]
+        stop = start
+        while stop < len(sessions) and sessions[stop]["day"] == day:
+            stop += 1
+        began = time.perf_counter()
+        with TRACER.span("render", day=day):
+            cards = [render_session(sessions[i], i, anchors[i],
+                                    person_numbers[i] if person_numbers is not None else None,
+                                    bool(related and related[i]))
+                     for i in range(start, stop)]
+            chunks = ["".join(cards[i:i + chunk_size]) for i in range(0, len(cards), chunk_size)]
+        yield day, chunks, time.perf_counter() - began
+        start = stop
+
+
+def main():
+    import gzip
+
+    from build_artifacts import group_by_day, load_sessions
+    from people_index import build_people_index
+    from related_sessions import build_related_index
+
+    parser = argparse.ArgumentParser(description="Render the day pages and report their size and render time.")
+    parser.add_argument("source", nargs="?", default="schedule_all.json")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    ordered = [s for day_sessions in group_by_day(load_sessions(args.source)).values() for s in day_sessions]
+    _, person_numbers = build_people_index(ordered)
+    related = build_related_index(ordered)
+    print(f"{'day':<12}{'sessions':>9}{'chunks':>8}{'bytes':>12}{'gzip_bytes':>12}{'first chunk':>13}{'render ms':>11}")
+    for day, chunks, seconds in render_days(ordered, person_numbers, related and related["related"], args.chunk_size):
+        data = [chunk.encode("utf-8") for chunk in chunks]
+        sessions = sum(s["day"] == day for s in ordered)
+        print(f"{day:<12}{sessions:>9}{len(chunks):>8}{sum(map(len, data)):>12,}"
+              f"{sum(len(gzip.compress(d, mtime=0)) for d in data):>12,}{len(data[0]):>13,}{seconds * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
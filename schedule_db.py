@@ -0,0 +1,349 @@
+"""
+SQLite store for the extracted schedule.
+
+Loads sessions into a normalized database so lookups by session id, person,
+room or keyword use indexes instead of reading schedule_all.json whole:
+
+  sessions       one row per session; (day, position) is unique, ids are not
+  participants   (session, position) -> person, affiliation, paper title
+  people         distinct names
+  people_fts     FTS5 over people's names, for person lookups
+  affiliations   distinct affiliations
+  titles_fts     FTS5 over session titles, sections and paper titles
+  days           per-day content digest for incremental rebuilds
+
+Rebuilds are incremental by day: each day's sessions are hashed, and only
+days whose digest changed (say, one re-issued PDF) are deleted and
+reloaded. Unused people and affiliations are pruned afterwards. A database
+written in an older DB_FORMAT is discarded and rebuilt whole.
+
+    python3 schedule_db.py [--db schedule.db] build [schedule_all.json]
+    python3 schedule_db.py session 2100 [--day Thursday]
+    python3 schedule_db.py person "Smith"
+    python3 schedule_db.py room "Fulton"
+    python3 schedule_db.py search "immigration attitudes"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+
+from schedule_time import to_minutes
+
+DB_FORMAT = 2
+DEFAULT_DB = "schedule.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS days (
+    day TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_pk INTEGER PRIMARY KEY,
+    day TEXT NOT NULL REFERENCES days(day),
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    start_time TEXT,
+    end_time TEXT,
+    start_minutes INTEGER,
+    end_minutes INTEGER,
+    start_iso TEXT,
+    end_iso TEXT,
+    location TEXT COLLATE NOCASE,
+    section TEXT,
+    title TEXT,
+    UNIQUE (day, position)
+);
+CREATE INDEX IF NOT EXISTS sessions_id ON sessions(id);
+CREATE INDEX IF NOT EXISTS sessions_day_time ON sessions(day, start_minutes);
+CREATE INDEX IF NOT EXISTS sessions_location ON sessions(location);
+CREATE TABLE IF NOT EXISTS people (
+    person_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS affiliations (
+    affiliation_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS participants (
+    session_pk INTEGER NOT NULL REFERENCES sessions(session_pk) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    person_id INTEGER NOT NULL REFERENCES people(person_id),
+    affiliation_id INTEGER REFERENCES affiliations(affiliation_id),
+    title TEXT,
+    PRIMARY KEY (session_pk, position)
+);
+CREATE INDEX IF NOT EXISTS participants_person ON participants(person_id);
+CREATE INDEX IF NOT EXISTS participants_affiliation ON participants(affiliation_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS people_fts USING fts5(
+    name, person_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS titles_fts USING fts5(
+    text, session_pk UNINDEXED, kind UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+SESSION_COLUMNS = ("id", "start_time", "end_time", "start_minutes", "end_minutes",
+                   "start_iso", "end_iso", "location", "section", "title")
+
+
+def db_format(conn):
+    """The DB_FORMAT a database was written in, or None if it has none yet."""
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return int(row[0]) if row else None
+
+
+def connect(path=DEFAULT_DB, readonly=False):
+    """Open the database; readonly opens an existing one without creating or changing anything."""
+    if readonly:
+        conn = sqlite3.connect(f"{pathlib.Path(path).absolute().as_uri()}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        return conn
+    conn = sqlite3.connect(path)
+    if db_format(conn) not in (None, DB_FORMAT):
+        # Older tables would be kept by CREATE IF NOT EXISTS; start afresh so every day reloads
+        conn.close()
+        os.remove(path)
+        conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    conn.execute("INSERT OR IGNORE INTO meta VALUES ('format', ?)", (str(DB_FORMAT),))
+    return conn
+
+
+def day_digest(sessions):
+    data = json.dumps(sessions, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _lookup_id(conn, table, key, name, cache):
+    """Row id for name in a people/affiliations table, inserting it if new."""
+    if name in cache:
+        return cache[name]
+    inserted = conn.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,)).rowcount
+    row_id = conn.execute(f"SELECT {key} FROM {table} WHERE name = ?", (name,)).fetchone()[0]
+    if inserted and table == "people":
+        conn.execute("INSERT INTO people_fts VALUES (?, ?)", (name, row_id))
+    cache[name] = row_id
+    return row_id
+
+
+def _delete_day(conn, day):
+    conn.execute("DELETE FROM titles_fts WHERE session_pk IN "
+                 "(SELECT session_pk FROM sessions WHERE day = ?)", (day,))
+    conn.execute("DELETE FROM sessions WHERE day = ?", (day,))
+    conn.execute("DELETE FROM days WHERE day = ?", (day,))
+
+
+def _insert_day(conn, day, position, digest, sessions):
+    conn.execute("INSERT INTO days VALUES (?, ?, ?)", (day, position, digest))
+    people, affiliations = {}, {}
+    for session_position, session in enumerate(sessions):
+        row = [session.get(column) for column in SESSION_COLUMNS]
+        if session.get("start_minutes") is None:
+            # Sessions from before schedule_time.py still get a sortable start
+            row[3], row[4] = to_minutes(session.get("start_time")), to_minutes(session.get("end_time"))
+        session_pk = conn.execute(
+            f"INSERT INTO sessions (day, position, {', '.join(SESSION_COLUMNS)}) "
+            f"VALUES (?, ?{', ?' * len(SESSION_COLUMNS)})",
+            [day, session_position] + row,
+        ).lastrowid
+
+        fts_rows = [(session.get("title", ""), session_pk, "session"),
+                    (session.get("section", ""), session_pk, "section")]
+        for participant_position, participant in enumerate(session.get("participants", [])):
+            affiliation = participant.get("affiliation")
+            conn.execute(
+                "INSERT INTO participants VALUES (?, ?, ?, ?, ?)",
+                (session_pk, participant_position,
+                 _lookup_id(conn, "people", "person_id", participant["name"], people),
+                 _lookup_id(conn, "affiliations", "affiliation_id", affiliation, affiliations)
+                 if affiliation else None,
+                 participant.get("title", "")),
+            )
+            if participant.get("title"):
+                fts_rows.append((participant["title"], session_pk, "paper"))
+        conn.executemany("INSERT INTO titles_fts VALUES (?, ?, ?)",
+                         [fts_row for fts_row in fts_rows if fts_row[0]])
+
+
+def update(conn, sessions):
+    """Bring the database in line with sessions, reloading only changed days.
+
+    Returns {"loaded": [...], "unchanged": [...], "removed": [...]} by day.
+    """
+    grouped = {}
+    for session in sessions:
+        grouped.setdefault(session["day"], []).append(session)
+    stored = {row["day"]: row["digest"] for row in conn.execute("SELECT day, digest FROM days")}
+    result = {"loaded": [], "unchanged": [], "removed": []}
+
+    with conn:
+        for day in stored.keys() - grouped.keys():
+            _delete_day(conn, day)
+            result["removed"].append(day)
+        for position, (day, day_sessions) in enumerate(grouped.items()):
+            digest = day_digest(day_sessions)
+            if stored.get(day) == digest:
+                conn.execute("UPDATE days SET position = ? WHERE day = ?", (position, day))
+                result["unchanged"].append(day)
+                continue
+            _delete_day(conn, day)
+            _insert_day(conn, day, position, digest, day_sessions)
+            result["loaded"].append(day)
+        if result["loaded"] or result["removed"]:
+            conn.execute("DELETE FROM people_fts WHERE person_id NOT IN (SELECT person_id FROM participants)")
+            conn.execute("DELETE FROM people WHERE person_id NOT IN (SELECT person_id FROM participants)")
+            conn.execute("DELETE FROM affiliations WHERE affiliation_id NOT IN "
+                         "(SELECT affiliation_id FROM participants WHERE affiliation_id IS NOT NULL)")
+    return result
+
+
+def build_db(sessions, path=DEFAULT_DB):
+    conn = connect(path)
+    try:
+        return update(conn, sessions)
+    finally:
+        conn.close()
+
+
+# Queries. Each returns session rows in schedule order (day, then start time).
+
+ORDER = "ORDER BY (SELECT position FROM days WHERE days.day = s.day), s.start_minutes, s.position"
+
+
+def sessions_by_id(conn, session_id, day=None):
+    sql = "SELECT s.* FROM sessions s WHERE s.id = ?"
+    params = [session_id]
+    if day:
+        sql += " AND s.day = ?"
+        params.append(day.capitalize())
+    return conn.execute(f"{sql} {ORDER}", params).fetchall()
+
+
+def sessions_by_person(conn, name):
+    """Sessions with a participant whose name has a word starting with each word of name.
+
+    Case and accents are ignored ("smi" finds "Smith", "jose" finds "José").
+    """
+    query = fts_query(name)
+    if not query:
+        return []
+    return conn.execute(
+        "SELECT s.* FROM sessions s WHERE s.session_pk IN ("
+        " SELECT p.session_pk FROM participants p WHERE p.person_id IN"
+        " (SELECT person_id FROM people_fts WHERE people_fts MATCH ?)) " + ORDER,
+        (query,),
+    ).fetchall()
+
+
+def sessions_by_location(conn, location):
+    return conn.execute(
+        # A bound "prefix%" pattern lets SQLite use the NOCASE location index
+        "SELECT s.* FROM sessions s WHERE s.location LIKE ? " + ORDER,
+        (location.replace("%", "").replace("_", "") + "%",),
+    ).fetchall()
+
+
+def fts_query(text):
+    """Plain words -> an FTS5 query matching every word as a prefix."""
+    words = [word.replace('"', '') for word in text.split()]
+    return " ".join(f'"{word}"*' for word in words if word)
+
+
+def search_sessions(conn, text):
+    """Sessions whose title, section or a paper title matches every word of text."""
+    query = fts_query(text)
+    if not query:
+        return []
+    return conn.execute(
+        "SELECT s.* FROM sessions s WHERE s.session_pk IN "
+        "(SELECT session_pk FROM titles_fts WHERE titles_fts MATCH ?) " + ORDER,
+        (query,),
+    ).fetchall()
+
+
+def load_session(conn, row):
+    """Rebuild the schedule_all.json dict for a session row."""
+    session = {"day": row["day"]}
+    session.update((column, row[column]) for column in SESSION_COLUMNS)
+    session["participants"] = [
+        {"title": p["title"], "name": p["name"], "affiliation": p["affiliation"] or ""}
+        for p in conn.execute(
+            "SELECT p.title, people.name, affiliations.name AS affiliation FROM participants p"
+            " JOIN people USING (person_id) LEFT JOIN affiliations USING (affiliation_id)"
+            " WHERE p.session_pk = ? ORDER BY p.position",
+            (row["session_pk"],),
+        )
+    ]
+    return session
+
+
+def format_row(row):
+    times = f"{row['start_time']}-{row['end_time']}" if row["start_time"] else ""
+    return f"{row['day']:<9} {times:<16} {row['id']}  {row['title']}  [{row['location']}]"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the schedule database.")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="load or refresh the database from a JSON file")
+    build.add_argument("source", nargs="?", default="schedule_all.json")
+    session = commands.add_parser("session", help="sessions with this id")
+    session.add_argument("id")
+    session.add_argument("--day")
+    session.add_argument("--json", action="store_true", help="print full session records")
+    for name, help_text in (("person", "sessions with a participant matching a name (word prefixes)"),
+                            ("room", "sessions in a location (prefix match)"),
+                            ("search", "keyword search over session and paper titles")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("text")
+        command.add_argument("--json", action="store_true", help="print full session records")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from build_artifacts import load_sessions
+        result = build_db(load_sessions(args.source), args.db)
+        for key, days in result.items():
+            if days:
+                print(f"{key}: {', '.join(days)}")
+        print(f"{args.db}: {os.path.getsize(args.db):,} bytes")
+        return
+
+    if not os.path.exists(args.db):
+        parser.error(f"{args.db} not found; run 'schedule_db.py build' first")
+    conn = connect(args.db, readonly=True)
+    if db_format(conn) != DB_FORMAT:
+        parser.error(f"{args.db} is from an older version; run 'schedule_db.py build' again")
+    if args.command == "session":
+        rows = sessions_by_id(conn, args.id, args.day)
+    elif args.command == "person":
+        rows = sessions_by_person(conn, args.text)
+    elif args.command == "room":
+        rows = sessions_by_location(conn, args.text)
+    else:
+        rows = search_sessions(conn, args.text)
+
+    if args.json:
+        print(json.dumps([load_session(conn, row) for row in rows], indent=2, ensure_ascii=False))
+    else:
+        for row in rows:
+            print(format_row(row))
+        print(f"{len(rows)} session(s)")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Differences between two extractions, as client patches and a change log.
+
+Session ids name a time block, not a session (every panel in the 8:00am
+Thursday block is 2100), so sessions are matched on (day, id) plus a
+second key, tried in turn: the whole record unchanged, then the title,
+then the room. Participants within a matched session are matched the same
+way: unchanged record first, then normalized name. Every pass is one dict
+build and one lookup per session, so a diff is linear in the number of
+sessions. Anything left unmatched is removed (old) or added (new).
+
+A delta rebuilds the new session list from the old one:
+
+  {"format": 1, "from": "<version>", "to": "<version>", "sessions": 385,
+   "runs": [[new ordinal, old ordinal, length], ...],     copied unchanged
+   "changed": [[new ordinal, {"set": {...}, "unset": [...],
+                              "participants": [...]}], ...],
+   "added": [[new ordinal, session], ...],
+   "removed": [old ordinal, ...]}
+
+"set"/"unset" hold only the fields that differ. "participants", present
+only when the list changed, is the new list in order: an old index for an
+unchanged participant, {"from": i, "set": ..., "unset": ...} for a changed
+one, {"new": participant} for an added one.
+
+build_artifacts.py keeps the last few versions' sessions in a history
+directory outside data/ and writes data/patches/<version>.json, one delta
+from each kept version straight to the current one, and
+data/changelog.json. index.html keeps the schedule it last loaded and
+applies its version's patch instead of fetching the day shards again.
+
+    python3 schedule_diff.py old.json [schedule_all.json] [-o delta.json]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+from collections import deque
+
+from people_index import normalize_key
+from schedule_io import atomic_write
+
+DELTA_FORMAT = 1
+HISTORY_FORMAT = 1
+DEFAULT_HISTORY_DIR = ".schedule_history"
+DEFAULT_KEEP = 10
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=True)
+
+
+def sessions_version(sessions):
+    """Content hash used when no build version is given."""
+    return hashlib.sha256(_dumps(sessions).encode("utf-8")).hexdigest()[:16]
+
+
+# Second keys for matching, tried in order: the same record, the same title, the same room
+SESSION_KEYS = (
+    _dumps,
+    lambda session: session.get("title"),
+    lambda session: session.get("location"),
+)
+
+PARTICIPANT_KEYS = (
+    _dumps,
+    lambda participant: normalize_key(participant.get("name")),
+)
+
+
+def match(old, new, block, keys):
+    """Pair old and new records: return {new index: old index}.
+
+    Records only match within the same block(record); each key function is
+    a pass over what is still unmatched, and equal keys pair up in order.
+    A key of None (no title, say) matches nothing.
+    """
+    pairs = {}
+    matched_old = set()
+    for key in keys:
+        waiting = {}
+        for i, record in enumerate(old):
+            value = None if i in matched_old else key(record)
+            if value is not None:
+                waiting.setdefault((block(record), value), deque()).append(i)
+        for j, record in enumerate(new):
+            value = None if j in pairs else key(record)
+            candidates = waiting.get((block(record), value)) if value is not None else None
+            if candidates:
+                i = candidates.popleft()
+                pairs[j] = i
+                matched_old.add(i)
+    return pairs
+
+
+def diff_fields(old, new, skip=()):
+    change = {}
+    updated = {key: value for key, value in new.items()
+               if key not in skip and (key not in old or old[key] != value)}
+    if updated:
+        change["set"] = updated
+    removed = [key for key in old if key not in skip and key not in new]
+    if removed:
+        change["unset"] = removed
+    return change
+
+
+def diff_participants(old, new):
+    """Return (participant list patch, change log lines); the patch is None if nothing changed."""
+    if old == new:
+        return None, []
+    pairs = match(old, new, lambda participant: None, PARTICIPANT_KEYS)
+    items = []
+    log = []
+    for j, participant in enumerate(new):
+        i = pairs.get(j)
+        if i is None:
+            items.append({"new": participant})
+            log.append(f"added participant {_person(participant)}")
+            continue
+        change = diff_fields(old[i], participant)
+        if change:
+            items.append({"from": i, **change})
+            log.extend(f"{_person(participant)}: {line}" for line in _field_lines(old[i], participant))
+        else:
+            items.append(i)
+    kept = set(pairs.values())
+    log.extend(f"removed participant {_person(participant)}"
+               for i, participant in enumerate(old) if i not in kept)
+    return items, log
+
+
+def diff_sessions(old, new, from_version=None, to_version=None):
+    """Return (delta, change log lines) turning session list old into new."""
+    pairs = match(old, new, lambda session: (session.get("day"), session.get("id")), SESSION_KEYS)
+    runs, changed, added, log = [], [], [], []
+    for j, session in enumerate(new):
+        i = pairs.get(j)
+        if i is None:
+            added.append([j, session])
+            log.append(f"Added {_label(session)}")
+            continue
+        if runs and runs[-1][0] + runs[-1][2] == j and runs[-1][1] + runs[-1][2] == i:
+            runs[-1][2] += 1
+        else:
+            runs.append([j, i, 1])
+        if old[i] == session:
+            continue
+        change = diff_fields(old[i], session, skip=("participants",))
+        lines = _field_lines(old[i], session, skip=("participants",))
+        items, participant_lines = diff_participants(old[i].get("participants", []), session.get("participants", []))
+        if items is not None:
+            change["participants"] = items
+        if change:
+            changed.append([j, change])
+            log.extend(f"{_label(session)}: {line}" for line in lines + participant_lines)
+    kept = set(pairs.values())
+    removed = [i for i in range(len(old)) if i not in kept]
+    log.extend(f"Removed {_label(old[i])}" for i in removed)
+
+    delta = {
+        "format": DELTA_FORMAT,
+        "from": from_version or sessions_version(old),
+        "to": to_version or sessions_version(new),
+        "sessions": len(new),
+        "runs": runs,
+        "changed": changed,
+        "added": added,
+        "removed": removed,
+    }
+    return delta, log
+
+
+def _patch_record(record, change):
+    patched = {key: value for key, value in record.items() if key not in change.get("unset", ())}
+    patched.update(change.get("set", {}))
+    return patched
+
+
+def apply_delta(old, delta):
+    """Rebuild the new session list from old and a delta (what index.html does)."""
+    new = [None] * delta["sessions"]
+    for start, old_start, length in delta["runs"]:
+        new[start:start + length] = old[old_start:old_start + length]
+    for j, change in delta["changed"]:
+        session = _patch_record(new[j], change)
+        if "participants" in change:
+            participants = new[j]["participants"]
+            session["participants"] = [
+                participants[item] if isinstance(item, int)
+                else item["new"] if "new" in item
+                else _patch_record(participants[item["from"]], item)
+                for item in change["participants"]
+            ]
+        new[j] = session
+    for j, session in delta["added"]:
+        new[j] = session
+    if any(session is None for session in new):
+        raise ValueError("delta leaves sessions unset")
+    return new
+
+
+def _label(session):
+    return f"{session.get('day')} {session.get('start_time')} {session.get('id')} \"{session.get('title')}\""
+
+
+def _person(participant):
+    affiliation = participant.get("affiliation")
+    return participant.get("name") + (f" ({affiliation})" if affiliation else "")
+
+
+def _field_lines(old, new, skip=()):
+    lines = []
+    for key in new:
+        if key not in skip and old.get(key) != new[key]:
+            lines.append(f"{key} {old.get(key)!r} -> {new[key]!r}")
+    lines.extend(f"{key} {old[key]!r} removed" for key in old if key not in skip and key not in new)
+    return lines
+
+
+class ScheduleHistory:
+    """The last few versions' sessions, kept between builds.
+
+    index.json lists versions oldest first, each with the change log from
+    the version before it; each version's sessions are in <version>.json.gz.
+    """
+
+    def __init__(self, directory=DEFAULT_HISTORY_DIR, keep=DEFAULT_KEEP):
+        self.directory = directory
+        self.keep = keep
+        self.index_path = os.path.join(directory, "index.json")
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        self.versions = index.get("versions", []) if index.get("format") == HISTORY_FORMAT else []
+
+    def _path(self, version):
+        return os.path.join(self.directory, f"{version}.json.gz")
+
+    def load(self, version):
+        with gzip.open(self._path(version), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def record(self, version, sessions):
+        """Add version as the newest, unless it already is; return its entry."""
+        if self.versions and self.versions[-1]["version"] == version:
+            return self.versions[-1]
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {"version": version, "sessions": len(sessions)}
+        if self.versions:
+            previous = self.versions[-1]["version"]
+            _, log = diff_sessions(self.load(previous), sessions, previous, version)
+            entry.update({"from": previous, "changes": log})
+        with atomic_write(self._path(version), "wb") as f:
+            f.write(gzip.compress(_dumps(sessions).encode("utf-8"), mtime=0))
+        self.versions = [v for v in self.versions if v["version"] != version] + [entry]
+        for dropped in self.versions[:-self.keep]:
+            if os.path.exists(self._path(dropped["version"])):
+                os.remove(self._path(dropped["version"]))
+        self.versions = self.versions[-self.keep:]
+        with atomic_write(self.index_path) as f:
+            json.dump({"format": HISTORY_FORMAT, "versions": self.versions}, f, indent=1)
+        return entry
+
+    def patches(self, sessions, version):
+        """Yield (old version, delta to version) for every other kept version."""
+        for entry in self.versions:
+            if entry["version"] != version:
+                delta, _ = diff_sessions(self.load(entry["version"]), sessions, entry["version"], version)
+                yield entry["version"], delta
+
+    def changelog(self):
+        """Version-to-version change logs, newest first."""
+        return [{"from": entry["from"], "to": entry["version"], "changes": entry["changes"]}
+                for entry in reversed(self.versions) if "from" in entry]
+
+
+def main(argv=None):
+    from build_artifacts import load_sessions
+
+    parser = argparse.ArgumentParser(description="Diff two extractions into a client patch and a change log.")
+    parser.add_argument("old")
+    parser.add_argument("new", nargs="?", default="schedule_all.json")
+    parser.add_argument("-o", "--output", help="write the delta here")
+    args = parser.parse_args(argv)
+
+    old, new = load_sessions(args.old), load_sessions(args.new)
+    delta, log = diff_sessions(old, new)
+    if apply_delta(old, delta) != new:
+        raise SystemExit("delta does not reproduce the new sessions")
+    for line in log:
+        print(line)
+    size = len(_dumps(delta).encode("utf-8"))
+    print(f"{len(delta['added'])} added, {len(delta['removed'])} removed, {len(delta['changed'])} changed; "
+          f"delta {size:,} bytes, {len(gzip.compress(_dumps(delta).encode('utf-8'))):,} gzipped")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(delta, f, separators=(",", ":"), ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
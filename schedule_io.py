@@ -0,0 +1,66 @@
+"""
+Streaming writers for schedule output.
+
+Both take any iterable of sessions and write each one as it arrives, so a
+generator such as extract_sessions.iter_sessions() never has to be
+materialized as a list. atomic_write() gives them (and the build artifacts)
+a file that only replaces its target once it is complete.
+"""
+
+import json
+import os
+import textwrap
+from contextlib import contextmanager
+
+from tracing import TRACER
+
+
+def write_json_array(items, f, indent=2, **dump_kwargs):
+    """Write items as a JSON array, byte-for-byte what json.dump(list(items), f, indent=indent) writes.
+
+    Returns the number of items written.
+    """
+    count = 0
+    pad = " " * indent
+    for item in items:
+        with TRACER.span("write.session"):
+            f.write(",\n" if count else "[\n")
+            f.write(textwrap.indent(json.dumps(item, indent=indent, **dump_kwargs), pad))
+        count += 1
+    f.write("\n]" if count else "[]")
+    return count
+
+
+def write_json_lines(items, f, **dump_kwargs):
+    """Write one compact JSON document per line (JSON Lines). Returns the count."""
+    count = 0
+    for item in items:
+        with TRACER.span("write.session"):
+            f.write(json.dumps(item, **dump_kwargs))
+            f.write("\n")
+        count += 1
+    return count
+
+
+@contextmanager
+def atomic_write(path, mode="w", **open_kwargs):
+    """Open a temporary file next to path and rename it over path on success.
+
+    Readers (the web page, the API server, a second extraction) see either
+    the previous file or the complete new one; if the block raises, path is
+    left as it was.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode, **open_kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+WRITERS = {
+    "json": write_json_array,
+    "jsonl": write_json_lines,
+}
@@ -0,0 +1,130 @@
+"""
+Session model shared by both parsers.
+
+extract_sessions.py and parse_schedule.py build the same slotted objects
+while parsing and only turn them into dicts at the edge, in the JSON shape
+each has always written:
+
+  Session.to_dict()                    extract_sessions / schedule_all.json
+  Session.to_schedule_parser_dict()    parse_schedule's schedule_{day}.json
+
+Slotted instances carry no per-object __dict__, and an Interner shares
+repeated values within a document: one string object per distinct
+location, section or affiliation, and one Person row per (name,
+affiliation), so a chair who is also a discussant, or a name on several
+papers, is stored once.
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True, frozen=True)
+class Person:
+    name: str
+    affiliation: str = ""
+
+
+@dataclass(slots=True, frozen=True)
+class Participant:
+    person: Person
+    title: str = ""  # paper title; roundtable participants have none
+
+
+@dataclass(slots=True)
+class ParticipantDraft:
+    """A participant still being read; continuation lines extend its fields."""
+    title: str = ""
+    name: str = ""
+    affiliation: str = ""
+
+
+@dataclass(slots=True)
+class Session:
+    day: str
+    id: str
+    title: str = ""
+    start_time: str = ""
+    end_time: str = ""
+    time_text: str = ""  # the printed day/time text, when no range could be read from it
+    location: str = ""
+    section: str = ""
+    participants: list = field(default_factory=list)
+    chairs: list = field(default_factory=list)
+    discussants: list = field(default_factory=list)
+    # Where the session came from, for extract_sessions.refine_document(); not written out
+    pages: list = field(default_factory=list)  # source pages, in order
+    start: tuple = None  # (page, top, x0) of the id line
+
+    def to_dict(self):
+        return {
+            "day": self.day,
+            "id": self.id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "location": self.location,
+            "section": self.section,
+            "title": self.title,
+            "participants": [
+                {"title": p.title, "name": p.person.name, "affiliation": p.person.affiliation}
+                for p in self.participants
+            ],
+        }
+
+    def to_schedule_parser_dict(self):
+        return {
+            "id": self.id,
+            "title": self.title,
+            "day": self.day,
+            "day_time": f"{self.start_time}-{self.end_time}" if self.start_time else self.time_text,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "location": self.location,
+            "category": self.section,
+            "chair": [{"name": p.name, "affiliation": p.affiliation} for p in self.chairs],
+            "participants": [
+                {"name": p.person.name, "affiliation": p.person.affiliation, "paper": p.title}
+                for p in self.participants
+            ],
+            "discussants": [{"name": p.name, "affiliation": p.affiliation} for p in self.discussants],
+        }
+
+
+class Interner:
+    """Shares equal strings and person rows within one document."""
+
+    __slots__ = ("strings", "people")
+
+    def __init__(self):
+        self.strings = {}
+        self.people = {}
+
+    def string(self, value):
+        return self.strings.setdefault(value, value)
+
+    def person(self, name, affiliation=""):
+        key = (name, affiliation)
+        person = self.people.get(key)
+        if person is None:
+            person = self.people[key] = Person(self.string(name), self.string(affiliation))
+        return person
+
+    def participant(self, draft):
+        return Participant(self.person(draft.name, draft.affiliation), self.string(draft.title))
+
+
+def session_from_dict(data, interner=None):
+    """Rebuild a Session from its to_dict() form (e.g. a schedule_all.json entry)."""
+    interner = interner or Interner()
+    return Session(
+        day=interner.string(data["day"]),
+        id=data["id"],
+        title=data.get("title", ""),
+        start_time=interner.string(data.get("start_time", "")),
+        end_time=interner.string(data.get("end_time", "")),
+        location=interner.string(data.get("location", "")),
+        section=interner.string(data.get("section", "")),
+        participants=[
+            interner.participant(ParticipantDraft(p.get("title", ""), p["name"], p.get("affiliation", "")))
+            for p in data.get("participants", [])
+        ],
+    )
@@ -0,0 +1,436 @@
+"""
+Local schedule API for the event Wi-Fi.
+
+Loads the extracted sessions once, builds in-memory indexes (id, day, room,
+person name tokens, search tokens) and answers filtered queries over HTTP, so a phone
+asks for the sessions it shows instead of downloading schedule_all.json:
+
+  GET /                          days, session count and endpoints
+  GET /sessions?day=&q=&after=&before=&room=&limit=&offset=
+                                 sessions matching every given filter, in
+                                 program order; q is a word-prefix search
+                                 (search_index.py), after/before compare
+                                 start times ("9:30am" or "09:30"), room is
+                                 a location prefix
+  GET /sessions/{id}[?day=]      every session with that id (ids repeat
+                                 across time blocks)
+  GET /people/{name}             people (people_index.py) with a name
+                                 word starting with each word of name, or
+                                 with that person id, with their sessions
+  GET /stats                     request and cache counters
+
+Every 200 response carries a strong ETag and is answered with 304 when the
+client sends it back in If-None-Match; clients that accept gzip get the
+body compressed. Responses are kept in an LRU cache keyed by path and
+normalized query, bounded by entries and by bytes (bodies plus their gzip
+copies), so repeated queries skip the lookup, serialization and
+compression. The server is plain asyncio (HTTP/1.1 with keep-alive);
+there is nothing to install.
+
+    python3 schedule_server.py [schedule_all.json] [--host 0.0.0.0] [--port 8080] [--cache-size 512] [--cache-mb 32]
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+from collections import OrderedDict
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from people_index import build_people_index, normalize_key
+from schedule_time import to_minutes
+from search_index import build_search_index, build_token_index, search
+
+DEFAULT_CACHE_SIZE = 512
+DEFAULT_CACHE_MB = 32
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+# Bodies smaller than this go out uncompressed
+MIN_GZIP_BYTES = 512
+
+STATUS_TEXT = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    431: "Request Header Fields Too Large",
+}
+
+ENDPOINTS = [
+    "/sessions?day=&q=&after=&before=&room=&limit=&offset=",
+    "/sessions/{id}?day=",
+    "/people/{name}",
+    "/stats",
+]
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Response:
+    """An encoded response body with its ETag; the gzip form is made on first use."""
+
+    __slots__ = ("status", "body", "etag", "_gzipped")
+
+    def __init__(self, status, payload):
+        self.status = status
+        self.body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest()[:20] + '"'
+        self._gzipped = None
+
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self._gzipped
+
+    def has_gzipped(self):
+        return self._gzipped is not None
+
+    def size(self):
+        """Bytes held: the body plus its gzip form once made."""
+        return len(self.body) + (len(self._gzipped) if self._gzipped is not None else 0)
+
+
+class LRUCache:
+    """Least recently used responses, at most max_entries of them and max_bytes in total.
+
+    A response's size changes when its gzip form is made; put() it again
+    then so the total counts it. A response bigger than max_bytes is not kept.
+    """
+
+    def __init__(self, max_entries, max_bytes=DEFAULT_CACHE_MB << 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (response, size when put)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, response):
+        if self.max_entries <= 0:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        size = response.size()
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (response, size)
+        self.bytes += size
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+
+
+def parse_clock(value):
+    """'9:30am' or '09:30' -> minutes since midnight."""
+    minutes = to_minutes(value)
+    if minutes is None:
+        hour, sep, minute = value.partition(":")
+        if sep and hour.isdigit() and minute.isdigit() and int(hour) < 24 and int(minute) < 60:
+            minutes = int(hour) * 60 + int(minute)
+    if minutes is None:
+        raise HTTPError(400, f"not a time: {value!r} (use 9:30am or 09:30)")
+    return minutes
+
+
+def parse_count(params, name, default, maximum=None):
+    value = params.get(name)
+    if value is None:
+        return default
+    if not value.isdigit():
+        raise HTTPError(400, f"{name} must be a non-negative integer")
+    return min(int(value), maximum) if maximum is not None else int(value)
+
+
+class ScheduleIndex:
+    """The sessions and the lookups the endpoints need, built once at startup."""
+
+    def __init__(self, sessions):
+        self.sessions = sessions
+        self.days = list(dict.fromkeys(s["day"] for s in sessions))
+        self.by_day = {day: [] for day in self.days}
+        self.by_id = {}
+        self.by_room = {}
+        for ordinal, session in enumerate(sessions):
+            self.by_day[session["day"]].append(ordinal)
+            self.by_id.setdefault(session["id"], []).append(ordinal)
+            self.by_room.setdefault(normalize_key(session.get("location")), []).append(ordinal)
+        self.search_index = build_search_index(sessions)
+        self.people, _ = build_people_index(sessions)
+        # Same sorted-terms form as the search index, so search() does prefix lookups on it
+        self.people_search = build_token_index(p["name"] for p in self.people["people"])
+        self.person_by_id = {p["id"]: i for i, p in enumerate(self.people["people"])}
+
+    def session(self, ordinal):
+        return {"ordinal": ordinal, **self.sessions[ordinal]}
+
+    def summary(self, ordinal):
+        s = self.sessions[ordinal]
+        return {"ordinal": ordinal, "day": s["day"], "id": s["id"], "start_time": s["start_time"],
+                "end_time": s["end_time"], "location": s["location"], "title": s["title"]}
+
+    def day_param(self, params):
+        day = params.get("day")
+        if day is None:
+            return None
+        day = day.strip().capitalize()
+        if day not in self.by_day:
+            raise HTTPError(400, f"unknown day {day!r}; expected one of {', '.join(self.days)}")
+        return day
+
+    def find_sessions(self, params):
+        candidates = None  # None: no filter applied yet, i.e. every session
+
+        def narrow(ordinals):
+            nonlocal candidates
+            candidates = set(ordinals) if candidates is None else candidates & set(ordinals)
+
+        day = self.day_param(params)
+        if day is not None:
+            narrow(self.by_day[day])
+        if params.get("room"):
+            room = normalize_key(params["room"])
+            narrow(o for key, ordinals in self.by_room.items() if key.startswith(room) for o in ordinals)
+        if params.get("q"):
+            matches = search(self.search_index, params["q"])
+            if matches is not None:
+                narrow(matches)
+
+        ordinals = sorted(candidates) if candidates is not None else range(len(self.sessions))
+        after = parse_clock(params["after"]) if params.get("after") else None
+        before = parse_clock(params["before"]) if params.get("before") else None
+        if after is not None or before is not None:
+            ordinals = [
+                o for o in ordinals
+                if (start := self.sessions[o].get("start_minutes")) is not None
+                and (after is None or start >= after) and (before is None or start < before)
+            ]
+
+        offset = parse_count(params, "offset", 0)
+        limit = parse_count(params, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+        page = list(ordinals)[offset:offset + limit]
+        return {"count": len(ordinals), "offset": offset, "sessions": [self.session(o) for o in page]}
+
+    def sessions_with_id(self, session_id, params):
+        day = self.day_param(params)
+        ordinals = [o for o in self.by_id.get(session_id, []) if day is None or self.sessions[o]["day"] == day]
+        if not ordinals:
+            raise HTTPError(404, f"no session {session_id}" + (f" on {day}" if day else ""))
+        return {"id": session_id, "sessions": [self.session(o) for o in ordinals]}
+
+    def find_people(self, name):
+        if name in self.person_by_id:
+            numbers = [self.person_by_id[name]]
+        else:
+            numbers = search(self.people_search, name)
+            if numbers is None:
+                raise HTTPError(400, "empty name")
+            numbers = sorted(numbers)
+        if not numbers:
+            raise HTTPError(404, f"no person matching {name!r}")
+        institutions = self.people["institutions"]
+        people = []
+        for number in numbers:
+            person = self.people["people"][number]
+            people.append({
+                "id": person["id"],
+                "name": person["name"],
+                "institution": institutions[person["institution"]]["name"] if person["institution"] is not None else "",
+                "sessions": [self.summary(o) for o in person["sessions"]],
+            })
+        return {"count": len(people), "people": people}
+
+
+class ScheduleServer:
+    def __init__(self, index, cache_size=DEFAULT_CACHE_SIZE, cache_mb=DEFAULT_CACHE_MB):
+        self.index = index
+        self.cache = LRUCache(cache_size, int(cache_mb * (1 << 20)))
+        self.requests = 0
+        self.not_modified = 0
+
+    def route(self, path, params):
+        parts = [unquote(part) for part in path.strip("/").split("/")] if path.strip("/") else []
+        if not parts:
+            return {"days": self.index.days, "sessions": len(self.index.sessions), "endpoints": ENDPOINTS}
+        if parts[0] == "sessions" and len(parts) == 1:
+            return self.index.find_sessions(params)
+        if parts[0] == "sessions" and len(parts) == 2:
+            return self.index.sessions_with_id(parts[1], params)
+        if parts[0] == "people" and len(parts) == 2:
+            return self.index.find_people(parts[1])
+        raise HTTPError(404, f"no endpoint {path}")
+
+    def lookup(self, target, accept_gzip=False):
+        """Response for a request target, from the cache when possible.
+
+        With accept_gzip a body worth compressing has its gzip form made here,
+        so the cache can count it.
+        """
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        key = (url.path.rstrip("/") or "/", tuple(sorted(params.items())))
+        response = self.cache.get(key)
+        if response is None:
+            try:
+                response = Response(200, self.route(url.path, params))
+            except HTTPError as e:
+                return Response(e.status, {"error": str(e)})
+            self.cache.put(key, response)
+        if accept_gzip and len(response.body) >= MIN_GZIP_BYTES and not response.has_gzipped():
+            response.gzipped()
+            self.cache.put(key, response)
+        return response
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "cache": {"entries": len(self.cache.entries), "max_entries": self.cache.max_entries,
+                      "bytes": self.cache.bytes, "max_bytes": self.cache.max_bytes,
+                      "hits": self.cache.hits, "misses": self.cache.misses},
+        }
+
+    def respond(self, method, target, headers):
+        """(status, extra headers, body) for one request."""
+        self.requests += 1
+        if method not in ("GET", "HEAD"):
+            response = Response(405, {"error": f"{method} not allowed"})
+            return response.status, [("Allow", "GET, HEAD")], response.body
+        if urlsplit(target).path == "/stats":
+            response = Response(200, self.stats())
+            return 200, [("Cache-Control", "no-store")], response.body
+
+        accept_gzip = "gzip" in headers.get("accept-encoding", "")
+        response = self.lookup(target, accept_gzip)
+        if response.status != 200:
+            return response.status, [], response.body
+
+        use_gzip = accept_gzip and len(response.body) >= MIN_GZIP_BYTES
+        etag = response.etag[:-1] + '-gz"' if use_gzip else response.etag
+        extra = [("ETag", etag), ("Vary", "Accept-Encoding"), ("Cache-Control", "no-cache")]
+        sent = {tag.strip().removeprefix("W/") for tag in headers.get("if-none-match", "").split(",")}
+        if etag in sent or "*" in sent:
+            self.not_modified += 1
+            return 304, extra, b""
+        if use_gzip:
+            return 200, extra + [("Content-Encoding", "gzip")], response.gzipped()
+        return 200, extra, response.body
+
+    @staticmethod
+    def reject(writer, status):
+        """Answer a request that can't be read and end the connection."""
+        writer.write(f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\nContent-Length: 0\r\n"
+                     "Connection: close\r\n\r\n".encode("latin-1"))
+
+    @staticmethod
+    async def discard_body(reader, length):
+        """Read past a request body nobody uses, so it isn't taken for the next request."""
+        while length > 0:
+            chunk = await reader.read(min(length, 1 << 16))
+            if not chunk:
+                raise ConnectionError("connection closed inside the request body")
+            length -= len(chunk)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                # readline() raises ValueError for a line over the stream limit
+                try:
+                    request_line = await reader.readline()
+                except ValueError:
+                    self.reject(writer, 400)
+                    break
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    self.reject(writer, 400)
+                    break
+                headers = {}
+                try:
+                    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                except ValueError:
+                    self.reject(writer, 431)
+                    break
+                try:
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    self.reject(writer, 400)
+                    break
+                await self.discard_body(reader, length)
+
+                status, extra, body = self.respond(method, target, headers)
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                if "transfer-encoding" in headers:
+                    # No chunked decoding here, so the body's end can't be found
+                    keep_alive = False
+                head = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}", f"Content-Length: {len(body)}",
+                        "Connection: " + ("keep-alive" if keep_alive else "close")]
+                if status != 304:
+                    head.append("Content-Type: application/json; charset=utf-8")
+                head.extend(f"{name}: {value}" for name, value in extra)
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+                if method != "HEAD":
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(server, host, port):
+    listener = await asyncio.start_server(server.handle, host, port)
+    address = listener.sockets[0].getsockname()
+    print(f"Serving {len(server.index.sessions)} sessions on http://{address[0]}:{address[1]}/", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    from build_artifacts import load_sessions
+
+    parser = argparse.ArgumentParser(description="Serve the schedule as a small JSON API.")
+    parser.add_argument("source", nargs="?", default="schedule_all.json")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"responses kept in the LRU cache; 0 disables it (default: {DEFAULT_CACHE_SIZE})")
+    parser.add_argument("--cache-mb", type=float, default=DEFAULT_CACHE_MB,
+                        help="bytes the cached responses and their gzip copies may take, in MB "
+                             f"(default: {DEFAULT_CACHE_MB})")
+    args = parser.parse_args()
+
+    server = ScheduleServer(ScheduleIndex(load_sessions(args.source)), args.cache_size, args.cache_mb)
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Normalized session times.
+
+The PDFs print times as "8:00am-9:15am". Each session also gets
+minutes-since-midnight integers and ISO 8601 datetimes, so consumers compare
+numbers instead of re-parsing strings. build_slot_index() groups sessions by
+day and start time.
+
+The day PDFs carry weekday names but no dates; CONFERENCE_DATES maps them
+to calendar dates (override with extract_sessions.py --dates).
+"""
+
+import re
+from datetime import date, datetime, time, timedelta, timezone
+
+# SPSA 2026, New Orleans
+CONFERENCE_DATES = {
+    "Thursday": "2026-01-08",
+    "Friday": "2026-01-09",
+    "Saturday": "2026-01-10",
+}
+CONFERENCE_TZ = timezone(timedelta(hours=-6))  # US Central, standard time
+
+SLOT_INDEX_FORMAT = 1
+
+CLOCK_RE = re.compile(r'(\d{1,2}):(\d{2})\s*([ap]m)', re.IGNORECASE)
+TIME_RANGE_RE = re.compile(r'(\d{1,2}:\d{2}\s*[ap]m)\s*-\s*(\d{1,2}:\d{2}\s*[ap]m)', re.IGNORECASE)
+
+
+def to_minutes(clock):
+    """'8:00am' -> 480; None if the text isn't a clock time."""
+    match = CLOCK_RE.fullmatch(clock.strip()) if clock else None
+    if not match:
+        return None
+    hour, minute, meridiem = int(match.group(1)) % 12, int(match.group(2)), match.group(3).lower()
+    return (hour + (12 if meridiem == "pm" else 0)) * 60 + minute
+
+
+def format_clock(minutes):
+    """480 -> '8:00am', in the PDFs' own style."""
+    hour, minute = divmod(minutes, 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d}{'am' if hour < 12 else 'pm'}"
+
+
+def parse_time_range(text):
+    """First 'start-end' range in text as (start_minutes, end_minutes), or None."""
+    match = TIME_RANGE_RE.search(text or "")
+    if not match:
+        return None
+    return to_minutes(match.group(1)), to_minutes(match.group(2))
+
+
+def parse_dates(spec):
+    """'Thursday=2026-01-08,Friday=2026-01-09' -> {day: 'YYYY-MM-DD'}, checking each weekday."""
+    dates = {}
+    for item in spec.split(","):
+        day, _, value = item.partition("=")
+        day = day.strip().capitalize()
+        if date.fromisoformat(value.strip()).strftime("%A") != day:
+            raise ValueError(f"{value.strip()} is not a {day}")
+        dates[day] = value.strip()
+    return dates
+
+
+def iso_datetime(day, minutes, dates=None, next_day=False):
+    iso_date = (dates or CONFERENCE_DATES).get(day.capitalize()) if day else None
+    if iso_date is None or minutes is None:
+        return None
+    moment = datetime.combine(date.fromisoformat(iso_date), time(*divmod(minutes, 60)), CONFERENCE_TZ)
+    if next_day:
+        moment += timedelta(days=1)
+    return moment.isoformat()
+
+
+def add_time_fields(session, dates=None):
+    """Return session with start/end minutes and ISO datetimes after its end_time."""
+    start = to_minutes(session.get("start_time"))
+    end = to_minutes(session.get("end_time"))
+    fields = {
+        "start_minutes": start,
+        "end_minutes": end,
+        "start_iso": iso_datetime(session.get("day"), start, dates),
+        # A range like 9:00pm-1:00am ends the next morning
+        "end_iso": iso_datetime(session.get("day"), end, dates,
+                                next_day=start is not None and end is not None and end < start),
+    }
+    result = {}
+    for key, value in session.items():
+        if key not in fields:
+            result[key] = value
+        if key == "end_time":
+            result.update(fields)
+    if "end_time" not in session:
+        result.update(fields)
+    return result
+
+
+def slot_key(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def build_slot_index(sessions):
+    """day -> start time ("HH:MM") -> session ordinals, both in time order.
+
+    Ordinals are positions in `sessions`, as in the search index.
+    """
+    days = {}
+    for ordinal, session in enumerate(sessions):
+        start = session.get("start_minutes")
+        if start is None:
+            continue
+        days.setdefault(session["day"], {}).setdefault(slot_key(start), []).append(ordinal)
+    return {
+        "format": SLOT_INDEX_FORMAT,
+        "days": {day: dict(sorted(slots.items())) for day, slots in days.items()},
+    }
@@ -0,0 +1,78 @@
+"""
+Inverted search index over the extracted sessions.
+
+Every session's title, section and participants' names, affiliations and
+paper titles are normalized (accents folded, lowercased) and split into
+tokens. The index maps each token to the sessions containing it:
+
+  {"format": 1, "terms": ["aaron", "abortion", ...], "postings": [[12, 40], [7], ...]}
+
+Sessions are referred to by ordinal, their position in schedule_all.json
+(equivalently, a day shard's manifest "offset" plus the position within the
+shard), because session ids repeat across time blocks. Terms are sorted, so
+a prefix query is a binary search for the first term with that prefix and a
+scan while terms still match; index.html does exactly that as you type.
+"""
+
+import bisect
+import re
+import unicodedata
+
+SEARCH_INDEX_FORMAT = 1
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+COMBINING_RE = re.compile('[\u0300-\u036f]')
+
+
+def normalize(text):
+    """Fold accents and case the same way index.html does (NFKD, drop U+0300-036F, lowercase)."""
+    return COMBINING_RE.sub('', unicodedata.normalize('NFKD', text)).lower()
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(normalize(text))
+
+
+def session_text(session):
+    """The fields the front end searches, joined into one string."""
+    parts = [session.get("title", ""), session.get("section", "")]
+    for participant in session.get("participants", []):
+        parts.extend((participant.get("name", ""), participant.get("affiliation", ""),
+                      participant.get("title", "")))
+    return " ".join(parts)
+
+
+def build_token_index(texts):
+    """{"terms": [...], "postings": [...]} mapping each token to the positions of the texts containing it."""
+    postings = {}
+    for position, text in enumerate(texts):
+        for token in set(tokenize(text)):
+            postings.setdefault(token, []).append(position)
+    terms = sorted(postings)
+    return {"terms": terms, "postings": [postings[t] for t in terms]}
+
+
+def build_search_index(sessions):
+    return {"format": SEARCH_INDEX_FORMAT, **build_token_index(session_text(s) for s in sessions)}
+
+
+def prefix_matches(index, prefix):
+    """Set of ordinals of sessions with a token starting with prefix."""
+    terms = index["terms"]
+    matches = set()
+    i = bisect.bisect_left(terms, prefix)
+    while i < len(terms) and terms[i].startswith(prefix):
+        matches.update(index["postings"][i])
+        i += 1
+    return matches
+
+
+def search(index, query):
+    """Ordinals of sessions matching every query token as a prefix, or None for an empty query."""
+    result = None
+    for token in tokenize(query):
+        matches = prefix_matches(index, token)
+        result = matches if result is None else result & matches
+        if not result:
+            break
+    return result
@@ -0,0 +1,54 @@
+"""
+One command for the extraction, verification and inspection tools.
+
+    spsa extract [extract_sessions.py options]
+    spsa batch programs/ [batch_extract.py options]
+    spsa verify [schedule_all.json] [--db schedule.db]
+    spsa quality [schedule_all.json] [--threshold 0.75]
+    spsa diff old.json [schedule_all.json] [-o delta.json]
+    spsa inspect-text [spsa_thursday.pdf] [--pages 1-3]
+    spsa inspect-layout [spsa_thursday.pdf] [--page 1]
+    spsa find-id 2100 [spsa_thursday.pdf ...]
+
+Installed as `spsa` by pyproject.toml; from a checkout, `python3 spsa_cli.py`
+does the same. Each subcommand's module is imported only when it runs, so
+--help, verify and quality never load pdfplumber. The inspect commands and
+find-id read the per-page layout dump extraction leaves in .extract_cache/
+(layout_dump.py) and only lay out pages that aren't in it yet.
+"""
+
+import argparse
+import importlib
+import sys
+
+# subcommand -> (module with main(argv), summary)
+COMMANDS = {
+    "extract": ("extract_sessions", "extract sessions from the day PDFs"),
+    "batch": ("batch_extract", "extract program PDFs for many conferences"),
+    "verify": ("verify_extraction", "sanity-check the extracted sessions"),
+    "quality": ("extraction_quality", "score each session and list the suspicious ones"),
+    "diff": ("schedule_diff", "compare two extractions: change log and patch size"),
+    "inspect-text": ("inspect_pdf", "print the text of PDF pages"),
+    "inspect-layout": ("inspect_layout", "print a page's line positions, fonts and classes"),
+    "find-id": ("debug_ids", "list the lines where a session id appears"),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="spsa", description="SPSA schedule tools.",
+        epilog="Run 'spsa COMMAND --help' for a command's options.")
+    subparsers = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+    for name, (_, summary) in COMMANDS.items():
+        # The command's own parser handles its options, --help included
+        subparsers.add_parser(name, help=summary, add_help=False)
+    args, rest = parser.parse_known_args(argv)
+
+    module = importlib.import_module(COMMANDS[args.command][0])
+    # So the command's usage line reads "spsa extract ..."
+    sys.argv[0] = f"spsa {args.command}"
+    module.main(rest)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Lightweight timing spans for the extraction pipeline.
+
+Code marks the interesting stretches with TRACER.span("name") (or
+begin()/end() where a stretch crosses a yield) and bumps counters with
+TRACER.count(). Nothing is recorded until enable() is called; until then
+each call returns after checking one flag, so the instrumented paths cost
+nothing measurable in normal runs.
+
+write_trace() saves Chrome's trace event format (open it in
+chrome://tracing or https://ui.perfetto.dev). The same file carries a
+"summary" with per-span totals, so scripts can read it too:
+
+  {"traceEvents": [{"name": "layout.page", "ph": "X", "ts": ..., "dur": ...}, ...],
+   "summary": {"spans": {"layout.page": {"count": 96, "total_ms": ..., "self_ms": ...}},
+               "counters": {"lines": 5120, "sessions": 385}}}
+
+Spans nest: self_ms is a span's time minus the spans opened inside it. The
+session parser pulls pages lazily, so a page laid out mid-session shows up
+inside that session's parse span and only its self time is parsing.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+_NULL_SPAN = nullcontext()
+
+# Thread id given to spans reported back from worker processes
+POOL_TID = 0
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.counters = {}
+        self._stack = []
+        self._origin = 0.0
+
+    def enable(self):
+        self.enabled = True
+        self.events = []
+        self.counters = {}
+        self._stack = []
+        self._origin = time.perf_counter()
+
+    def begin(self, name, **args):
+        if not self.enabled:
+            return
+        self._stack.append([name, time.perf_counter(), 0.0, args])
+
+    def end(self):
+        if not self.enabled or not self._stack:
+            return
+        name, start, children, args = self._stack.pop()
+        self._record(name, start, time.perf_counter() - start, children, args)
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def add(self, name, seconds, **args):
+        """Record a span that ran elsewhere (e.g. in a worker process) and just finished."""
+        if not self.enabled:
+            return
+        self._record(name, time.perf_counter() - seconds, seconds, 0.0, args, pooled=True)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def _record(self, name, start, seconds, children, args, pooled=False):
+        if self._stack and not pooled:
+            self._stack[-1][2] += seconds
+        event = {"name": name, "ph": "X", "ts": round((start - self._origin) * 1e6, 1),
+                 "dur": round(seconds * 1e6, 1), "pid": os.getpid(),
+                 "tid": POOL_TID if pooled else threading.get_ident(), "self": seconds - children}
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def summary(self):
+        spans = {}
+        for event in self.events:
+            entry = spans.setdefault(event["name"], {"count": 0, "total_ms": 0.0, "self_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += event["dur"] / 1000
+            entry["self_ms"] += event["self"] * 1000
+        for entry in spans.values():
+            entry["total_ms"] = round(entry["total_ms"], 3)
+            entry["self_ms"] = round(entry["self_ms"], 3)
+        return {"spans": spans, "counters": dict(self.counters)}
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args")
+
+    def __init__(self, tracer, name, args):
+        self.tracer, self.name, self.args = tracer, name, args
+
+    def __enter__(self):
+        self.tracer.begin(self.name, **self.args)
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.end()
+        return False
+
+
+TRACER = Tracer()
+
+
+def write_trace(path, tracer=TRACER):
+    """Save the recorded spans as a Chrome trace with a summary; return the summary."""
+    summary = tracer.summary()
+    events = [{key: value for key, value in event.items() if key != "self"} for event in tracer.events]
+    end = max((event["ts"] + event["dur"] for event in events), default=0)
+    for name, value in summary["counters"].items():
+        events.append({"name": name, "ph": "C", "ts": end, "pid": os.getpid(), "args": {name: value}})
+    if any(event.get("tid") == POOL_TID for event in events):
+        events.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": POOL_TID,
+                       "args": {"name": "worker pool"}})
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms", "summary": summary}, f)
+    return summary
+
+
+def print_summary(summary):
+    print(f"{'span':<24}{'count':>8}{'total ms':>12}{'self ms':>12}")
+    for name, entry in sorted(summary["spans"].items(), key=lambda item: -item[1]["self_ms"]):
+        print(f"{name:<24}{entry['count']:>8}{entry['total_ms']:>12.1f}{entry['self_ms']:>12.1f}")
+    for name, value in summary["counters"].items():
+        print(f"{name:<24}{value:>8}")
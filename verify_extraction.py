@@ -1,45 +1,77 @@
+import argparse
 import json
+import os
+
+import schedule_db
+
+
+def open_db(db_path=schedule_db.DEFAULT_DB, source="schedule_all.json", build=False):
+    """Open the schedule database read-only if it is current, else load source into one.
+
+    A missing or stale database is only (re)built on disk with build=True;
+    otherwise source is loaded into a throwaway in-memory database.
+    """
+    if os.path.exists(db_path) and os.path.getmtime(source) <= os.path.getmtime(db_path):
+        conn = schedule_db.connect(db_path, readonly=True)
+        if schedule_db.db_format(conn) == schedule_db.DB_FORMAT:
+            return conn
+        conn.close()
+    conn = schedule_db.connect(db_path if build else ":memory:")
+    with open(source, "r") as f:
+        schedule_db.update(conn, json.load(f))
+    return conn
+
+
+def verify_extraction(db_path=schedule_db.DEFAULT_DB, source="schedule_all.json", build_db=False):
+    conn = open_db(db_path, source, build_db)
+
+    print(f"Total Sessions: {conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]}")
 
-def verify_extraction():
-    with open("schedule_all.json", "r") as f:
-        sessions = json.load(f)
-        
-    print(f"Total Sessions: {len(sessions)}")
-    
     # 1. Check for the example session (Thursday 2100)
     target_id = "2100"
-    found = False
-    for s in sessions:
-        if s["id"] == target_id:
-            found = True
-            print("\n--- Found Target Session 2100 ---")
-            print(json.dumps(s, indent=2))
-            break
-            
-    if not found:
+    rows = schedule_db.sessions_by_id(conn, target_id, "Thursday")
+    if rows:
+        print("\n--- Found Target Session 2100 ---")
+        print(json.dumps(schedule_db.load_session(conn, rows[0]), indent=2))
+    else:
         print(f"\nERROR: Session {target_id} not found!")
 
     # 2. Check for empty fields
-    empty_counts = {"start_time": 0, "location": 0, "section": 0, "title": 0, "participants": 0}
-    for s in sessions:
-        for key in empty_counts:
-            if not s[key] or (key == "participants" and len(s[key]) == 0):
-                empty_counts[key] += 1
-                
+    empty_counts = {}
+    for key in ("start_time", "location", "section", "title"):
+        empty_counts[key] = conn.execute(
+            f"SELECT COUNT(*) FROM sessions WHERE {key} IS NULL OR {key} = ''").fetchone()[0]
+    empty_counts["participants"] = conn.execute(
+        "SELECT COUNT(*) FROM sessions s WHERE NOT EXISTS "
+        "(SELECT 1 FROM participants p WHERE p.session_pk = s.session_pk)").fetchone()[0]
+
     print("\n--- Empty Field Counts ---")
     print(empty_counts)
-    
+
     # 3. Check participant quality
     print("\n--- Participant Quality Check (First 3 with participants) ---")
-    count = 0
-    for s in sessions:
-        if s["participants"]:
-            print(f"Session {s['id']}:")
-            for p in s["participants"][:2]: # Show first 2 participants
-                print(f"  - {p}")
-            count += 1
-            if count >= 3:
-                break
+    rows = conn.execute(
+        "SELECT s.* FROM sessions s WHERE EXISTS "
+        "(SELECT 1 FROM participants p WHERE p.session_pk = s.session_pk) "
+        + schedule_db.ORDER + " LIMIT 3").fetchall()
+    for row in rows:
+        session = schedule_db.load_session(conn, row)
+        print(f"Session {session['id']}:")
+        for p in session["participants"][:2]:  # Show first 2 participants
+            print(f"  - {p}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sanity-check the extracted sessions.")
+    parser.add_argument("source", nargs="?", default="schedule_all.json")
+    parser.add_argument("--db", default=schedule_db.DEFAULT_DB,
+                        help=f"database to check if it is current (default: {schedule_db.DEFAULT_DB}); "
+                             "otherwise source is checked in memory")
+    parser.add_argument("--build-db", action="store_true",
+                        help="write a missing or stale --db from source instead of checking it in memory")
+    args = parser.parse_args(argv)
+    verify_extraction(args.db, args.source, args.build_db)
+
 
 if __name__ == "__main__":
-    verify_extraction()
+    main()